@@ -0,0 +1,102 @@
+"""Cold-start budget: fresh interpreters importing the app (and opening the window) on one CPU.
+
+Each sample is a new Python process pinned to a single core (where the OS
+allows it), so nothing is cached in the interpreter.  Fails (exit 1) when the
+median is over budget or when a module that should load on first use is
+already imported at startup.
+
+    python benchmarks/bench_coldstart.py
+    python benchmarks/bench_coldstart.py --import-budget-ms 250 --window-budget-ms 900 --repeat 15
+
+The window is only measured when a display is available (use xvfb-run).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must not be imported until the feature that needs them is used
+DEFERRED_MODULES = ("requests", "urllib3", "numpy", "csv", "sqlite3", "concurrent.futures", "argparse",
+                    "multiprocessing", "logging", "cProfile", "asyncio")
+
+IMPORT_BUDGET_MS = 200
+WINDOW_BUDGET_MS = 700
+
+_IMPORT_SCRIPT = """
+import sys, json
+import onstep_configurator
+print(json.dumps([m for m in {deferred!r} if m in sys.modules]))
+"""
+
+_WINDOW_SCRIPT = """
+import tkinter as tk
+import onstep_configurator
+root = tk.Tk()
+onstep_configurator.OnStepConfigurator(root)
+root.update()
+root.destroy()
+"""
+
+
+def pin_to_one_cpu():
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {min(os.sched_getaffinity(0))})
+
+
+def run_cold(script):
+    """Wall time of a fresh interpreter running script from the repository root; returns (seconds, stdout)"""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", script], cwd=REPO_DIR, capture_output=True, text=True,
+                            preexec_fn=pin_to_one_cpu if os.name == "posix" else None)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip())
+    return elapsed, result.stdout
+
+
+def has_display():
+    try:
+        run_cold("import tkinter; tkinter.Tk().destroy()")
+    except RuntimeError:
+        return False
+    return True
+
+
+def check(label, script, repeat, budget_ms):
+    run_cold(script)  # warm the OS file cache; the interpreter itself starts cold every time
+    samples = [run_cold(script)[0] * 1000 for _ in range(repeat)]
+    median = statistics.median(samples)
+    ok = median <= budget_ms
+    print(f"{label:>7}: median {median:7.1f} ms (min {min(samples):.1f}, max {max(samples):.1f}, n={repeat}), "
+          f"budget {budget_ms} ms  {'OK' if ok else 'OVER BUDGET'}")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=9)
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--window-budget-ms", type=float, default=WINDOW_BUDGET_MS)
+    args = parser.parse_args(argv)
+
+    ok = True
+    _, loaded = run_cold(_IMPORT_SCRIPT.format(deferred=DEFERRED_MODULES))
+    loaded = json.loads(loaded)
+    if loaded:
+        print(f"Imported at startup but should load on first use: {', '.join(loaded)}")
+        ok = False
+    ok &= check("import", _IMPORT_SCRIPT.format(deferred=DEFERRED_MODULES), args.repeat, args.import_budget_ms)
+    if has_display():
+        ok &= check("window", _WINDOW_SCRIPT, args.repeat, args.window_budget_ms)
+    else:
+        print(" window: skipped (no display)")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
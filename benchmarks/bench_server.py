@@ -0,0 +1,132 @@
+"""Load test for the preset server: hundreds of concurrent keep-alive clients against one core.
+
+Starts `onstep_configurator serve` on a synthetic corpus in a process pinned to
+one CPU, then runs every client from this process on one event loop.  Each
+client does what a configurator with "Prefetch all presets" does: fetch the
+listing, download presets and a Config.h (gzip accepted), and then revalidate
+all of it with If-None-Match.  Fails (exit 1) on any error or when the 99th
+percentile latency is over budget.
+
+    python benchmarks/bench_server.py
+    python benchmarks/bench_server.py --clients 1000 --presets 100 --p99-budget-ms 2000
+
+On a single-CPU machine the clients share the server's core, so the numbers
+are a lower bound for the server alone.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+import corpus
+from bench_coldstart import pin_to_one_cpu
+
+CLIENTS = 500
+PRESETS = 50  # a large observatory preset folder
+PER_CLIENT = 10  # presets each client downloads
+P99_BUDGET_MS = 1000
+
+
+def start_server(directory):
+    """The serve command on a free port, pinned to one CPU; returns (process, base URL)"""
+    process = subprocess.Popen([sys.executable, "onstep_configurator.py", "serve", directory, "--port", "0"],
+                               cwd=REPO_DIR, stdout=subprocess.PIPE, text=True,
+                               preexec_fn=pin_to_one_cpu if os.name == "posix" else None)
+    line = process.stdout.readline()
+    if " at " not in line:
+        process.kill()
+        raise RuntimeError(f"server did not start: {line!r}")
+    return process, line.rsplit(" at ", 1)[1].strip()
+
+
+async def request(reader, writer, path, etag=None):
+    """One GET on a keep-alive connection; returns (status, ETag)"""
+    lines = [f"GET {path} HTTP/1.1", "Host: bench", "Accept-Encoding: gzip"]
+    if etag:
+        lines.append(f"If-None-Match: {etag}")
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+    head = await reader.readuntil(b"\r\n\r\n")
+    headers = {}
+    for line in head.decode("latin-1").split("\r\n")[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    await reader.readexactly(int(headers.get("content-length", 0)))
+    return int(head[9:12]), headers.get("etag")
+
+
+async def client(host, port, paths, latencies, start_gate):
+    await start_gate.wait()
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        etags = {}
+        for revalidate in (False, True):
+            for path in paths:
+                start = time.perf_counter()
+                status, etag = await request(reader, writer, path, etags.get(path) if revalidate else None)
+                latencies.append(time.perf_counter() - start)
+                if status != (304 if revalidate else 200):
+                    raise RuntimeError(f"{path}: HTTP {status}")
+                etags[path] = etag
+    finally:
+        writer.close()
+
+
+async def load(url, names, clients, per_client):
+    host, port = url.split("//", 1)[1].rsplit(":", 1)
+    rng = random.Random(0)
+    latencies = []
+    start_gate = asyncio.Event()
+    tasks = []
+    for _ in range(clients):
+        picked = rng.sample(names, min(per_client, len(names)))
+        paths = ["/repos/o/r/contents/presets"] + [f"/raw/{name}" for name in picked]
+        paths.append(f"/config/{os.path.splitext(picked[0])[0]}/Config.h")
+        tasks.append(asyncio.create_task(client(host, int(port), paths, latencies, start_gate)))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    start_gate.set()  # every client connects and starts at once
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    return latencies, [r for r in results if isinstance(r, BaseException)], elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=CLIENTS)
+    parser.add_argument("--presets", type=int, default=PRESETS)
+    parser.add_argument("--per-client", type=int, default=PER_CLIENT)
+    parser.add_argument("--p99-budget-ms", type=float, default=P99_BUDGET_MS)
+    parser.add_argument("--corpus-dir", default=os.path.join(tempfile.gettempdir(), "onstep_bench_corpus"))
+    args = parser.parse_args(argv)
+
+    directory = corpus.json_corpus(args.corpus_dir, args.presets)
+    names = sorted(name for name in os.listdir(directory) if name.endswith(".json"))
+    process, url = start_server(directory)
+    try:
+        latencies, errors, elapsed = asyncio.run(load(url, names, args.clients, args.per_client))
+    finally:
+        process.terminate()
+        process.wait()
+    for error in errors[:5]:
+        print(f"client failed: {type(error).__name__}: {error}")
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000 if latencies else 0
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0
+    ok = not errors and p99 <= args.p99_budget_ms
+    print(f"{args.clients} clients, {len(latencies)} requests in {elapsed:.2f}s ({len(latencies) / elapsed:.0f}/s): "
+          f"p50 {p50:.1f} ms, p99 {p99:.1f} ms, {len(errors)} failed clients, budget p99 {args.p99_budget_ms:g} ms  "
+          f"{'OK' if ok else 'OVER BUDGET'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""Time-to-first-paint of the configurator window, eager vs lazy tab construction.
+
+Needs a display (use xvfb-run on headless machines):
+
+    python benchmarks/bench_startup.py --repeat 10
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from onstep_configurator import OnStepConfigurator
+
+
+def time_to_first_paint(lazy_tabs):
+    start = time.perf_counter()
+    root = tk.Tk()
+    OnStepConfigurator(root, lazy_tabs=lazy_tabs)
+    root.update()
+    elapsed = time.perf_counter() - start
+    root.destroy()
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = {}
+    for label, lazy_tabs in (("eager", False), ("lazy", True)):
+        time_to_first_paint(lazy_tabs)  # warm-up: Tcl/Tk init and theme loading
+        samples = [time_to_first_paint(lazy_tabs) for _ in range(args.repeat)]
+        results[label] = statistics.median(samples)
+        print(f"{label:>5}: median {results[label] * 1000:7.1f} ms  "
+              f"(min {min(samples) * 1000:.1f}, max {max(samples) * 1000:.1f}, n={args.repeat})")
+    print(f"speed-up: {results['eager'] / results['lazy']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+"""Correctness checks for the fast paths the benchmarks time.
+
+Each check exercises a case a speed-up once got wrong, so a faster version
+can be verified before its numbers are recorded.  Runs headless and offline.
+
+    python benchmarks/checks.py                   # every check
+    python benchmarks/checks.py config_h_block_comment
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+CHECKS = {}
+
+
+def check(function):
+    CHECKS[function.__name__] = function
+    return function
+
+
+class Scratch:
+    """A temporary folder, removed on exit"""
+
+    def __enter__(self):
+        self.path = tempfile.mkdtemp(prefix="onstep_check_")
+        return self.path
+
+    def __exit__(self, *exc):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+@check
+def config_h_block_comment():
+    """#defines inside a multi-line /* */ block are not imported"""
+    from onstep_config_h import iter_defines
+    lines = ["#define KEPT_1 1",
+             "/* previous mount, kept for reference",
+             "#define COMMENTED_1 2",
+             "#define COMMENTED_2 3 */",
+             "/*",
+             "#define COMMENTED_3 4",
+             "*/ #define KEPT_2 5",
+             "#define KEPT_3 6 /* trailing */",
+             "#define KEPT_4 7 // not a block: /*",
+             "#define KEPT_5 8"]
+    keys = [key for key, _, _ in iter_defines(lines)]
+    assert keys == ["KEPT_1", "KEPT_2", "KEPT_3", "KEPT_4", "KEPT_5"], keys
+
+
+@check
+def config_h_duplicate_names():
+    """Config.h files that would be converted to the same preset name are errors, not overwrites"""
+    from onstep_config_h import conversion_jobs
+    with Scratch() as scratch:
+        for folder in ("a/ridge", "b/ridge", "c/valley"):
+            os.makedirs(os.path.join(scratch, folder))
+            with open(os.path.join(scratch, folder, "Config.h"), 'w') as f:
+                f.write("#define AXIS1_STEPS_PER_DEGREE 100\n")
+        work, errors = conversion_jobs([scratch], os.path.join(scratch, "out"))
+        assert [os.path.basename(target) for _, target in work] == ["valley.json"], work
+        assert sorted(os.path.relpath(source, scratch) for source, _ in errors) == \
+            [os.path.join("a", "ridge", "Config.h"), os.path.join("b", "ridge", "Config.h")], errors
+
+
+@check
+def github_revalidate_and_offline():
+    """Stale cache entries cost a 304 each; with the server gone the cached listing and files are served"""
+    import github_standin
+    from onstep_github import PresetSource
+    files = {"a.json": b'{"MOUNT_TYPE": "GEM"}', "b.json": b'{"MOUNT_TYPE": "FORK"}', "notes.txt": b"x"}
+    server = github_standin.start(files)
+    with Scratch() as scratch:
+        source = PresetSource(cache_dir=scratch, ttl=0, timeout=2, api_base=server.api_base, raw_base=server.raw_base)
+        try:
+            names = source.list_presets()
+            assert names == ["a.json", "b.json"], names
+            bodies, errors = source.fetch_all(names)
+            assert not errors and bodies == {name: files[name] for name in names}, (bodies, errors)
+            source.fetch_all(source.list_presets())
+            assert server.not_modified == 3, server.not_modified
+            assert not source.offline
+            server.shutdown()
+            server.server_close()
+            assert source.list_presets() == names and source.offline
+            bodies, errors = source.fetch_all(names)
+            assert not errors and bodies == {name: files[name] for name in names}, (bodies, errors)
+        finally:
+            source.close()
+            server.server_close()
+
+
+@check
+def github_bad_listing():
+    """A listing that is an error page or an API error object is a PresetListError, and is not cached over a good one"""
+    import github_standin
+    from onstep_github import PresetListError, PresetSource
+    server = github_standin.start({"a.json": b"{}"})
+    with Scratch() as scratch:
+        source = PresetSource(cache_dir=scratch, ttl=0, timeout=2, api_base=server.api_base, raw_base=server.raw_base)
+        try:
+            for body in (b"<html>Sign in to the hotel Wi-Fi</html>", b'{"message": "Not Found"}', b"[1, 2]",
+                         b'[{"path": "a.json"}]'):
+                server.listing_body = body
+                try:
+                    source.list_presets()
+                except PresetListError:
+                    pass
+                else:
+                    raise AssertionError(f"{body!r} was accepted as a listing")
+            server.listing_body = None
+            assert source.list_presets() == ["a.json"]
+            server.listing_body = b"<html>Sign in to the hotel Wi-Fi</html>"
+            assert source.list_presets() == ["a.json"] and source.offline
+        finally:
+            source.close()
+            server.shutdown()
+            server.server_close()
+
+
+def write_presets(folder, presets):
+    """Write {file name: preset dict} into folder (created), as JSON or as CSV by extension"""
+    from onstep_presets import write_preset_csv
+    os.makedirs(folder, exist_ok=True)
+    for name, preset in presets.items():
+        path = os.path.join(folder, name)
+        if name.endswith(".csv"):
+            write_preset_csv(path, preset)
+        else:
+            with open(path, 'w') as f:
+                json.dump(preset, f)
+
+
+@check
+def batch_generator_change():
+    """A new Config.h template or FileVersionConfig re-renders every preset, however unchanged the files are"""
+    import onstep_render_cache
+    import onstep_schema as schema
+    from onstep_configurator import batch_generate
+    with Scratch() as scratch:
+        inputs, output = os.path.join(scratch, "in"), os.path.join(scratch, "out")
+        write_presets(inputs, {"m.json": {}})
+        assert batch_generate([inputs], output, jobs=1)[3] == 1
+        assert batch_generate([inputs], output, jobs=1)[3] == 0
+        saved = schema.TEMPLATE, onstep_render_cache.GENERATOR_DIGEST
+        schema.TEMPLATE = saved[0].replace(f"FileVersionConfig {schema.FILE_VERSION_CONFIG}", "FileVersionConfig 999")
+        onstep_render_cache.GENERATOR_DIGEST = b"a newer generator"
+        try:
+            count, errors, _, written = batch_generate([inputs], output, jobs=1)
+            assert (count, errors, written) == (1, [], 1), (count, errors, written)
+            with open(os.path.join(output, "m", "Config.h")) as f:
+                assert "FileVersionConfig 999" in f.read()
+            assert batch_generate([inputs], output, jobs=1)[3] == 0
+        finally:
+            schema.TEMPLATE, onstep_render_cache.GENERATOR_DIGEST = saved
+
+
+@check
+def sparse_round_trip():
+    """Sparse JSON, packs and imported Config.h files load back to exactly the preset they were made from"""
+    import corpus
+    import onstep_schema as schema
+    from onstep_config_h import convert_config_file
+    from onstep_delta import read_pack, write_pack
+    from onstep_presets import read_preset_file, write_preset_json
+    presets = [schema.values_to_dict(schema.values_from_dict(preset)) for preset in corpus.make_presets(50)]
+    with Scratch() as scratch:
+        for n, preset in enumerate(presets):
+            path = os.path.join(scratch, f"{n}.json")
+            write_preset_json(path, preset, sparse=True)
+            assert read_preset_file(path) == preset, n
+            with open(path) as f:
+                assert len(json.load(f)["values"]) < len(preset), n
+        pack = os.path.join(scratch, "all.ospk")
+        write_pack(pack, [(str(n), preset) for n, preset in enumerate(presets)])
+        assert read_pack(pack) == [(str(n), preset) for n, preset in enumerate(presets)]
+        header, target = os.path.join(scratch, "Config.h"), os.path.join(scratch, "imported.json")
+        with open(header, 'w') as f:
+            f.write(schema.render(schema.values_from_dict(presets[0])))
+        assert convert_config_file((header, target))[3] is None
+        assert read_preset_file(target) == presets[0]
+
+
+@check
+def library_refresh():
+    """The library index follows added, changed, deleted and broken preset files"""
+    import time
+    from onstep_library import PresetLibrary
+    with Scratch() as scratch:
+        write_presets(scratch, {"a.json": {"MOUNT_TYPE": "GEM"}, "b.json": {"MOUNT_TYPE": "FORK"}})
+        with PresetLibrary(scratch, os.path.join(scratch, "index.sqlite")) as library:
+            assert library.refresh() == (2, 0, 0, 0)
+            assert library.search({"MOUNT_TYPE": "FORK"}) == ["b.json"]
+            assert library.refresh() == (0, 0, 0, 0)
+            time.sleep(0.01)  # a new mtime even on coarse clocks
+            write_presets(scratch, {"a.json": {"MOUNT_TYPE": "FORK"}})
+            with open(os.path.join(scratch, "b.json"), 'w') as f:
+                f.write("{not json")
+            assert library.refresh() == (0, 1, 0, 1)
+            assert library.search({"MOUNT_TYPE": "FORK"}) == ["a.json"]
+            assert library.search({"MOUNT_TYPE": "GEM"}) == []
+            write_presets(scratch, {"b.json": {"MOUNT_TYPE": "GEM"}})
+            os.remove(os.path.join(scratch, "a.json"))
+            assert library.refresh() == (1, 0, 1, 0)
+            assert library.search() == ["b.json"]
+
+
+@check
+def catalog_rows():
+    """Appended catalog rows stream back in order and can be picked by name, number or as the last row"""
+    from onstep_catalog import append_catalog_row, iter_catalog, iter_catalog_names, select_catalog_row
+    with Scratch() as scratch:
+        path = os.path.join(scratch, "catalog.csv")
+        for n in range(5):
+            append_catalog_row(path, {"AXIS1_STEPS_PER_DEGREE": str(100 * n)}, f"mount{n}")
+        assert list(iter_catalog_names(path)) == [(n, f"mount{n}") for n in range(5)]
+        assert [row["AXIS1_STEPS_PER_DEGREE"] for row in iter_catalog(path)] == [str(100 * n) for n in range(5)]
+        assert select_catalog_row(path, "mount2")["AXIS1_STEPS_PER_DEGREE"] == "200"
+        assert select_catalog_row(path, "-2")["AXIS1_STEPS_PER_DEGREE"] == "300"
+        assert select_catalog_row(path, "")["AXIS1_STEPS_PER_DEGREE"] == "400"
+
+
+@check
+def diff_and_merge():
+    """diff lists exactly the changed keys; merge takes one-sided changes and reports the conflicting ones"""
+    import onstep_schema as schema
+    from onstep_diff import OTHER, diff, merge
+    first, second, third = schema.KEYS[0], schema.KEYS[1], schema.KEYS[2]
+    base = schema.values_to_dict(schema.DEFAULTS)
+    base["CUSTOM_DEFINE"] = "1"
+    ours = dict(base, **{first: "ours", second: "both"})
+    theirs = dict(base, **{second: "theirs", third: "theirs"})
+    theirs["CUSTOM_DEFINE"] = "2"
+    assert diff(base, base) == []
+    assert [(c.key, c.old, c.new) for c in diff(base, theirs)] == \
+        [(second, base[second], "theirs"), (third, base[third], "theirs"), ("CUSTOM_DEFINE", "1", "2")]
+    assert diff(base, theirs)[-1].section == OTHER
+    merged, conflicts = merge(base, ours, theirs)
+    assert (merged[first], merged[second], merged[third], merged["CUSTOM_DEFINE"]) == ("ours", "both", "theirs", "2")
+    assert [(c.key, c.base, c.ours, c.theirs) for c in conflicts] == [(second, base[second], "both", "theirs")]
+    assert merge(base, ours, theirs, prefer="theirs").preset[second] == "theirs"
+    assert merge(base, ours, ours) == (ours, [])
+
+
+@check
+def history_undo_redo():
+    """Typing in one field is one undo step, a preset load another, and redo replays both"""
+    import onstep_schema as schema
+    from onstep_history import History
+    from onstep_model import ConfigModel
+    now = [0.0]
+    model = ConfigModel()
+    history = History(model, clock=lambda: now[0])
+    key, other = schema.KEYS[0], schema.KEYS[1]
+    for text in ("1", "12", "123"):
+        model.set(key, text, origin="grid")
+        now[0] += 0.1
+    now[0] += 10
+    model.update({key: "preset", other: "preset"})
+    assert history.undo() and (model[key], model[other]) == ("123", schema.DEFAULTS[1])
+    assert history.undo() and model.values == list(schema.DEFAULTS)
+    assert not history.undo()
+    assert history.redo() and model[key] == "123"
+    assert history.redo() and (model[key], model[other]) == ("preset", "preset")
+    assert not history.redo()
+    history.undo()
+    model.set(other, "new", origin="grid")
+    assert not history.redo(), "a new edit clears redo"
+
+
+@check
+def journal_recovery():
+    """A journal left by a killed session replays to its last complete edit, across compactions"""
+    import subprocess
+    import onstep_journal
+    import onstep_schema as schema
+    with Scratch() as scratch:
+        # A separate process that exits without closing its journal, as a crash would
+        script = (f"import sys; sys.path.insert(0, {REPO_DIR!r})\n"
+                  "import os, onstep_journal, onstep_schema as schema\n"
+                  f"journal = onstep_journal.Journal.open({scratch!r})\n"
+                  "journal.start(schema.DEFAULTS)\n"
+                  f"for n in range({onstep_journal.COMPACT_RECORDS + 5}):\n"
+                  "    journal.append({n % 3: str(n)})\n"
+                  "    journal.sync()\n"
+                  "os._exit(0)\n")
+        subprocess.run([sys.executable, "-c", script], check=True)
+        journal = onstep_journal.Journal.open(scratch)
+        assert journal is not None, "the lock outlived the process"
+        try:
+            values, _ = journal.recover()
+            last = onstep_journal.COMPACT_RECORDS + 4
+            expected = list(schema.DEFAULTS)
+            for n in range(last - 2, last + 1):
+                expected[n % 3] = str(n)
+            assert values == expected
+            assert onstep_journal.Journal.open(scratch) is None, "a second session got the lock"
+            with open(journal.path, 'ab') as f:
+                f.write(b'[0,"torn')  # a write cut off by the crash
+            assert journal.recover()[0] == expected
+        finally:
+            journal.close()
+        assert not os.path.exists(journal.path)
+
+
+def wait_for(condition, timeout=5.0):
+    """Poll condition() until it is true; False after timeout seconds"""
+    import time
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+@check
+def batch_name_clash():
+    """Presets with the same name in different folders, or as .json and .csv, are errors and neither is rendered"""
+    from onstep_configurator import batch_generate
+    with Scratch() as scratch:
+        write_presets(os.path.join(scratch, "a"), {"m.json": {"AXIS1_STEPS_PER_DEGREE": "100"}, "n.json": {}})
+        write_presets(os.path.join(scratch, "b"), {"m.json": {"AXIS1_STEPS_PER_DEGREE": "200"}})
+        write_presets(os.path.join(scratch, "c"), {"o.json": {}, "o.csv": {}})
+        output = os.path.join(scratch, "out")
+        count, errors, _, written = batch_generate([os.path.join(scratch, folder) for folder in "abc"], output, jobs=1)
+        failed = sorted(os.path.relpath(source, scratch) for source, _ in errors)
+        assert failed == [os.path.join(*parts) for parts in (("a", "m.json"), ("b", "m.json"),
+                                                             ("c", "o.csv"), ("c", "o.json"))], failed
+        assert (count, written) == (5, 1), (count, written)
+        assert sorted(name for name in os.listdir(output) if not name.startswith(".")) == ["n"]
+
+
+@check
+def batch_unchanged_skips():
+    """A second batch over unchanged presets writes nothing, whether or not some names clash"""
+    from onstep_configurator import batch_generate
+    with Scratch() as scratch:
+        inputs = [os.path.join(scratch, "a"), os.path.join(scratch, "b")]
+        write_presets(inputs[0], {"m.json": {}, "n.json": {"AXIS1_STEPS_PER_DEGREE": "100"}, "p.csv": {}})
+        write_presets(inputs[1], {"m.json": {"AXIS1_STEPS_PER_DEGREE": "200"}})
+        output = os.path.join(scratch, "out")
+        first = batch_generate(inputs, output, jobs=1)
+        assert (first[0], len(first[1]), first[3]) == (4, 2, 2), first
+        for _ in range(2):
+            count, errors, _, written = batch_generate(inputs, output, jobs=1)
+            assert (count, len(errors), written) == (4, 2, 0), (count, errors, written)
+        write_presets(inputs[0], {"n.json": {"AXIS1_STEPS_PER_DEGREE": "300"}})
+        assert batch_generate(inputs, output, jobs=1)[3] == 1
+
+
+@check
+def watch_name_clash():
+    """watch renders m.json, refuses it while m.csv is there too, and renders it again once m.csv is gone"""
+    import threading
+    from onstep_configurator import watch_presets
+    with Scratch() as scratch:
+        inputs, output = os.path.join(scratch, "in"), os.path.join(scratch, "out")
+        write_presets(inputs, {"m.json": {"AXIS1_STEPS_PER_DEGREE": "100"}})
+        messages, stop = [], threading.Event()
+        thread = threading.Thread(target=watch_presets, args=(inputs, output), daemon=True,
+                                  kwargs={"poll_interval": 0.02, "report": messages.append, "stop": stop})
+        thread.start()
+        config = os.path.join(output, "m", "Config.h")
+        try:
+            assert wait_for(lambda: os.path.isfile(config)), messages
+            write_presets(inputs, {"m.csv": {}})
+            assert wait_for(lambda: any("would also be written" in m for m in messages)), messages
+            os.remove(os.path.join(inputs, "m.csv"))
+            os.remove(config)
+            assert wait_for(lambda: os.path.isfile(config)), messages
+        finally:
+            stop.set()
+            thread.join()
+
+
+@check
+def server_name_clash():
+    """The preset server serves no Config.h for a name two preset files share"""
+    from onstep_server import PresetStore
+    with Scratch() as scratch:
+        write_presets(scratch, {"m.json": {}, "n.json": {}})
+        store = PresetStore(scratch, poll_interval=60, report=lambda message: None)
+        try:
+            assert store.config("m") is not None
+            write_presets(scratch, {"m.csv": {}})
+            store.load("m.csv")
+            assert store.config("m") is None and store.config("n") is not None
+            assert [("config_url" in entry) for entry in json.loads(store.listing("http://x").body)] == \
+                [False, False, True]
+            os.remove(os.path.join(scratch, "m.csv"))
+            store.load("m.csv")
+            assert store.config("m") is not None
+        finally:
+            store.close()
+
+
+def main(argv=None):
+    names = (sys.argv[1:] if argv is None else argv) or list(CHECKS)
+    unknown = [name for name in names if name not in CHECKS]
+    if unknown:
+        print(f"unknown checks: {', '.join(unknown)}; available: {', '.join(CHECKS)}")
+        return 2
+    failed = 0
+    for name in names:
+        try:
+            CHECKS[name]()
+        except Exception as e:
+            failed += 1
+            print(f"{name:<32} FAILED  {type(e).__name__}: {e}")
+        else:
+            print(f"{name:<32} ok")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""Synthetic preset corpora for the benchmarks.
+
+Presets are the schema defaults with the settings people actually vary (board,
+drivers, gearing, currents, slew rates) drawn from a seeded RNG, so the same
+count and seed always give byte-identical files.  Corpora are written once and
+reused until the count, seed or schema changes.
+"""
+import csv
+import json
+import os
+import random
+
+import onstep_schema as schema
+from onstep_catalog import NAME_COLUMN
+
+SEED = 20240611
+
+_VARIED = {
+    "PINMAP": schema.PINMAPS[1:],
+    "MOUNT_TYPE": ("GEM", "FORK", "ALTAZM"),
+    "AXIS1_DRIVER_MODEL": schema.DRIVER_MODELS[1:],
+    "AXIS2_DRIVER_MODEL": schema.DRIVER_MODELS[1:],
+    "AXIS1_DRIVER_MICROSTEPS": ("8", "16", "32", "64"),
+    "AXIS2_DRIVER_MICROSTEPS": ("8", "16", "32", "64"),
+    "AXIS1_DRIVER_MICROSTEPS_GOTO": ("1", "2", "4", "OFF"),
+    "AXIS2_DRIVER_MICROSTEPS_GOTO": ("1", "2", "4", "OFF"),
+    "AXIS1_DRIVER_IRUN": ("OFF", "600", "900", "1200"),
+    "AXIS2_DRIVER_IRUN": ("OFF", "600", "900", "1200"),
+    "SLEW_RATE_BASE_DESIRED": ("0.5", "1", "2", "3", "4.5"),
+    "TIME_LOCATION_SOURCE": ("OFF", "DS3231", "GPS", "NTP"),
+    "WEATHER": ("OFF", "BME280", "BMP280"),
+}
+
+
+def make_preset(rng):
+    values = list(schema.DEFAULTS)
+    for key, choices in _VARIED.items():
+        values[schema.KEY_INDEX[key]] = rng.choice(choices)
+    for key in ("AXIS1_STEPS_PER_DEGREE", "AXIS2_STEPS_PER_DEGREE"):
+        values[schema.KEY_INDEX[key]] = str(rng.randrange(3600, 64000))
+    return schema.values_to_dict(values)
+
+
+def make_presets(count, seed=SEED):
+    rng = random.Random(seed)
+    return [make_preset(rng) for _ in range(count)]
+
+
+def _stamp(count, seed):
+    return f"{count} {seed} {len(schema.KEYS)} {schema.FILE_VERSION_CONFIG}"
+
+
+def _is_current(marker, stamp):
+    try:
+        with open(marker) as f:
+            return f.read() == stamp
+    except OSError:
+        return False
+
+
+def json_corpus(root, count, seed=SEED):
+    """Directory of count JSON presets (p000000.json ...), generated on first use"""
+    directory = os.path.join(root, f"json-{count}")
+    marker = os.path.join(directory, ".complete")
+    stamp = _stamp(count, seed)
+    if not _is_current(marker, stamp):
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        for n, preset in enumerate(make_presets(count, seed)):
+            with open(os.path.join(directory, f"p{n:06d}.json"), 'w') as f:
+                json.dump(preset, f)
+        with open(marker, 'w') as f:
+            f.write(stamp)
+    return directory
+
+
+def csv_catalog(root, count, seed=SEED):
+    """A count-row CSV catalog with a NAME_COLUMN, generated on first use"""
+    path = os.path.join(root, f"catalog-{count}.csv")
+    marker = path + ".complete"
+    stamp = _stamp(count, seed)
+    if not _is_current(marker, stamp):
+        os.makedirs(root, exist_ok=True)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=[NAME_COLUMN] + list(schema.KEYS))
+            writer.writeheader()
+            for n, preset in enumerate(make_presets(count, seed)):
+                writer.writerow(dict(preset, **{NAME_COLUMN: f"mount{n:06d}"}))
+        with open(marker, 'w') as f:
+            f.write(stamp)
+    return path
@@ -0,0 +1,80 @@
+"""A local stand-in for the two GitHub endpoints PresetSource talks to.
+
+    GET /repos/<owner>/<repo>/contents/<folder>   JSON listing with download_url
+    GET /raw/<name>                               preset body
+
+Both answer with an ETag and honour If-None-Match with a 304, like GitHub.
+Set listing_body to answer the listing with something else (an error page,
+say).  Run it in-process with start(); it serves until server.shutdown().
+"""
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so the pooled session reuses connections
+
+    def do_GET(self):
+        files = self.server.files
+        path = unquote(self.path.split("?", 1)[0])
+        if path.startswith("/repos/") and "/contents/" in path:
+            base = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}/raw"
+            body = self.server.listing(base)
+        elif path.startswith("/raw/") and path[5:] in files:
+            body = files[path[5:]]
+        else:
+            self.send_error(404)
+            return
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        self.server.requests += 1
+        if self.headers.get("If-None-Match") == etag:
+            self.server.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, files, address=("127.0.0.1", 0)):
+        super().__init__(address, StandinHandler)
+        self.files = files
+        self.requests = 0
+        self.not_modified = 0
+        self.listing_body = None
+        self._listing = None
+
+    def listing(self, base):
+        if self.listing_body is not None:
+            return self.listing_body
+        if self._listing is None:
+            self._listing = json.dumps([{"name": name, "type": "file", "download_url": f"{base}/{name}"}
+                                        for name in sorted(self.files)]).encode()
+        return self._listing
+
+    @property
+    def api_base(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    raw_base = api_base
+
+
+def start(files):
+    """Serve {name: bytes} on a free localhost port from a daemon thread; returns the server"""
+    server = StandinServer(files)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
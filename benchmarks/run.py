@@ -0,0 +1,354 @@
+"""Benchmark suite: render, preset load/save, CSV, GitHub fetch, validation, batch and startup.
+
+Runs headless: GitHub is replaced by a local stand-in server and the window
+benchmark is skipped when there is no display (use xvfb-run to include it).
+Corpora of synthetic presets are generated once per size and reused.
+
+    python benchmarks/run.py                                 # 1, 100 and 1000 presets
+    python benchmarks/run.py --sizes 1,1000,100000 -o results.json
+    python benchmarks/run.py --check                         # exit 1 on regressions vs baseline.json
+    python benchmarks/run.py --save-baseline                 # record this machine's numbers
+
+Timings are machine-specific: record a baseline on the machine that checks it.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+import onstep_schema as schema
+from onstep_model import ConfigModel
+from onstep_github import PresetSource
+from onstep_catalog import iter_catalog, iter_catalog_names, select_catalog_row
+from onstep_presets import read_preset_file, write_preset_json, write_preset_csv, find_preset_files
+import onstep_validate as validation
+import corpus
+import github_standin
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_SIZES = "1,100,1000"
+FETCH_LIMIT = 1000  # presets served by the stand-in; a real GitHub folder is far smaller
+MIN_REGRESSION_SECONDS = 0.002  # ignore slowdowns smaller than timer noise
+
+BENCHMARKS = {}
+
+
+def benchmark(name, sized=True):
+    """Register setup(context, size) -> the callable to time, or None to skip"""
+    def register(setup):
+        BENCHMARKS[name] = (setup, sized)
+        return setup
+    return register
+
+
+class Context:
+    """Corpora, scratch directories and stand-in servers shared by the benchmarks of one run"""
+
+    def __init__(self, corpus_dir, fetch_limit):
+        self.corpus_dir = corpus_dir
+        self.fetch_limit = fetch_limit
+        self.scratch = tempfile.mkdtemp(prefix="onstep_bench_")
+        self._presets = {}
+        self._servers = {}
+
+    def presets(self, size):
+        if size not in self._presets:
+            self._presets[size] = corpus.make_presets(size)
+        return self._presets[size]
+
+    def json_corpus(self, size):
+        return corpus.json_corpus(self.corpus_dir, size)
+
+    def csv_catalog(self, size):
+        return corpus.csv_catalog(self.corpus_dir, size)
+
+    def scratch_dir(self, name):
+        return tempfile.mkdtemp(prefix=name + "_", dir=self.scratch)
+
+    def server(self, size):
+        if size not in self._servers:
+            files = {f"p{n:06d}.json": json.dumps(preset).encode() for n, preset in enumerate(self.presets(size))}
+            self._servers[size] = github_standin.start(files)
+        return self._servers[size]
+
+    def preset_source(self, size, ttl=300):
+        server = self.server(size)
+        return PresetSource(cache_dir=self.scratch_dir("cache"), ttl=ttl,
+                            api_base=server.api_base, raw_base=server.raw_base)
+
+    def close(self):
+        for server in self._servers.values():
+            server.shutdown()
+            server.server_close()
+        shutil.rmtree(self.scratch, ignore_errors=True)
+
+
+@benchmark("render")
+def bench_render(context, size):
+    """generate_config: Config.h text for every preset"""
+    rows = [schema.values_from_dict(preset) for preset in context.presets(size)]
+    return lambda: [schema.render(values) for values in rows]
+
+
+@benchmark("load_preset")
+def bench_load_preset(context, size):
+    """load_preset: read each JSON file and apply it to the model"""
+    paths = find_preset_files([context.json_corpus(size)])
+    model = ConfigModel()
+
+    def run():
+        for path in paths:
+            model.update(read_preset_file(path))
+    return run
+
+
+@benchmark("save_preset")
+def bench_save_preset(context, size):
+    """save_preset: sparse JSON, only the values that differ from the baseline"""
+    directory = context.scratch_dir("save")
+    presets = context.presets(size)
+    return lambda: [write_preset_json(os.path.join(directory, f"{n}.json"), preset, sparse=True)
+                    for n, preset in enumerate(presets)]
+
+
+@benchmark("save_preset_full")
+def bench_save_preset_full(context, size):
+    """The same presets written with every key, for comparison"""
+    directory = context.scratch_dir("save")
+    presets = context.presets(size)
+    return lambda: [write_preset_json(os.path.join(directory, f"{n}.json"), preset)
+                    for n, preset in enumerate(presets)]
+
+
+@benchmark("export_csv")
+def bench_export_csv(context, size):
+    directory = context.scratch_dir("export")
+    model = ConfigModel()
+    return lambda: [write_preset_csv(os.path.join(directory, f"{n}.csv"), model.to_dict()) for n in range(size)]
+
+
+@benchmark("import_csv")
+def bench_import_csv(context, size):
+    """import_csv on a size-row catalog: the last row, then a row picked by name from the middle"""
+    path = context.csv_catalog(size)
+    name = f"mount{size // 2:06d}"
+    return lambda: (select_catalog_row(path, ""), select_catalog_row(path, name))
+
+
+@benchmark("catalog_scan")
+def bench_catalog_scan(context, size):
+    """iter_catalog over a size-row catalog, and the names the Import CSV picker lists"""
+    path = context.csv_catalog(size)
+    return lambda: (sum(1 for _ in iter_catalog(path)), sum(1 for _ in iter_catalog_names(path)))
+
+
+@benchmark("fetch_cold")
+def bench_fetch_cold(context, size):
+    """fetch_from_github + prefetch all with an empty cache"""
+    if size > context.fetch_limit:
+        return None
+    context.server(size)
+
+    def run():
+        source = context.preset_source(size)
+        source.fetch_all(source.list_presets())
+        source.close()
+    return run
+
+
+@benchmark("fetch_warm")
+def bench_fetch_warm(context, size):
+    """The same with every response cached and fresh: no requests at all"""
+    if size > context.fetch_limit:
+        return None
+    source = context.preset_source(size)
+    source.fetch_all(source.list_presets())
+    return lambda: source.fetch_all(source.list_presets())
+
+
+@benchmark("fetch_revalidate")
+def bench_fetch_revalidate(context, size):
+    """The same with every cached response stale: one 304 per file"""
+    if size > context.fetch_limit:
+        return None
+    source = context.preset_source(size, ttl=0)
+    source.fetch_all(source.list_presets())
+    return lambda: source.fetch_all(source.list_presets())
+
+
+@benchmark("validate")
+def bench_validate(context, size):
+    fleet = validation.encode_fleet(context.presets(size))
+    return lambda: validation.validate_fleet(fleet)
+
+
+@benchmark("batch")
+def bench_batch(context, size):
+    """batch CLI on one process: read, render and write every preset (--force)"""
+    from onstep_configurator import batch_generate
+    inputs = [context.json_corpus(size)]
+    output = context.scratch_dir("batch")
+    return lambda: batch_generate(inputs, output, jobs=1, force=True)
+
+
+@benchmark("batch_unchanged")
+def bench_batch_unchanged(context, size):
+    """batch again over an unchanged fleet: every Config.h is already up to date"""
+    from onstep_configurator import batch_generate
+    inputs = [context.json_corpus(size)]
+    output = context.scratch_dir("batch")
+    batch_generate(inputs, output, jobs=1)
+    return lambda: batch_generate(inputs, output, jobs=1)
+
+
+@benchmark("startup_import", sized=False)
+def bench_startup_import(context, size):
+    """Cold interpreter importing the application module"""
+    command = [sys.executable, "-c", "import onstep_configurator"]
+    return lambda: subprocess.run(command, cwd=REPO_DIR, check=True)
+
+
+@benchmark("startup_model", sized=False)
+def bench_startup_model(context, size):
+    """The Tk-less part of startup: a fresh model rendered once"""
+    return lambda: ConfigModel().render()
+
+
+@benchmark("startup_window", sized=False)
+def bench_startup_window(context, size):
+    """OnStepConfigurator.__init__ to first paint; needs a display"""
+    import tkinter as tk
+    try:
+        tk.Tk().destroy()
+    except tk.TclError:
+        return None
+    from bench_startup import time_to_first_paint
+    return lambda: time_to_first_paint(lazy_tabs=True)
+
+
+def measure(run, repeat, budget):
+    """Median and min wall time of run(); the first call is a warm-up unless it is already slow"""
+    samples = []
+    start = time.perf_counter()
+    first = time.perf_counter()
+    run()
+    first = time.perf_counter() - first
+    if first > 1.0:
+        samples.append(first)
+    while len(samples) < repeat and (not samples or time.perf_counter() - start < budget):
+        t = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - t)
+    return {"median": statistics.median(samples), "min": min(samples), "samples": len(samples)}
+
+
+def run_suite(sizes, names, repeat, budget, corpus_dir, fetch_limit):
+    context = Context(corpus_dir, fetch_limit)
+    results = {}
+    try:
+        for name in names:
+            setup, sized = BENCHMARKS[name]
+            for size in (sizes if sized else [None]):
+                label = f"{name}/{size}" if sized else name
+                run = setup(context, size)
+                if run is None:
+                    print(f"{label:<28} skipped")
+                    continue
+                result = measure(run, repeat, budget)
+                if sized:
+                    result["size"] = size
+                    result["per_item_us"] = result["median"] / size * 1e6
+                results[label] = result
+                per_item = f"  {result['per_item_us']:10.1f} us/preset" if sized else ""
+                print(f"{label:<28} {result['median'] * 1000:10.2f} ms{per_item}  (n={result['samples']})")
+    finally:
+        context.close()
+    return results
+
+
+def metadata(sizes):
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {"python": platform.python_version(), "platform": platform.platform(), "machine": platform.machine(),
+            "cpus": os.cpu_count(), "numpy": numpy_version, "sizes": sizes,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z")}
+
+
+def compare(results, baseline, tolerance):
+    """Names of benchmarks slower than baseline by more than tolerance (and more than timer noise)"""
+    regressions = []
+    for label, result in results.items():
+        base = baseline.get(label)
+        if base is None:
+            continue
+        ratio = result["median"] / base["median"] if base["median"] else float("inf")
+        slower = result["median"] - base["median"]
+        regressed = ratio > 1 + tolerance and slower > MIN_REGRESSION_SECONDS
+        print(f"{label:<28} {base['median'] * 1000:10.2f} -> {result['median'] * 1000:10.2f} ms  "
+              f"x{ratio:5.2f}{'  REGRESSION' if regressed else ''}")
+        if regressed:
+            regressions.append(label)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma-separated preset counts (default: {DEFAULT_SIZES})")
+    parser.add_argument("--only", help="comma-separated benchmark names (default: all): " + ", ".join(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark (default: 5)")
+    parser.add_argument("--budget", type=float, default=10.0, help="stop repeating a benchmark after this many seconds")
+    parser.add_argument("--corpus-dir", default=os.path.join(tempfile.gettempdir(), "onstep_bench_corpus"),
+                        help="where generated corpora are kept between runs")
+    parser.add_argument("--fetch-limit", type=int, default=FETCH_LIMIT,
+                        help=f"skip fetch benchmarks above this many presets (default: {FETCH_LIMIT})")
+    parser.add_argument("-o", "--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON (default: benchmarks/baseline.json)")
+    parser.add_argument("--check", action="store_true", help="compare with the baseline; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing (default: 0.25)")
+    parser.add_argument("--save-baseline", action="store_true", help="write these results to the baseline file")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    if any(size < 1 for size in sizes) or args.repeat < 1:
+        parser.error("--sizes and --repeat must be positive")
+
+    results = run_suite(sizes, names, args.repeat, args.budget, args.corpus_dir, args.fetch_limit)
+    report = {"meta": metadata(sizes), "results": results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    if args.check:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        print(f"\nCompared with {args.baseline} (tolerance {args.tolerance:.0%}):")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+        print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
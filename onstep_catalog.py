@@ -0,0 +1,109 @@
+"""Multi-row CSV preset catalogs (one row per mount).
+
+Rows are streamed with csv.reader and never loaded all at once, so picking
+a row or appending one costs the same on a ten-row catalog and a 100k-row one.
+A catalog has the schema keys as columns plus an optional NAME_COLUMN used to
+pick rows by name.
+"""
+import csv
+import os
+from collections import deque
+from itertools import islice
+
+import onstep_schema as schema
+
+NAME_COLUMN = "PRESET_NAME"
+
+
+def iter_catalog(file_path):
+    """Yield each row of a catalog as a dict, one at a time"""
+    with open(file_path, 'r', newline='', encoding='utf-8-sig') as f:
+        yield from csv.DictReader(f)
+
+
+def iter_catalog_names(file_path):
+    """Yield (index, name) for every row; name is None when the catalog has no NAME_COLUMN"""
+    with open(file_path, 'r', newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = next(reader, None) or []
+        column = header.index(NAME_COLUMN) if NAME_COLUMN in header else None
+        for index, row in enumerate(reader):
+            yield index, row[column] if column is not None and len(row) > column else None
+
+
+def find_catalog_row(file_path, name=None, index=None):
+    """Return the row with the given name, or at the given index (negative counts from the end).
+
+    With neither, the last row is returned, matching what import_csv always did.
+    Rows are scanned as plain lists; only the match is turned into a dict.
+    Raises LookupError if nothing matches.
+    """
+    with open(file_path, 'r', newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = next(reader, None) or []
+        if name is not None:
+            if NAME_COLUMN not in header:
+                raise LookupError(f"{file_path} has no {NAME_COLUMN} column")
+            column = header.index(NAME_COLUMN)
+            row = next((row for row in reader if len(row) > column and row[column] == name), None)
+            if row is None:
+                raise LookupError(f"no row named {name!r} in {file_path}")
+        else:
+            if index is None:
+                index = -1
+            if index >= 0:
+                row = next(islice(reader, index, None), None)
+            else:
+                tail = deque(reader, maxlen=-index)
+                row = tail[0] if len(tail) == -index else None
+            if row is None:
+                raise LookupError(f"no row {index} in {file_path}")
+    return dict(zip(header, row))
+
+
+def select_catalog_row(file_path, selector):
+    """Find a row from user input: an integer is an index, anything else a name, blank the last row"""
+    selector = (selector or "").strip()
+    if not selector:
+        return find_catalog_row(file_path)
+    try:
+        index = int(selector)
+    except ValueError:
+        return find_catalog_row(file_path, name=selector)
+    return find_catalog_row(file_path, index=index)
+
+
+def _read_header(file_path):
+    with open(file_path, 'r', newline='', encoding='utf-8-sig') as f:
+        return next(csv.reader(f), None)
+
+
+def _ends_with_newline(file_path):
+    with open(file_path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) in (b"\n", b"\r")
+
+
+def append_catalog_row(file_path, preset, name=None):
+    """Append one preset as a new row without rewriting the file.
+
+    A new (or empty) file gets a header of NAME_COLUMN plus every schema key.
+    Keys the existing header does not have are dropped and returned.
+    """
+    row = dict(preset)
+    if name is not None:
+        row[NAME_COLUMN] = name
+    exists = os.path.exists(file_path) and os.path.getsize(file_path) > 0
+    header = _read_header(file_path) if exists else None
+    if not header:
+        header = [NAME_COLUMN] + list(schema.KEYS)
+        exists = False
+    dropped = [key for key in row if key not in header]
+    with open(file_path, 'a' if exists else 'w', newline='', encoding='utf-8') as f:
+        if exists and not _ends_with_newline(file_path):
+            f.write("\r\n")
+        writer = csv.DictWriter(f, fieldnames=header, extrasaction='ignore')
+        if not exists:
+            writer.writeheader()
+        writer.writerow(row)
+    return dropped
@@ -0,0 +1,142 @@
+"""Reverse-parse OnStepX Config.h files into presets.
+
+The tokenizer streams a file line by line, drops // and /* */ comments (the
+upstream Config.h decorates nearly every define with them) and yields each
+``#define KEY VALUE``.  Defines are mapped onto the schema keys; anything else
+is reported as unknown, and schema keys the file never defines as missing.
+"""
+import os
+import re
+from collections import namedtuple
+
+import onstep_schema as schema
+from onstep_presets import write_preset_json
+
+_DEFINE = re.compile(r'\s*#\s*define\s+([A-Za-z_]\w*)(\(?)\s*(.*?)\s*$')
+_COMMENT_TOKEN = re.compile(r'"(?:\\.|[^"\\])*"|//|/\*|\*/')
+
+# Defines written by the generator itself that are not parameters
+_GENERATED_KEYS = {"FileVersionConfig"}
+
+ConfigImport = namedtuple("ConfigImport", "values unknown missing")
+
+
+def _strip_comments(line, in_block):
+    """Remove comments from one line; returns (code, still inside a block comment)"""
+    if not in_block and "/" not in line:
+        return line, False
+    code = []
+    pos = 0
+    for match in _COMMENT_TOKEN.finditer(line):
+        token = match.group()
+        if in_block:
+            if token == "*/":
+                in_block = False
+                pos = match.end()
+        elif token == "//":
+            code.append(line[pos:match.start()])
+            return "".join(code), False
+        elif token == "/*":
+            code.append(line[pos:match.start()])
+            in_block = True
+    if not in_block:
+        code.append(line[pos:])
+    return "".join(code), in_block
+
+
+def iter_defines(lines):
+    """Yield (key, value, line number) for every object-like #define in an iterable of lines"""
+    in_block = False
+    for number, line in enumerate(lines, 1):
+        # Only lines that define something or open or close a block comment need tokenizing
+        if in_block:
+            if "*/" not in line:
+                continue
+        elif "define" not in line and "/*" not in line:
+            continue
+        code, in_block = _strip_comments(line, in_block)
+        match = _DEFINE.match(code)
+        if match and not match.group(2):
+            yield match.group(1), match.group(3), number
+
+
+def _unquote(value):
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1]
+    return value
+
+
+def parse_config_h(file_path):
+    """Read a Config.h into a ConfigImport(values, unknown, missing).
+
+    values maps schema keys to the value found, unknown maps every other define to
+    its value, and missing lists the schema keys the file does not define.
+    """
+    values, unknown = {}, {}
+    index = schema.KEY_INDEX
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        for key, value, _ in iter_defines(f):
+            i = index.get(key)
+            if i is None:
+                if key not in _GENERATED_KEYS:
+                    unknown[key] = value
+            elif schema.PARAMS[i].type == schema.STRING:
+                values[key] = _unquote(value)
+            else:
+                values[key] = value
+    missing = [key for key in schema.KEYS if key not in values]
+    return ConfigImport(values, unknown, missing)
+
+
+def find_config_files(inputs):
+    """Config headers from files, or *.h files found recursively under directories"""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for directory, _, names in os.walk(item):
+                paths.extend(os.path.join(directory, name) for name in sorted(names) if name.endswith(".h"))
+        elif os.path.isfile(item):
+            paths.append(item)
+    return paths
+
+
+def preset_name(file_path):
+    """mounts/ridge/Config.h -> ridge, mounts/ridge.h -> ridge"""
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    if stem.lower() == "config":
+        parent = os.path.basename(os.path.dirname(os.path.abspath(file_path)))
+        return parent or stem
+    return stem
+
+
+def convert_config_file(job):
+    """Convert one Config.h to a sparse JSON preset, as Save Preset writes; returns (source, unknown count, missing count, error)"""
+    source, target = job
+    try:
+        result = parse_config_h(source)
+        preset = schema.values_to_dict(schema.values_from_dict(result.values))
+        write_preset_json(target, preset, sparse=True)
+    except OSError as e:
+        return source, 0, 0, f"{type(e).__name__}: {e}"
+    return source, len(result.unknown), len(result.missing), None
+
+
+def conversion_jobs(inputs, output_dir):
+    """(source, output_dir/<name>.json) for every Config.h found in inputs, and [(source, error)].
+
+    Sources that would be written to the same output (mounts/a/ridge/Config.h and
+    mounts/b/ridge/Config.h) are all errors rather than overwriting one another.
+    """
+    targets = {}
+    for path in find_config_files(inputs):
+        target = os.path.join(output_dir, preset_name(path) + ".json")
+        targets.setdefault(os.path.normcase(target), []).append((path, target))
+    work, errors = [], []
+    for claims in targets.values():
+        if len(claims) == 1:
+            work.append(claims[0])
+            continue
+        for path, target in claims:
+            others = ", ".join(other for other, _ in claims if other != path)
+            errors.append((path, f"{target} would also be written from {others}"))
+    return work, sorted(errors)
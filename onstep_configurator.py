@@ -1,811 +1,1435 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-import json
-import csv
-import requests
-import os
-import sys
-
-class OnStepConfigurator:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("OnStepX Configurator")
-        self.root.geometry("600x600")
-
-        self.config_vars = {}
-        self.notebook = ttk.Notebook(root)
-        self.notebook.pack(pady=10, expand=True)
-
-        self.create_scrollable_tab("Controller", self.create_controller_tab)
-        self.create_scrollable_tab("Mount", self.create_mount_tab)
-        self.create_scrollable_tab("Rotator", self.create_rotator_tab)
-        self.create_scrollable_tab("Focusers", self.create_focuser_tab)
-        self.create_scrollable_tab("Auxiliary", self.create_aux_tab)
-
-        btn_frame = ttk.Frame(root)
-        btn_frame.pack(pady=5)
-
-        ttk.Button(btn_frame, text="Save Preset", command=self.save_preset).pack(side=tk.LEFT, padx=5)
-        ttk.Button(btn_frame, text="Load Preset", command=self.load_preset).pack(side=tk.LEFT, padx=5)
-        ttk.Button(btn_frame, text="Fetch from GitHub", command=self.fetch_from_github).pack(side=tk.LEFT, padx=5)
-        ttk.Button(btn_frame, text="Generate Config", command=self.generate_config).pack(side=tk.LEFT, padx=5)
-
-        self.output_text = tk.Text(root, height=15)
-        self.output_text.pack(pady=10, padx=10, fill=tk.BOTH)
-
-    def create_scrollable_tab(self, tab_name, content_method):
-        tab_frame = ttk.Frame(self.notebook)
-        self.notebook.add(tab_frame, text=tab_name)
-        canvas = tk.Canvas(tab_frame)
-        scrollbar = ttk.Scrollbar(tab_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-
-        scrollable_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-
-        def on_mouse_wheel(event):
-            if event.delta:
-                canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
-            elif event.num == 4:
-                canvas.yview_scroll(-1, "units")
-            elif event.num == 5:
-                canvas.yview_scroll(1, "units")
-
-        canvas.bind("<MouseWheel>", on_mouse_wheel)
-        canvas.bind("<Button-4>", lambda e: canvas.yview_scroll(-1, "units"))
-        canvas.bind("<Button-5>", lambda e: canvas.yview_scroll(1, "units"))
-        canvas.focus_set()
-
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        content_method(scrollable_frame)
-
-    def create_controller_tab(self, frame):
-        row = 0
-        tk.Label(frame, text="Pinmap:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['PINMAP'] = tk.StringVar(value="BTT_SKR_PRO")
-        ttk.Combobox(frame, textvariable=self.config_vars['PINMAP'], 
-                     values=["OFF", "BTT_SKR_PRO", "MiniPCB", "MiniPCB2", "MaxPCB2", "MaxESP3", "CNC3", "STM32Blue"]).grid(row=row, column=1)
-        row += 1
-
-        baud_options = ["9600", "19200", "57600", "115200", "230400", "460800"]
-        for port, default in [('A', '9600'), ('B', '230400'), ('C', 'OFF'), ('D', 'OFF'), ('E', 'OFF')]:
-            tk.Label(frame, text=f"Serial {port} Baud:").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[f'SERIAL_{port}_BAUD_DEFAULT'] = tk.StringVar(value=default)
-            ttk.Combobox(frame, textvariable=self.config_vars[f'SERIAL_{port}_BAUD_DEFAULT'], 
-                        values=["OFF"] + baud_options).grid(row=row, column=1)
-            row += 1
-        
-        tk.Label(frame, text="Serial B ESP Flashing:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['SERIAL_B_ESP_FLASHING'] = tk.StringVar(value="ON")
-        ttk.Combobox(frame, textvariable=self.config_vars['SERIAL_B_ESP_FLASHING'], values=["OFF", "ON"]).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="Serial Radio:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['SERIAL_RADIO'] = tk.StringVar(value="OFF")
-        ttk.Combobox(frame, textvariable=self.config_vars['SERIAL_RADIO'], 
-                    values=["OFF", "BLUETOOTH", "WIFI_ACCESS_POINT", "WIFI_STATION"]).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="WiFi Module:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['WIFI_MODULE'] = tk.StringVar(value="CH_PD")
-        ttk.Combobox(frame, textvariable=self.config_vars['WIFI_MODULE'], values=["OFF", "CH_PD"]).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="Status LED:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['STATUS_LED'] = tk.StringVar(value="ON")
-        ttk.Combobox(frame, textvariable=self.config_vars['STATUS_LED'], values=["OFF", "ON"]).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="Reticle LED Default:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['RETICLE_LED_DEFAULT'] = tk.StringVar(value="OFF")
-        ttk.Combobox(frame, textvariable=self.config_vars['RETICLE_LED_DEFAULT'], 
-                     values=["OFF", "ON"]).grid(row=row, column=1)
-        row += 1
-
-        for param in ['RETICLE_LED_MEMORY', 'RETICLE_LED_INVERT']:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value="OFF")
-            ttk.Combobox(frame, textvariable=self.config_vars[param], values=["OFF", "ON"]).grid(row=row, column=1)
-            row += 1
-
-        tk.Label(frame, text="Weather Sensor:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['WEATHER'] = tk.StringVar(value="OFF")
-        ttk.Combobox(frame, textvariable=self.config_vars['WEATHER'], 
-                    values=["OFF", "BME280", "BME280_0x76", "BME280_SPI", "BMP280", "BMP280_0x76", "BMP280_SPI"]).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="Step Wave Form:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['STEP_WAVE_FORM'] = tk.StringVar(value="PULSE")
-        ttk.Combobox(frame, textvariable=self.config_vars['STEP_WAVE_FORM'], values=["SQUARE", "PULSE"]).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="NV Driver:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['NV_DRIVER'] = tk.StringVar(value="NV_AT24C32")
-        ttk.Combobox(frame, textvariable=self.config_vars['NV_DRIVER'], values=["NV_DEFAULT", "NV_AT24C32"]).grid(row=row, column=1)
-
-    def create_mount_tab(self, frame):
-        row = 0
-        driver_options = ["OFF", "A4988", "DRV8825", "LV8729", "S109", "TMC2130", "TMC5160", "TMC2209"]
-
-        tk.Label(frame, text="Axis 1 Driver Model:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['AXIS1_DRIVER_MODEL'] = tk.StringVar(value="TMC2130")
-        ttk.Combobox(frame, textvariable=self.config_vars['AXIS1_DRIVER_MODEL'], values=driver_options).grid(row=row, column=1)
-        row += 1
-
-        for param, default in [
-            ('AXIS1_STEPS_PER_DEGREE', '24888'),
-            ('AXIS1_LIMIT_MIN', '-180'),
-            ('AXIS1_LIMIT_MAX', '180'),
-            ('AXIS1_DRIVER_MICROSTEPS', '16'),
-            ('AXIS1_DRIVER_MICROSTEPS_GOTO', '1'),
-            ('AXIS1_DRIVER_IHOLD', '500'),
-            ('AXIS1_DRIVER_IRUN', '800'),
-            ('AXIS1_DRIVER_IGOTO', '1200')
-        ]:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value=default)
-            tk.Entry(frame, textvariable=self.config_vars[param]).grid(row=row, column=1)
-            row += 1
-
-        for param in ['AXIS1_REVERSE', 'AXIS1_POWER_DOWN', 'AXIS1_SENSE_HOME']:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value="OFF")
-            ttk.Combobox(frame, textvariable=self.config_vars[param], values=["OFF", "ON"]).grid(row=row, column=1)
-            row += 1
-
-        tk.Label(frame, text="Axis 1 Driver Status:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['AXIS1_DRIVER_STATUS'] = tk.StringVar(value="ON")
-        ttk.Combobox(frame, textvariable=self.config_vars['AXIS1_DRIVER_STATUS'], values=["OFF", "ON", "HIGH", "LOW"]).grid(row=row, column=1)
-        row += 1
-
-        for param in ['AXIS1_DRIVER_DECAY', 'AXIS1_DRIVER_DECAY_GOTO']:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value="OFF")
-            ttk.Combobox(frame, textvariable=self.config_vars[param], values=["OFF", "STEALTHCHOP", "SPREADCYCLE"]).grid(row=row, column=1)
-            row += 1
-
-        for param in ['AXIS1_SENSE_LIMIT_MIN', 'AXIS1_SENSE_LIMIT_MAX']:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value="LIMIT_SENSE")
-            ttk.Combobox(frame, textvariable=self.config_vars[param], values=["OFF", "HIGH", "LOW", "LIMIT_SENSE"]).grid(row=row, column=1)
-            row += 1
-
-        tk.Label(frame, text="Axis 2 Driver Model:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['AXIS2_DRIVER_MODEL'] = tk.StringVar(value="TMC2130")
-        ttk.Combobox(frame, textvariable=self.config_vars['AXIS2_DRIVER_MODEL'], values=driver_options).grid(row=row, column=1)
-        row += 1
-
-        for param, default in [
-            ('AXIS2_STEPS_PER_DEGREE', '24888'),
-            ('AXIS2_LIMIT_MIN', '-90'),
-            ('AXIS2_LIMIT_MAX', '90'),
-            ('AXIS2_DRIVER_MICROSTEPS', '16'),
-            ('AXIS2_DRIVER_MICROSTEPS_GOTO', '1'),
-            ('AXIS2_DRIVER_IHOLD', '500'),
-            ('AXIS2_DRIVER_IRUN', '800'),
-            ('AXIS2_DRIVER_IGOTO', '1200')
-        ]:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value=default)
-            tk.Entry(frame, textvariable=self.config_vars[param]).grid(row=row, column=1)
-            row += 1
-
-        for param in ['AXIS2_REVERSE', 'AXIS2_POWER_DOWN', 'AXIS2_SENSE_HOME']:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value="OFF")
-            ttk.Combobox(frame, textvariable=self.config_vars[param], values=["OFF", "ON"]).grid(row=row, column=1)
-            row += 1
-
-        tk.Label(frame, text="Axis 2 Driver Status:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['AXIS2_DRIVER_STATUS'] = tk.StringVar(value="ON")
-        ttk.Combobox(frame, textvariable=self.config_vars['AXIS2_DRIVER_STATUS'], values=["OFF", "ON", "HIGH", "LOW"]).grid(row=row, column=1)
-        row += 1
-
-        for param in ['AXIS2_DRIVER_DECAY', 'AXIS2_DRIVER_DECAY_GOTO']:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value="OFF")
-            ttk.Combobox(frame, textvariable=self.config_vars[param], values=["OFF", "STEALTHCHOP", "SPREADCYCLE"]).grid(row=row, column=1)
-            row += 1
-
-        for param in ['AXIS2_SENSE_LIMIT_MIN', 'AXIS2_SENSE_LIMIT_MAX']:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value="LIMIT_SENSE")
-            ttk.Combobox(frame, textvariable=self.config_vars[param], values=["OFF", "HIGH", "LOW", "LIMIT_SENSE"]).grid(row=row, column=1)
-            row += 1
-
-        tk.Label(frame, text="Mount Type:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['MOUNT_TYPE'] = tk.StringVar(value="GEM")
-        ttk.Combobox(frame, textvariable=self.config_vars['MOUNT_TYPE'], 
-                    values=["GEM", "GEM_TA", "GEM_TAC", "FORK", "FORK_TA", "FORK_TAC", "ALTAZM", "ALTAZM_UNL"]).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="Mount Coords:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['MOUNT_COORDS'] = tk.StringVar(value="TOPOCENTRIC")
-        ttk.Combobox(frame, textvariable=self.config_vars['MOUNT_COORDS'], 
-                    values=["TOPOCENTRIC", "TOPO_STRICT", "OBSERVED_PLACE"]).grid(row=row, column=1)
-        row += 1
-
-        for param in ['MOUNT_COORDS_MEMORY', 'MOUNT_ENABLE_IN_STANDBY']:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value="OFF")
-            ttk.Combobox(frame, textvariable=self.config_vars[param], values=["OFF", "ON"]).grid(row=row, column=1)
-            row += 1
-
-        tk.Label(frame, text="Time Location Source:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['TIME_LOCATION_SOURCE'] = tk.StringVar(value="DS3231")
-        ttk.Combobox(frame, textvariable=self.config_vars['TIME_LOCATION_SOURCE'], 
-                    values=["OFF", "DS3231", "SD3031", "TEENSY", "GPS", "NTP"]).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="PPS Sense:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['TIME_LOCATION_PPS_SENSE'] = tk.StringVar(value="HIGH")
-        ttk.Combobox(frame, textvariable=self.config_vars['TIME_LOCATION_PPS_SENSE'], 
-                    values=["OFF", "HIGH", "LOW", "BOTH"]).grid(row=row, column=1)
-        row += 1
-
-        for param in ['STATUS_MOUNT_LED', 'STATUS_BUZZER_DEFAULT', 'STATUS_BUZZER_MEMORY']:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value="OFF")
-            ttk.Combobox(frame, textvariable=self.config_vars[param], values=["OFF", "ON"]).grid(row=row, column=1)
-            row += 1
-
-        tk.Label(frame, text="Status Buzzer:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['STATUS_BUZZER'] = tk.StringVar(value="OFF")
-        tk.Entry(frame, textvariable=self.config_vars['STATUS_BUZZER']).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="ST4 Interface:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['ST4_INTERFACE'] = tk.StringVar(value="OFF")
-        ttk.Combobox(frame, textvariable=self.config_vars['ST4_INTERFACE'], values=["OFF", "ON"]).grid(row=row, column=1)
-        row += 1
-
-        for param in ['ST4_HAND_CONTROL', 'ST4_HAND_CONTROL_FOCUSER']:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value="ON")
-            ttk.Combobox(frame, textvariable=self.config_vars[param], values=["OFF", "ON"]).grid(row=row, column=1)
-            row += 1
-
-        tk.Label(frame, text="Guide Time Limit:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['GUIDE_TIME_LIMIT'] = tk.StringVar(value="10")
-        tk.Entry(frame, textvariable=self.config_vars['GUIDE_TIME_LIMIT']).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="Guide Disable Backlash:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['GUIDE_DISABLE_BACKLASH'] = tk.StringVar(value="OFF")
-        ttk.Combobox(frame, textvariable=self.config_vars['GUIDE_DISABLE_BACKLASH'], values=["OFF", "ON"]).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="Limit Sense:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['LIMIT_SENSE'] = tk.StringVar(value="OFF")
-        ttk.Combobox(frame, textvariable=self.config_vars['LIMIT_SENSE'], values=["OFF", "HIGH", "LOW"]).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="Limit Strict:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['LIMIT_STRICT'] = tk.StringVar(value="OFF")
-        ttk.Combobox(frame, textvariable=self.config_vars['LIMIT_STRICT'], values=["OFF", "ON"]).grid(row=row, column=1)
-        row += 1
-
-        for param in ['PARK_SENSE', 'PARK_SIGNAL', 'PARK_STATUS', 'PARK_STRICT']:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value="OFF")
-            ttk.Combobox(frame, textvariable=self.config_vars[param], values=["OFF", "HIGH", "LOW"]).grid(row=row, column=1)
-            row += 1
-
-        tk.Label(frame, text="PEC Steps Per Worm Rotation:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['PEC_STEPS_PER_WORM_ROTATION'] = tk.StringVar(value="0")
-        tk.Entry(frame, textvariable=self.config_vars['PEC_STEPS_PER_WORM_ROTATION']).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="PEC Sense:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['PEC_SENSE'] = tk.StringVar(value="OFF")
-        ttk.Combobox(frame, textvariable=self.config_vars['PEC_SENSE'], values=["OFF", "HIGH", "LOW"]).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="PEC Buffer Size Limit:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['PEC_BUFFER_SIZE_LIMIT'] = tk.StringVar(value="720")
-        tk.Entry(frame, textvariable=self.config_vars['PEC_BUFFER_SIZE_LIMIT']).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="Track Backlash Rate:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['TRACK_BACKLASH_RATE'] = tk.StringVar(value="2")
-        tk.Entry(frame, textvariable=self.config_vars['TRACK_BACKLASH_RATE']).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="Track Autostart:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['TRACK_AUTOSTART'] = tk.StringVar(value="OFF")
-        ttk.Combobox(frame, textvariable=self.config_vars['TRACK_AUTOSTART'], values=["OFF", "ON"]).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="Track Compensation Default:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['TRACK_COMPENSATION_DEFAULT'] = tk.StringVar(value="OFF")
-        ttk.Combobox(frame, textvariable=self.config_vars['TRACK_COMPENSATION_DEFAULT'], 
-                    values=["OFF", "REFRACTION", "REFRACTION_DUAL", "MODEL", "MODEL_DUAL"]).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="Track Compensation Memory:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['TRACK_COMPENSATION_MEMORY'] = tk.StringVar(value="OFF")
-        ttk.Combobox(frame, textvariable=self.config_vars['TRACK_COMPENSATION_MEMORY'], values=["OFF", "ON"]).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="Slew Rate Base Desired:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['SLEW_RATE_BASE_DESIRED'] = tk.StringVar(value="1")
-        tk.Entry(frame, textvariable=self.config_vars['SLEW_RATE_BASE_DESIRED']).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="Slew Rate Memory:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['SLEW_RATE_MEMORY'] = tk.StringVar(value="OFF")
-        ttk.Combobox(frame, textvariable=self.config_vars['SLEW_RATE_MEMORY'], values=["OFF", "ON"]).grid(row=row, column=1)
-        row += 1
-
-        for param, default in [
-            ('SLEW_ACCELERATION_DIST', '5.0'),
-            ('SLEW_RAPID_STOP_DIST', '2.0'),
-            ('GOTO_OFFSET', '0.25')
-        ]:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value=default)
-            tk.Entry(frame, textvariable=self.config_vars[param]).grid(row=row, column=1)
-            row += 1
-
-        tk.Label(frame, text="Goto Feature:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['GOTO_FEATURE'] = tk.StringVar(value="ON")
-        ttk.Combobox(frame, textvariable=self.config_vars['GOTO_FEATURE'], values=["OFF", "ON"]).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="Goto Offset Align:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['GOTO_OFFSET_ALIGN'] = tk.StringVar(value="OFF")
-        ttk.Combobox(frame, textvariable=self.config_vars['GOTO_OFFSET_ALIGN'], values=["OFF", "ON"]).grid(row=row, column=1)
-        row += 1
-
-        for param in ['MFLIP_SKIP_HOME', 'MFLIP_AUTOMATIC_DEFAULT', 'MFLIP_AUTOMATIC_MEMORY', 
-                     'MFLIP_PAUSE_HOME_DEFAULT', 'MFLIP_PAUSE_HOME_MEMORY', 'PIER_SIDE_SYNC_CHANGE_SIDES']:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value="OFF")
-            ttk.Combobox(frame, textvariable=self.config_vars[param], values=["OFF", "ON"]).grid(row=row, column=1)
-            row += 1
-
-        tk.Label(frame, text="Pier Side Preferred Default:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['PIER_SIDE_PREFERRED_DEFAULT'] = tk.StringVar(value="BEST")
-        ttk.Combobox(frame, textvariable=self.config_vars['PIER_SIDE_PREFERRED_DEFAULT'], 
-                    values=["BEST", "EAST", "WEST"]).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="Pier Side Preferred Memory:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['PIER_SIDE_PREFERRED_MEMORY'] = tk.StringVar(value="OFF")
-        ttk.Combobox(frame, textvariable=self.config_vars['PIER_SIDE_PREFERRED_MEMORY'], values=["OFF", "ON"]).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="Align Auto Home:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['ALIGN_AUTO_HOME'] = tk.StringVar(value="OFF")
-        ttk.Combobox(frame, textvariable=self.config_vars['ALIGN_AUTO_HOME'], values=["OFF", "ON"]).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="Align Model Memory:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['ALIGN_MODEL_MEMORY'] = tk.StringVar(value="OFF")
-        ttk.Combobox(frame, textvariable=self.config_vars['ALIGN_MODEL_MEMORY'], values=["OFF", "ON"]).grid(row=row, column=1)
-        row += 1
-
-        tk.Label(frame, text="Align Max Stars:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['ALIGN_MAX_STARS'] = tk.StringVar(value="AUTO")
-        ttk.Combobox(frame, textvariable=self.config_vars['ALIGN_MAX_STARS'], 
-                    values=["AUTO", "1", "3", "4", "5", "6", "7", "8", "9"]).grid(row=row, column=1)
-
-    def create_rotator_tab(self, frame):
-        row = 0
-        driver_options = ["OFF", "A4988", "DRV8825", "LV8729", "S109", "TMC2130", "TMC5160", "TMC2209"]
-
-        tk.Label(frame, text="Axis 3 Driver Model:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['AXIS3_DRIVER_MODEL'] = tk.StringVar(value="OFF")
-        ttk.Combobox(frame, textvariable=self.config_vars['AXIS3_DRIVER_MODEL'], values=driver_options).grid(row=row, column=1)
-        row += 1
-
-        for param, default in [
-            ('AXIS3_SLEW_RATE_BASE_DESIRED', '1.0'),
-            ('AXIS3_STEPS_PER_DEGREE', '64.0'),
-            ('AXIS3_LIMIT_MIN', '0'),
-            ('AXIS3_LIMIT_MAX', '360')
-        ]:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value=default)
-            tk.Entry(frame, textvariable=self.config_vars[param]).grid(row=row, column=1)
-            row += 1
-
-        for param in ['AXIS3_REVERSE', 'AXIS3_POWER_DOWN', 'AXIS3_SENSE_HOME']:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value="OFF")
-            ttk.Combobox(frame, textvariable=self.config_vars[param], values=["OFF", "ON"]).grid(row=row, column=1)
-            row += 1
-
-        tk.Label(frame, text="Axis 3 Driver Status:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['AXIS3_DRIVER_STATUS'] = tk.StringVar(value="OFF")
-        ttk.Combobox(frame, textvariable=self.config_vars['AXIS3_DRIVER_STATUS'], values=["OFF", "ON", "HIGH", "LOW"]).grid(row=row, column=1)
-        row += 1
-
-        for param in ['AXIS3_DRIVER_MICROSTEPS', 'AXIS3_DRIVER_MICROSTEPS_GOTO', 'AXIS3_DRIVER_IHOLD', 
-                     'AXIS3_DRIVER_IRUN', 'AXIS3_DRIVER_IGOTO']:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value="OFF")
-            tk.Entry(frame, textvariable=self.config_vars[param]).grid(row=row, column=1)
-            row += 1
-
-        for param in ['AXIS3_DRIVER_DECAY', 'AXIS3_DRIVER_DECAY_GOTO']:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value="OFF")
-            ttk.Combobox(frame, textvariable=self.config_vars[param], values=["OFF", "STEALTHCHOP", "SPREADCYCLE"]).grid(row=row, column=1)
-            row += 1
-
-        for param in ['AXIS3_SENSE_LIMIT_MIN', 'AXIS3_SENSE_LIMIT_MAX']:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value="OFF")
-            ttk.Combobox(frame, textvariable=self.config_vars[param], values=["OFF", "HIGH", "LOW"]).grid(row=row, column=1)
-
-    def create_focuser_tab(self, frame):
-        row = 0
-        driver_options = ["OFF", "A4988", "DRV8825", "LV8729", "S109", "TMC2130", "TMC5160", "TMC2209"]
-
-        tk.Label(frame, text="Axis 4 Driver Model:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['AXIS4_DRIVER_MODEL'] = tk.StringVar(value="OFF")
-        ttk.Combobox(frame, textvariable=self.config_vars['AXIS4_DRIVER_MODEL'], values=driver_options).grid(row=row, column=1)
-        row += 1
-
-        for param, default in [
-            ('AXIS4_SLEW_RATE_BASE_DESIRED', '500'),
-            ('AXIS4_SLEW_RATE_MINIMUM', '20'),
-            ('AXIS4_STEPS_PER_MICRON', '0.5'),
-            ('AXIS4_LIMIT_MIN', '0'),
-            ('AXIS4_LIMIT_MAX', '50')
-        ]:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value=default)
-            tk.Entry(frame, textvariable=self.config_vars[param]).grid(row=row, column=1)
-            row += 1
-
-        for param in ['AXIS4_REVERSE', 'AXIS4_POWER_DOWN', 'AXIS4_SENSE_HOME']:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value="OFF")
-            ttk.Combobox(frame, textvariable=self.config_vars[param], values=["OFF", "ON"]).grid(row=row, column=1)
-            row += 1
-
-        tk.Label(frame, text="Axis 4 Driver Status:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['AXIS4_DRIVER_STATUS'] = tk.StringVar(value="OFF")
-        ttk.Combobox(frame, textvariable=self.config_vars['AXIS4_DRIVER_STATUS'], values=["OFF", "ON", "HIGH", "LOW"]).grid(row=row, column=1)
-        row += 1
-
-        for param in ['AXIS4_DRIVER_MICROSTEPS', 'AXIS4_DRIVER_MICROSTEPS_GOTO', 'AXIS4_DRIVER_IHOLD', 
-                     'AXIS4_DRIVER_IRUN', 'AXIS4_DRIVER_IGOTO']:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value="OFF")
-            tk.Entry(frame, textvariable=self.config_vars[param]).grid(row=row, column=1)
-            row += 1
-
-        for param in ['AXIS4_DRIVER_DECAY', 'AXIS4_DRIVER_DECAY_GOTO']:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value="OFF")
-            ttk.Combobox(frame, textvariable=self.config_vars[param], values=["OFF", "STEALTHCHOP", "SPREADCYCLE"]).grid(row=row, column=1)
-            row += 1
-
-        for param in ['AXIS4_SENSE_LIMIT_MIN', 'AXIS4_SENSE_LIMIT_MAX']:
-            tk.Label(frame, text=param.replace('_', ' ')+":").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[param] = tk.StringVar(value="OFF")
-            ttk.Combobox(frame, textvariable=self.config_vars[param], values=["OFF", "HIGH", "LOW"]).grid(row=row, column=1)
-            row += 1
-
-        tk.Label(frame, text="Focuser Temperature:").grid(row=row, column=0, padx=5, pady=5)
-        self.config_vars['FOCUSER_TEMPERATURE'] = tk.StringVar(value="OFF")
-        ttk.Combobox(frame, textvariable=self.config_vars['FOCUSER_TEMPERATURE'], values=["OFF", "THERMISTOR"]).grid(row=row, column=1)
-
-    def create_aux_tab(self, frame):
-        row = 0
-        purpose_options = ["OFF", "SWITCH", "MOMENTARY_SWITCH", "ANALOG_OUT", "DEW_HEATER", "INTERVALOMETER"]
-
-        for i in range(1, 9):
-            tk.Label(frame, text=f"Feature {i} Purpose:").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[f'FEATURE{i}_PURPOSE'] = tk.StringVar(value="OFF")
-            ttk.Combobox(frame, textvariable=self.config_vars[f'FEATURE{i}_PURPOSE'], values=purpose_options).grid(row=row, column=1)
-            row += 1
-
-            tk.Label(frame, text=f"Feature {i} Name:").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[f'FEATURE{i}_NAME'] = tk.StringVar(value=f"FEATURE{i}")
-            tk.Entry(frame, textvariable=self.config_vars[f'FEATURE{i}_NAME']).grid(row=row, column=1)
-            row += 1
-
-            for param in ['TEMP', 'PIN', 'VALUE_DEFAULT']:
-                tk.Label(frame, text=f"Feature {i} {param}:").grid(row=row, column=0, padx=5, pady=5)
-                self.config_vars[f'FEATURE{i}_{param}'] = tk.StringVar(value="OFF")
-                tk.Entry(frame, textvariable=self.config_vars[f'FEATURE{i}_{param}']).grid(row=row, column=1)
-                row += 1
-
-            tk.Label(frame, text=f"Feature {i} Value Memory:").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[f'FEATURE{i}_VALUE_MEMORY'] = tk.StringVar(value="OFF")
-            ttk.Combobox(frame, textvariable=self.config_vars[f'FEATURE{i}_VALUE_MEMORY'], values=["OFF", "ON"]).grid(row=row, column=1)
-            row += 1
-
-            tk.Label(frame, text=f"Feature {i} On State:").grid(row=row, column=0, padx=5, pady=5)
-            self.config_vars[f'FEATURE{i}_ON_STATE'] = tk.StringVar(value="HIGH")
-            ttk.Combobox(frame, textvariable=self.config_vars[f'FEATURE{i}_ON_STATE'], values=["HIGH", "LOW"]).grid(row=row, column=1)
-            row += 1
-
-    def fetch_from_github(self):
-        repo_owner = "Mr-Royce"  # Replace with your GitHub username
-        repo_name = "onstep-configurator"  # Replace with your repo name
-        folder_path = "presets"      # Folder in the repo containing config files
-        api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/contents/{folder_path}"
-
-        try:
-            response = requests.get(api_url)
-            response.raise_for_status()
-            files = response.json()
-
-            config_files = [f["name"] for f in files if f["name"].endswith((".json", ".csv"))]
-            if not config_files:
-                messagebox.showwarning("No Files", "No configuration files found in the GitHub repository.")
-                return
-
-            selection_window = tk.Toplevel(self.root)
-            selection_window.title("Select Configuration File")
-            selection_window.geometry("300x200")
-
-            tk.Label(selection_window, text="Select a file to load:").pack(pady=5)
-            file_var = tk.StringVar(value=config_files[0])
-            ttk.Combobox(selection_window, textvariable=file_var, values=config_files).pack(pady=5)
-
-            def load_selected_file():
-                selected_file = file_var.get()
-                file_url = f"https://raw.githubusercontent.com/{repo_owner}/{repo_name}/main/{folder_path}/{selected_file}"
-                temp_file = f"temp_{selected_file}"
-
-                file_response = requests.get(file_url)
-                file_response.raise_for_status()
-                with open(temp_file, 'wb') as f:
-                    f.write(file_response.content)
-
-                if selected_file.endswith(".json"):
-                    with open(temp_file, 'r') as f:
-                        preset = json.load(f)
-                    for key, value in preset.items():
-                        if key in self.config_vars:
-                            self.config_vars[key].set(value)
-                elif selected_file.endswith(".csv"):
-                    with open(temp_file, 'r') as f:
-                        reader = csv.DictReader(f)
-                        for row in reader:
-                            for key, value in row.items():
-                                if key in self.config_vars:
-                                    self.config_vars[key].set(value)
-
-                os.remove(temp_file)
-                selection_window.destroy()
-                messagebox.showinfo("Success", f"Loaded {selected_file} from GitHub!")
-
-            ttk.Button(selection_window, text="Load", command=load_selected_file).pack(pady=10)
-
-        except requests.RequestException as e:
-            messagebox.showerror("Error", f"Failed to fetch files from GitHub: {str(e)}")
-
-    def save_preset(self):
-        file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")])
-        if file_path:
-            preset = {key: var.get() for key, var in self.config_vars.items()}
-            with open(file_path, 'w') as f:
-                json.dump(preset, f)
-            messagebox.showinfo("Success", "Preset saved successfully!")
-
-    def load_preset(self):
-        file_path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")])
-        if file_path:
-            with open(file_path, 'r') as f:
-                preset = json.load(f)
-            for key, value in preset.items():
-                if key in self.config_vars:
-                    self.config_vars[key].set(value)
-            messagebox.showinfo("Success", "Preset loaded successfully!")
-
-    def import_csv(self):
-        file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
-        if file_path:
-            with open(file_path, 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    for key, value in row.items():
-                        if key in self.config_vars:
-                            self.config_vars[key].set(value)
-            messagebox.showinfo("Success", "CSV imported successfully!")
-
-    def export_csv(self):
-        file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
-        if file_path:
-            preset = {key: var.get() for key, var in self.config_vars.items()}
-            with open(file_path, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=preset.keys())
-                writer.writeheader()
-                writer.writerow(preset)
-            messagebox.showinfo("Success", "CSV exported successfully!")
-
-    def generate_config(self):
-        config_lines = [
-            "/* Configuration for OnStepX */",
-            "",
-            "// CONTROLLER",
-            f"#define PINMAP                        {self.config_vars['PINMAP'].get()}",
-            f"#define SERIAL_A_BAUD_DEFAULT        {self.config_vars['SERIAL_A_BAUD_DEFAULT'].get()}",
-            f"#define SERIAL_B_BAUD_DEFAULT        {self.config_vars['SERIAL_B_BAUD_DEFAULT'].get()}",
-            f"#define SERIAL_B_ESP_FLASHING         {self.config_vars['SERIAL_B_ESP_FLASHING'].get()}",
-            f"#define SERIAL_C_BAUD_DEFAULT        {self.config_vars['SERIAL_C_BAUD_DEFAULT'].get()}",
-            f"#define SERIAL_D_BAUD_DEFAULT        {self.config_vars['SERIAL_D_BAUD_DEFAULT'].get()}",
-            f"#define SERIAL_E_BAUD_DEFAULT        {self.config_vars['SERIAL_E_BAUD_DEFAULT'].get()}",
-            f"#define SERIAL_RADIO                  {self.config_vars['SERIAL_RADIO'].get()}",
-            f"#define WIFI_MODULE                  {self.config_vars['WIFI_MODULE'].get()}",
-            f"#define STATUS_LED                    {self.config_vars['STATUS_LED'].get()}",
-            f"#define RETICLE_LED_DEFAULT           {self.config_vars['RETICLE_LED_DEFAULT'].get()}",
-            f"#define RETICLE_LED_MEMORY            {self.config_vars['RETICLE_LED_MEMORY'].get()}",
-            f"#define RETICLE_LED_INVERT            {self.config_vars['RETICLE_LED_INVERT'].get()}",
-            f"#define WEATHER                       {self.config_vars['WEATHER'].get()}",
-            f"#define STEP_WAVE_FORM                {self.config_vars['STEP_WAVE_FORM'].get()}",
-            f"#define NV_DRIVER                     {self.config_vars['NV_DRIVER'].get()}",
-            "",
-            "// MOUNT",
-            f"#define AXIS1_DRIVER_MODEL            {self.config_vars['AXIS1_DRIVER_MODEL'].get()}",
-            f"#define AXIS1_STEPS_PER_DEGREE       {self.config_vars['AXIS1_STEPS_PER_DEGREE'].get()}",
-            f"#define AXIS1_REVERSE                 {self.config_vars['AXIS1_REVERSE'].get()}",
-            f"#define AXIS1_LIMIT_MIN              {self.config_vars['AXIS1_LIMIT_MIN'].get()}",
-            f"#define AXIS1_LIMIT_MAX              {self.config_vars['AXIS1_LIMIT_MAX'].get()}",
-            f"#define AXIS1_DRIVER_MICROSTEPS      {self.config_vars['AXIS1_DRIVER_MICROSTEPS'].get()}",
-            f"#define AXIS1_DRIVER_MICROSTEPS_GOTO {self.config_vars['AXIS1_DRIVER_MICROSTEPS_GOTO'].get()}",
-            f"#define AXIS1_DRIVER_IHOLD           {self.config_vars['AXIS1_DRIVER_IHOLD'].get()}",
-            f"#define AXIS1_DRIVER_IRUN            {self.config_vars['AXIS1_DRIVER_IRUN'].get()}",
-            f"#define AXIS1_DRIVER_IGOTO           {self.config_vars['AXIS1_DRIVER_IGOTO'].get()}",
-            f"#define AXIS1_DRIVER_STATUS          {self.config_vars['AXIS1_DRIVER_STATUS'].get()}",
-            f"#define AXIS1_DRIVER_DECAY           {self.config_vars['AXIS1_DRIVER_DECAY'].get()}",
-            f"#define AXIS1_DRIVER_DECAY_GOTO      {self.config_vars['AXIS1_DRIVER_DECAY_GOTO'].get()}",
-            f"#define AXIS1_POWER_DOWN             {self.config_vars['AXIS1_POWER_DOWN'].get()}",
-            f"#define AXIS1_SENSE_HOME             {self.config_vars['AXIS1_SENSE_HOME'].get()}",
-            f"#define AXIS1_SENSE_LIMIT_MIN        {self.config_vars['AXIS1_SENSE_LIMIT_MIN'].get()}",
-            f"#define AXIS1_SENSE_LIMIT_MAX        {self.config_vars['AXIS1_SENSE_LIMIT_MAX'].get()}",
-            "",
-            f"#define AXIS2_DRIVER_MODEL            {self.config_vars['AXIS2_DRIVER_MODEL'].get()}",
-            f"#define AXIS2_STEPS_PER_DEGREE       {self.config_vars['AXIS2_STEPS_PER_DEGREE'].get()}",
-            f"#define AXIS2_REVERSE                 {self.config_vars['AXIS2_REVERSE'].get()}",
-            f"#define AXIS2_LIMIT_MIN              {self.config_vars['AXIS2_LIMIT_MIN'].get()}",
-            f"#define AXIS2_LIMIT_MAX              {self.config_vars['AXIS2_LIMIT_MAX'].get()}",
-            f"#define AXIS2_DRIVER_MICROSTEPS      {self.config_vars['AXIS2_DRIVER_MICROSTEPS'].get()}",
-            f"#define AXIS2_DRIVER_MICROSTEPS_GOTO {self.config_vars['AXIS2_DRIVER_MICROSTEPS_GOTO'].get()}",
-            f"#define AXIS2_DRIVER_IHOLD           {self.config_vars['AXIS2_DRIVER_IHOLD'].get()}",
-            f"#define AXIS2_DRIVER_IRUN            {self.config_vars['AXIS2_DRIVER_IRUN'].get()}",
-            f"#define AXIS2_DRIVER_IGOTO           {self.config_vars['AXIS2_DRIVER_IGOTO'].get()}",
-            f"#define AXIS2_DRIVER_STATUS          {self.config_vars['AXIS2_DRIVER_STATUS'].get()}",
-            f"#define AXIS2_DRIVER_DECAY           {self.config_vars['AXIS2_DRIVER_DECAY'].get()}",
-            f"#define AXIS2_DRIVER_DECAY_GOTO      {self.config_vars['AXIS2_DRIVER_DECAY_GOTO'].get()}",
-            f"#define AXIS2_POWER_DOWN             {self.config_vars['AXIS2_POWER_DOWN'].get()}",
-            f"#define AXIS2_SENSE_HOME             {self.config_vars['AXIS2_SENSE_HOME'].get()}",
-            f"#define AXIS2_SENSE_LIMIT_MIN        {self.config_vars['AXIS2_SENSE_LIMIT_MIN'].get()}",
-            f"#define AXIS2_SENSE_LIMIT_MAX        {self.config_vars['AXIS2_SENSE_LIMIT_MAX'].get()}",
-            "",
-            f"#define MOUNT_TYPE                    {self.config_vars['MOUNT_TYPE'].get()}",
-            f"#define MOUNT_COORDS                  {self.config_vars['MOUNT_COORDS'].get()}",
-            f"#define MOUNT_COORDS_MEMORY           {self.config_vars['MOUNT_COORDS_MEMORY'].get()}",
-            f"#define MOUNT_ENABLE_IN_STANDBY       {self.config_vars['MOUNT_ENABLE_IN_STANDBY'].get()}",
-            f"#define TIME_LOCATION_SOURCE          {self.config_vars['TIME_LOCATION_SOURCE'].get()}",
-            f"#define TIME_LOCATION_PPS_SENSE       {self.config_vars['TIME_LOCATION_PPS_SENSE'].get()}",
-            f"#define STATUS_MOUNT_LED             {self.config_vars['STATUS_MOUNT_LED'].get()}",
-            f"#define STATUS_BUZZER                {self.config_vars['STATUS_BUZZER'].get()}",
-            f"#define STATUS_BUZZER_DEFAULT        {self.config_vars['STATUS_BUZZER_DEFAULT'].get()}",
-            f"#define STATUS_BUZZER_MEMORY         {self.config_vars['STATUS_BUZZER_MEMORY'].get()}",
-            f"#define ST4_INTERFACE                {self.config_vars['ST4_INTERFACE'].get()}",
-            f"#define ST4_HAND_CONTROL             {self.config_vars['ST4_HAND_CONTROL'].get()}",
-            f"#define ST4_HAND_CONTROL_FOCUSER     {self.config_vars['ST4_HAND_CONTROL_FOCUSER'].get()}",
-            f"#define GUIDE_TIME_LIMIT             {self.config_vars['GUIDE_TIME_LIMIT'].get()}",
-            f"#define GUIDE_DISABLE_BACKLASH       {self.config_vars['GUIDE_DISABLE_BACKLASH'].get()}",
-            f"#define LIMIT_SENSE                  {self.config_vars['LIMIT_SENSE'].get()}",
-            f"#define LIMIT_STRICT                 {self.config_vars['LIMIT_STRICT'].get()}",
-            f"#define PARK_SENSE                   {self.config_vars['PARK_SENSE'].get()}",
-            f"#define PARK_SIGNAL                  {self.config_vars['PARK_SIGNAL'].get()}",
-            f"#define PARK_STATUS                  {self.config_vars['PARK_STATUS'].get()}",
-            f"#define PARK_STRICT                  {self.config_vars['PARK_STRICT'].get()}",
-            f"#define PEC_STEPS_PER_WORM_ROTATION  {self.config_vars['PEC_STEPS_PER_WORM_ROTATION'].get()}",
-            f"#define PEC_SENSE                    {self.config_vars['PEC_SENSE'].get()}",
-            f"#define PEC_BUFFER_SIZE_LIMIT        {self.config_vars['PEC_BUFFER_SIZE_LIMIT'].get()}",
-            f"#define TRACK_BACKLASH_RATE          {self.config_vars['TRACK_BACKLASH_RATE'].get()}",
-            f"#define TRACK_AUTOSTART              {self.config_vars['TRACK_AUTOSTART'].get()}",
-            f"#define TRACK_COMPENSATION_DEFAULT   {self.config_vars['TRACK_COMPENSATION_DEFAULT'].get()}",
-            f"#define TRACK_COMPENSATION_MEMORY    {self.config_vars['TRACK_COMPENSATION_MEMORY'].get()}",
-            f"#define SLEW_RATE_BASE_DESIRED       {self.config_vars['SLEW_RATE_BASE_DESIRED'].get()}",
-            f"#define SLEW_RATE_MEMORY             {self.config_vars['SLEW_RATE_MEMORY'].get()}",
-            f"#define SLEW_ACCELERATION_DIST       {self.config_vars['SLEW_ACCELERATION_DIST'].get()}",
-            f"#define SLEW_RAPID_STOP_DIST         {self.config_vars['SLEW_RAPID_STOP_DIST'].get()}",
-            f"#define GOTO_FEATURE                 {self.config_vars['GOTO_FEATURE'].get()}",
-            f"#define GOTO_OFFSET                  {self.config_vars['GOTO_OFFSET'].get()}",
-            f"#define GOTO_OFFSET_ALIGN            {self.config_vars['GOTO_OFFSET_ALIGN'].get()}",
-            f"#define MFLIP_SKIP_HOME              {self.config_vars['MFLIP_SKIP_HOME'].get()}",
-            f"#define MFLIP_AUTOMATIC_DEFAULT      {self.config_vars['MFLIP_AUTOMATIC_DEFAULT'].get()}",
-            f"#define MFLIP_AUTOMATIC_MEMORY       {self.config_vars['MFLIP_AUTOMATIC_MEMORY'].get()}",
-            f"#define MFLIP_PAUSE_HOME_DEFAULT     {self.config_vars['MFLIP_PAUSE_HOME_DEFAULT'].get()}",
-            f"#define MFLIP_PAUSE_HOME_MEMORY      {self.config_vars['MFLIP_PAUSE_HOME_MEMORY'].get()}",
-            f"#define PIER_SIDE_SYNC_CHANGE_SIDES  {self.config_vars['PIER_SIDE_SYNC_CHANGE_SIDES'].get()}",
-            f"#define PIER_SIDE_PREFERRED_DEFAULT  {self.config_vars['PIER_SIDE_PREFERRED_DEFAULT'].get()}",
-            f"#define PIER_SIDE_PREFERRED_MEMORY   {self.config_vars['PIER_SIDE_PREFERRED_MEMORY'].get()}",
-            f"#define ALIGN_AUTO_HOME              {self.config_vars['ALIGN_AUTO_HOME'].get()}",
-            f"#define ALIGN_MODEL_MEMORY           {self.config_vars['ALIGN_MODEL_MEMORY'].get()}",
-            f"#define ALIGN_MAX_STARS              {self.config_vars['ALIGN_MAX_STARS'].get()}",
-            "",
-            "// ROTATOR",
-            f"#define AXIS3_DRIVER_MODEL            {self.config_vars['AXIS3_DRIVER_MODEL'].get()}",
-            f"#define AXIS3_SLEW_RATE_BASE_DESIRED {self.config_vars['AXIS3_SLEW_RATE_BASE_DESIRED'].get()}",
-            f"#define AXIS3_STEPS_PER_DEGREE       {self.config_vars['AXIS3_STEPS_PER_DEGREE'].get()}",
-            f"#define AXIS3_REVERSE                 {self.config_vars['AXIS3_REVERSE'].get()}",
-            f"#define AXIS3_LIMIT_MIN              {self.config_vars['AXIS3_LIMIT_MIN'].get()}",
-            f"#define AXIS3_LIMIT_MAX              {self.config_vars['AXIS3_LIMIT_MAX'].get()}",
-            f"#define AXIS3_DRIVER_MICROSTEPS      {self.config_vars['AXIS3_DRIVER_MICROSTEPS'].get()}",
-            f"#define AXIS3_DRIVER_MICROSTEPS_GOTO {self.config_vars['AXIS3_DRIVER_MICROSTEPS_GOTO'].get()}",
-            f"#define AXIS3_DRIVER_IHOLD           {self.config_vars['AXIS3_DRIVER_IHOLD'].get()}",
-            f"#define AXIS3_DRIVER_IRUN            {self.config_vars['AXIS3_DRIVER_IRUN'].get()}",
-            f"#define AXIS3_DRIVER_IGOTO           {self.config_vars['AXIS3_DRIVER_IGOTO'].get()}",
-            f"#define AXIS3_DRIVER_STATUS          {self.config_vars['AXIS3_DRIVER_STATUS'].get()}",
-            f"#define AXIS3_DRIVER_DECAY           {self.config_vars['AXIS3_DRIVER_DECAY'].get()}",
-            f"#define AXIS3_DRIVER_DECAY_GOTO      {self.config_vars['AXIS3_DRIVER_DECAY_GOTO'].get()}",
-            f"#define AXIS3_POWER_DOWN             {self.config_vars['AXIS3_POWER_DOWN'].get()}",
-            f"#define AXIS3_SENSE_HOME             {self.config_vars['AXIS3_SENSE_HOME'].get()}",
-            f"#define AXIS3_SENSE_LIMIT_MIN        {self.config_vars['AXIS3_SENSE_LIMIT_MIN'].get()}",
-            f"#define AXIS3_SENSE_LIMIT_MAX        {self.config_vars['AXIS3_SENSE_LIMIT_MAX'].get()}",
-            "",
-            "// FOCUSERS",
-            f"#define AXIS4_DRIVER_MODEL            {self.config_vars['AXIS4_DRIVER_MODEL'].get()}",
-            f"#define AXIS4_SLEW_RATE_BASE_DESIRED {self.config_vars['AXIS4_SLEW_RATE_BASE_DESIRED'].get()}",
-            f"#define AXIS4_SLEW_RATE_MINIMUM      {self.config_vars['AXIS4_SLEW_RATE_MINIMUM'].get()}",
-            f"#define AXIS4_STEPS_PER_MICRON       {self.config_vars['AXIS4_STEPS_PER_MICRON'].get()}",
-            f"#define AXIS4_REVERSE                 {self.config_vars['AXIS4_REVERSE'].get()}",
-            f"#define AXIS4_LIMIT_MIN              {self.config_vars['AXIS4_LIMIT_MIN'].get()}",
-            f"#define AXIS4_LIMIT_MAX              {self.config_vars['AXIS4_LIMIT_MAX'].get()}",
-            f"#define AXIS4_DRIVER_MICROSTEPS      {self.config_vars['AXIS4_DRIVER_MICROSTEPS'].get()}",
-            f"#define AXIS4_DRIVER_MICROSTEPS_GOTO {self.config_vars['AXIS4_DRIVER_MICROSTEPS_GOTO'].get()}",
-            f"#define AXIS4_DRIVER_IHOLD           {self.config_vars['AXIS4_DRIVER_IHOLD'].get()}",
-            f"#define AXIS4_DRIVER_IRUN            {self.config_vars['AXIS4_DRIVER_IRUN'].get()}",
-            f"#define AXIS4_DRIVER_IGOTO           {self.config_vars['AXIS4_DRIVER_IGOTO'].get()}",
-            f"#define AXIS4_DRIVER_STATUS          {self.config_vars['AXIS4_DRIVER_STATUS'].get()}",
-            f"#define AXIS4_DRIVER_DECAY           {self.config_vars['AXIS4_DRIVER_DECAY'].get()}",
-            f"#define AXIS4_DRIVER_DECAY_GOTO      {self.config_vars['AXIS4_DRIVER_DECAY_GOTO'].get()}",
-            f"#define AXIS4_POWER_DOWN             {self.config_vars['AXIS4_POWER_DOWN'].get()}",
-            f"#define AXIS4_SENSE_HOME             {self.config_vars['AXIS4_SENSE_HOME'].get()}",
-            f"#define AXIS4_SENSE_LIMIT_MIN        {self.config_vars['AXIS4_SENSE_LIMIT_MIN'].get()}",
-            f"#define AXIS4_SENSE_LIMIT_MAX        {self.config_vars['AXIS4_SENSE_LIMIT_MAX'].get()}",
-            f"#define FOCUSER_TEMPERATURE           {self.config_vars['FOCUSER_TEMPERATURE'].get()}",
-            "",
-            "// AUXILIARY FEATURES"
-        ]
-
-        for i in range(1, 9):
-            config_lines.extend([
-                f"#define FEATURE{i}_PURPOSE            {self.config_vars[f'FEATURE{i}_PURPOSE'].get()}",
-                f"#define FEATURE{i}_NAME              \"{self.config_vars[f'FEATURE{i}_NAME'].get()}\"",
-                f"#define FEATURE{i}_TEMP              {self.config_vars[f'FEATURE{i}_TEMP'].get()}",
-                f"#define FEATURE{i}_PIN               {self.config_vars[f'FEATURE{i}_PIN'].get()}",
-                f"#define FEATURE{i}_VALUE_DEFAULT     {self.config_vars[f'FEATURE{i}_VALUE_DEFAULT'].get()}",
-                f"#define FEATURE{i}_VALUE_MEMORY      {self.config_vars[f'FEATURE{i}_VALUE_MEMORY'].get()}",
-                f"#define FEATURE{i}_ON_STATE          {self.config_vars[f'FEATURE{i}_ON_STATE'].get()}",
-                ""
-            ])
-
-        config_lines.extend([
-            "#define FileVersionConfig 6",
-            "#include \"Extended.config.h\""
-        ])
-
-        self.output_text.delete(1.0, tk.END)
-        self.output_text.insert(tk.END, "\n".join(config_lines))
-        messagebox.showinfo("Success", "Configuration generated! Copy the text from the box below into your Arduino IDE.")
-
-def resource_path(relative_path):
-    """Get absolute path to resource, works for dev and PyInstaller"""
-    if hasattr(sys, '_MEIPASS'):
-        return os.path.join(sys._MEIPASS, relative_path)
-    return os.path.join(os.path.abspath("."), relative_path)
-
-def main():
-    root = tk.Tk()
-    root.iconbitmap(resource_path("telescope.ico"))
-    app = OnStepConfigurator(root)
-    root.mainloop()
-
-if __name__ == "__main__":
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog, simpledialog
+import os
+import sys
+import json
+import time
+import math
+import threading
+import onstep_schema as schema
+from onstep_model import ConfigModel
+from onstep_history import History
+from onstep_grid import PropertyGrid
+from onstep_presets import PRESET_EXTENSIONS, parse_preset, read_preset_file, write_preset_json, write_preset_csv, find_preset_files
+import onstep_validate as validation
+import onstep_steprate as steprate
+from onstep_trace import Instrumentation, Profiler, trace_path_from_env
+
+# requests (GitHub), csv (catalogs), sqlite3 (library), NumPy (fleet validation) and the
+# process/thread pools are imported where they are first used: most sessions never need
+# them and together they more than double the time to the first window.
+
+POLL_INTERVAL_MS = 16  # about one frame at 60 Hz
+PREVIEW_DEBOUNCE_MS = 30
+VALIDATE_DEBOUNCE_MS = 150
+JOURNAL_SYNC_MS = 1000  # edits are on disk at most this long after they are made, even after a power cut
+FIELD_COLORS = {validation.ERROR: "red", validation.WARNING: "dark orange"}
+LIBRARY_FILTER_KEYS = ("PINMAP", "MOUNT_TYPE", "AXIS1_DRIVER_MODEL", "AXIS2_DRIVER_MODEL")
+LIBRARY_RESULT_LIMIT = 1000
+CATALOG_PICKER_NAMES = 1000  # rows named in the Import CSV picker; any row can still be typed
+SWEEP_POINTS = 2000
+RENDER_MANIFEST = ".onstep-render.json"  # in a batch output folder: what each Config.h was rendered from
+WATCH_DEBOUNCE_S = 0.02  # quiet time that ends a burst of file events
+WATCH_MAX_DELAY_S = 0.5  # render anyway after this long, even if events keep coming
+WATCH_WAKE_S = 0.5  # how often the watch loop checks whether it should stop
+PRESET_SERVER_ENV = "ONSTEP_PRESET_SERVER"  # base URL of an `onstep_configurator serve` to use instead of GitHub
+DIFF_FILETYPES = [("Presets and Config.h", "*.json *.csv *.h"), ("All files", "*.*")]
+
+class OnStepConfigurator:
+    def __init__(self, root, lazy_tabs=True, instrumentation=None):
+        self.root = root
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            instrumentation.instrument(self)
+        self.profiler = Profiler()
+        self.root.title("OnStepX Configurator")
+        self.root.geometry("600x600")
+
+        # The model owns every value; each tab's property grid only has editors for the rows on screen
+        self.model = ConfigModel()
+        self.model.subscribe(self.on_model_change)
+        self.history = History(self.model)
+        self.grids = {}
+        self.field_issues = {}
+        self.preset_source = None
+        self.preset_server = os.environ.get(PRESET_SERVER_ENV, "").strip().rstrip("/") or None
+        self.executor = None
+        self.prefetch_presets = tk.BooleanVar(root, value=False)
+        self.lazy_tabs = lazy_tabs
+        self.pending_tabs = {}
+        self.notebook = ttk.Notebook(root)
+        self.notebook.pack(pady=10, fill=tk.BOTH, expand=True)
+        self.notebook.bind("<<NotebookTabChanged>>", lambda e: self.build_current_tab())
+
+        for section in schema.SECTIONS:
+            self.create_scrollable_tab(section, lambda frame, section=section: self.create_section_tab(frame, section))
+        self.build_current_tab()
+
+        self.create_menu()
+
+        btn_frame = ttk.Frame(root)
+        btn_frame.pack(pady=5)
+
+        ttk.Button(btn_frame, text="Save Preset", command=self.save_preset).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Load Preset", command=self.load_preset).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Fetch from GitHub", command=self.fetch_from_github).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Generate Config", command=self.generate_config).pack(side=tk.LEFT, padx=5)
+        self.live_preview = tk.BooleanVar(root, value=False)
+        ttk.Checkbutton(btn_frame, text="Live Preview", variable=self.live_preview,
+                        command=self.toggle_live_preview).pack(side=tk.LEFT, padx=5)
+
+        self.validation_label = tk.Label(root, fg=FIELD_COLORS[validation.ERROR], anchor="w", justify=tk.LEFT)
+        self.validation_label.pack(padx=10, fill=tk.X)
+
+        self.output_text = tk.Text(root, height=15)
+        self.output_text.pack(pady=10, padx=10, fill=tk.BOTH)
+
+        self.preview_enabled = False
+        self.preview_dirty = set()
+        self.preview_job = None
+        self.model.subscribe(self.on_preview_change)
+        self.validate_job = None
+        self.model.subscribe(self.on_validation_change)
+        self.journal = None
+        self.journal_job = None
+        self.root.after_idle(self.open_journal)
+
+    def create_menu(self):
+        menubar = tk.Menu(self.root)
+        self.file_menu = tk.Menu(menubar, tearoff=0)
+        self.file_menu.add_command(label="Import CSV...", command=self.import_csv)
+        self.file_menu.add_command(label="Export CSV...", command=self.export_csv)
+        self.file_menu.add_command(label="Append to CSV Catalog...", command=self.append_to_catalog)
+        self.file_menu.add_command(label="Import Config.h...", command=self.import_config_h)
+        self.file_menu.add_separator()
+        self.file_menu.add_command(label="Preset Library...", command=self.open_library)
+        menubar.add_cascade(label="File", menu=self.file_menu)
+        self.edit_menu = tk.Menu(menubar, tearoff=0, postcommand=self.update_edit_menu)
+        self.edit_menu.add_command(label="Undo", accelerator="Ctrl+Z", command=self.undo)
+        self.edit_menu.add_command(label="Redo", accelerator="Ctrl+Y", command=self.redo)
+        menubar.add_cascade(label="Edit", menu=self.edit_menu)
+        self.tools_menu = tk.Menu(menubar, tearoff=0)
+        self.tools_menu.add_command(label="Step Rates...", command=self.show_step_rates)
+        self.tools_menu.add_separator()
+        self.tools_menu.add_command(label="Compare with File...", command=self.compare_preset)
+        self.tools_menu.add_command(label="Merge Preset...", command=self.merge_preset)
+        self.tools_menu.add_separator()
+        self.tools_menu.add_command(label="Preset Server...", command=self.choose_preset_server)
+        menubar.add_cascade(label="Tools", menu=self.tools_menu)
+        self.root.config(menu=menubar)
+        self.menubar = menubar
+        self.diagnostics_menu = None
+        self.root.bind_all("<Control-Shift-D>", lambda e: self.show_diagnostics_menu())
+        for sequence, command in (("<Control-z>", self.undo), ("<Control-y>", self.redo), ("<Control-Shift-Z>", self.redo)):
+            self.root.bind_all(sequence, lambda e, command=command: command())
+
+    def update_edit_menu(self):
+        for index, (verb, label) in enumerate((("Undo", self.history.undo_label), ("Redo", self.history.redo_label))):
+            self.edit_menu.entryconfig(index, label=f"{verb} {label}" if label else verb,
+                                       state=tk.NORMAL if label else tk.DISABLED)
+
+    def undo(self):
+        self.history.undo()
+
+    def redo(self):
+        self.history.redo()
+
+    def show_diagnostics_menu(self):
+        """Hidden menu (Ctrl+Shift+D) for on-demand profiling"""
+        if self.diagnostics_menu is not None:
+            return
+        self.diagnostics_menu = tk.Menu(self.menubar, tearoff=0)
+        self.diagnostics_menu.add_command(label="Start Profiling", command=self.toggle_profiling)
+        if self.instrumentation is not None:
+            self.diagnostics_menu.add_command(label=f"Tracing to {self.instrumentation.trace_path}", state=tk.DISABLED)
+        self.menubar.add_cascade(label="Diagnostics", menu=self.diagnostics_menu)
+
+    def toggle_profiling(self):
+        if not self.profiler.running:
+            self.profiler.start()
+            self.diagnostics_menu.entryconfig(0, label="Stop Profiling and Save...")
+            return
+        file_path = filedialog.asksaveasfilename(defaultextension=".prof", filetypes=[("cProfile stats", "*.prof")],
+                                                 initialfile="onstep.prof")
+        self.diagnostics_menu.entryconfig(0, label="Start Profiling")
+        self.profiler.stop(file_path or None)
+        if file_path:
+            messagebox.showinfo("Profile Saved", f"Profile written to {file_path}\n"
+                                                 f"Open it with: python -m pstats {os.path.basename(file_path)}")
+
+    def create_scrollable_tab(self, tab_name, content_method):
+        tab_frame = ttk.Frame(self.notebook)
+        self.pending_tabs[str(tab_frame)] = (tab_frame, content_method)
+        self.notebook.add(tab_frame, text=tab_name)
+        if not self.lazy_tabs:
+            self.build_tab(str(tab_frame))
+
+    def build_current_tab(self):
+        current = self.notebook.select()
+        if current:
+            self.build_tab(str(current))
+
+    def current_section(self):
+        current = self.notebook.select()
+        return self.notebook.tab(current, "text") if current else None
+
+    def build_tab(self, tab_id):
+        if tab_id not in self.pending_tabs:
+            return
+        tab_frame, content_method = self.pending_tabs.pop(tab_id)
+        content_method(tab_frame)
+
+    def create_section_tab(self, frame, section):
+        grid = PropertyGrid(frame, self.model, schema.section_params(section), origin=self,
+                            foreground=lambda key: FIELD_COLORS.get(self.field_issues.get(key)))
+        grid.pack(fill="both", expand=True)
+        self.grids[section] = grid
+
+    def on_model_change(self, changed, origin):
+        # Grids already show what they wrote; other changes only touch the rows on screen
+        if origin is self:
+            return
+        for grid in self.grids.values():
+            grid.refresh(changed)
+
+    def apply_preset(self, preset):
+        self.model.update(preset)
+
+    def open_journal(self):
+        """Journal every edit for crash recovery, first offering to restore a session that did not close"""
+        from onstep_journal import Journal
+        journal = Journal.open()
+        if journal is None:
+            return  # another configurator is journaling, or the data folder cannot be written
+        recovered = journal.recover()
+        if recovered is not None:
+            values = recovered[0]
+            differing = sum(a != b for a, b in zip(values, self.model.values))
+            if differing and messagebox.askyesno(
+                    "Recover Session", f"The last session did not close normally.\n\n"
+                                       f"Restore its {differing} changed settings?", parent=self.root):
+                self.model.replace(values)
+        try:
+            journal.start(self.model.values)
+        except OSError:
+            journal.close(discard=False)
+            return
+        self.journal = journal
+        self.model.subscribe(self.on_journal_change)
+
+    def on_journal_change(self, changed, origin):
+        values = self.model.values
+        try:
+            self.journal.append({i: values[i] for i in changed})
+        except OSError:
+            self.close_journal(discard=False)
+            return
+        if self.journal_job is None:
+            self.journal_job = self.root.after(JOURNAL_SYNC_MS, self.sync_journal)
+
+    def sync_journal(self):
+        self.journal_job = None
+        if self.journal is not None:
+            try:
+                self.journal.sync()
+            except OSError:
+                self.close_journal(discard=False)
+
+    def close_journal(self, discard=True):
+        """Stop journaling; discard (a normal exit) deletes the journal so nothing is offered next time"""
+        if self.journal is None:
+            return
+        if self.journal_job is not None:
+            try:
+                self.root.after_cancel(self.journal_job)
+            except tk.TclError:  # the window is already gone
+                pass
+            self.journal_job = None
+        self.model.unsubscribe(self.on_journal_change)
+        journal, self.journal = self.journal, None
+        try:
+            journal.close(discard)
+        except OSError:
+            pass
+
+    def run_in_background(self, message, work, on_done, error_message, errors=None):
+        """Run work(cancel_event) on the worker pool behind a progress dialog with a Cancel button.
+
+        The Tk thread only polls the future, so the window keeps redrawing while the
+        request is in flight; on_done(result) is called back on the Tk thread.
+        errors are the exceptions reported to the user (default: network errors).
+        """
+        if errors is None:
+            import requests
+            errors = (requests.RequestException,)
+        if self.executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="onstep-fetch")
+        cancel = threading.Event()
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Please wait")
+        dialog.transient(self.root)
+        dialog.resizable(False, False)
+        tk.Label(dialog, text=message).pack(padx=10, pady=5)
+        progress = ttk.Progressbar(dialog, mode="indeterminate", length=240)
+        progress.pack(padx=10, pady=5)
+        progress.start(15)
+
+        def cancel_task():
+            cancel.set()
+            dialog.destroy()
+
+        ttk.Button(dialog, text="Cancel", command=cancel_task).pack(pady=5)
+        dialog.protocol("WM_DELETE_WINDOW", cancel_task)
+
+        future = self.executor.submit(work, cancel)
+
+        def poll():
+            if cancel.is_set():
+                return  # the work stops with FetchCancelled; nobody is waiting for it
+            if not future.done():
+                self.root.after(POLL_INTERVAL_MS, poll)
+                return
+            dialog.destroy()
+            try:
+                result = future.result()
+            except errors as e:
+                messagebox.showerror("Error", f"{error_message}: {str(e)}")
+                return
+            on_done(result)
+
+        self.root.after(POLL_INTERVAL_MS, poll)
+        return future
+
+    @property
+    def preset_source_name(self):
+        return self.preset_server or "GitHub"
+
+    def choose_preset_server(self):
+        """Fetch presets from a local preset server (onstep_configurator serve) instead of GitHub"""
+        server = simpledialog.askstring("Preset Server", "Preset server URL (blank for GitHub):",
+                                        initialvalue=self.preset_server or "", parent=self.root)
+        if server is None:
+            return
+        server = server.strip().rstrip("/") or None
+        if server and "://" not in server:
+            server = "http://" + server
+        if server != self.preset_server:
+            self.preset_server = server
+            if self.preset_source is not None:
+                self.preset_source.close()
+                self.preset_source = None
+
+    def fetch_from_github(self):
+        import requests
+        from onstep_github import PresetListError, PresetSource
+        if self.preset_source is None:
+            if self.preset_server:
+                self.preset_source = PresetSource(api_base=self.preset_server, raw_base=self.preset_server)
+            else:
+                self.preset_source = PresetSource()
+        source = self.preset_source
+        where = self.preset_source_name
+        self.run_in_background(f"Fetching preset list from {where}...", source.list_presets,
+                               self.show_github_presets, f"Failed to fetch files from {where}",
+                               errors=(requests.RequestException, PresetListError))
+
+    def show_github_presets(self, config_files):
+        source = self.preset_source
+        where = self.preset_source_name
+        if not config_files:
+            messagebox.showwarning("No Files", f"No configuration files found on {where}.")
+            return
+        if source.offline:
+            messagebox.showwarning("Offline", f"{where} is unreachable; showing the cached preset list.")
+
+        selection_window = tk.Toplevel(self.root)
+        selection_window.title("Select Configuration File")
+        selection_window.geometry("300x230")
+
+        tk.Label(selection_window, text="Select a file to load:").pack(pady=5)
+        file_var = tk.StringVar(value=config_files[0])
+        file_box = ttk.Combobox(selection_window, textvariable=file_var, values=config_files)
+        file_box.pack(pady=5)
+        preview_var = tk.StringVar()
+        tk.Label(selection_window, textvariable=preview_var).pack()
+        prefetched = {}
+
+        def apply_selected_file(selected_file, content):
+            try:
+                preset = parse_preset(selected_file, content)
+            except (ValueError, UnicodeDecodeError) as e:
+                messagebox.showerror("Error", f"{selected_file} is not a valid preset: {str(e)}")
+                return
+            self.apply_preset(preset)
+            selection_window.destroy()
+            messagebox.showinfo("Success", f"Loaded {selected_file} from {where}!")
+
+        def load_selected_file():
+            selected_file = file_var.get()
+            if selected_file in prefetched:
+                apply_selected_file(selected_file, prefetched[selected_file])
+                return
+            self.run_in_background(f"Downloading {selected_file}...",
+                                   lambda cancel: source.fetch(selected_file, cancel),
+                                   lambda content: apply_selected_file(selected_file, content),
+                                   f"Failed to fetch {selected_file} from {where}")
+
+        def preview_selected_file(event=None):
+            # Only describes the preset (an in-memory parse once prefetched); Load applies it
+            selected_file = file_var.get()
+            content = prefetched.get(selected_file)
+            if content is None:
+                preview_var.set("")
+                return
+            try:
+                preset = parse_preset(selected_file, content)
+            except (ValueError, UnicodeDecodeError) as e:
+                preview_var.set(f"Not a valid preset: {e}")
+                return
+            index, values = schema.KEY_INDEX, self.model.values
+            differing = sum(1 for key, value in preset.items() if key in index and str(value) != values[index[key]])
+            preview_var.set(f"Loading changes {differing} settings" if differing else "Same as the current settings")
+
+        def prefetch_done(result):
+            bodies, errors = result
+            prefetched.update(bodies)
+            if selection_window.winfo_exists():
+                preview_selected_file()
+            if errors:
+                failed = ", ".join(sorted(errors))
+                messagebox.showwarning("Prefetch", f"Could not prefetch: {failed}", parent=selection_window)
+
+        def prefetch_all():
+            if self.prefetch_presets.get() and selection_window.winfo_exists():
+                missing = [name for name in config_files if name not in prefetched]
+                self.run_in_background(f"Prefetching {len(missing)} presets...",
+                                       lambda cancel: source.fetch_all(missing, cancel),
+                                       prefetch_done, f"Failed to prefetch presets from {where}")
+
+        file_box.bind("<<ComboboxSelected>>", preview_selected_file)
+        ttk.Checkbutton(selection_window, text="Prefetch all presets", variable=self.prefetch_presets,
+                        command=prefetch_all).pack(pady=5)
+        ttk.Button(selection_window, text="Load", command=load_selected_file).pack(pady=10)
+        prefetch_all()
+
+    def save_preset(self):
+        file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")])
+        if file_path:
+            write_preset_json(file_path, self.model.to_dict(), sparse=True)
+            messagebox.showinfo("Success", "Preset saved successfully!")
+
+    def load_preset(self):
+        file_path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")])
+        if file_path:
+            self.apply_preset(read_preset_file(file_path))
+            messagebox.showinfo("Success", "Preset loaded successfully!")
+
+    def import_csv(self):
+        file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
+        if file_path:
+            from onstep_catalog import select_catalog_row
+            selector = self.ask_catalog_row(file_path)
+            if selector is None:
+                return
+            try:
+                row = select_catalog_row(file_path, selector)
+            except LookupError as e:
+                messagebox.showerror("Error", str(e))
+                return
+            self.apply_preset(row)
+            messagebox.showinfo("Success", "CSV imported successfully!")
+
+    def ask_catalog_row(self, file_path):
+        """Row of a catalog to import, picked from its names or typed; None when cancelled"""
+        from itertools import islice
+        from onstep_catalog import NAME_COLUMN, iter_catalog_names
+        try:
+            names = [name for _, name in islice(iter_catalog_names(file_path), CATALOG_PICKER_NAMES) if name]
+        except (OSError, ValueError):
+            names = []  # select_catalog_row reports the problem
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Import CSV")
+        dialog.transient(self.root)
+        tk.Label(dialog, text=f"Row to import ({NAME_COLUMN} or row number, blank for the last row):").pack(padx=10, pady=5)
+        selector = tk.StringVar(dialog)
+        box = ttk.Combobox(dialog, textvariable=selector, values=names, width=40)
+        box.pack(padx=10, pady=5)
+        box.focus_set()
+        result = []
+
+        def accept(event=None):
+            result.append(selector.get())
+            dialog.destroy()
+
+        buttons = ttk.Frame(dialog)
+        buttons.pack(pady=5)
+        ttk.Button(buttons, text="Import", command=accept).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
+        dialog.bind("<Return>", accept)
+        dialog.bind("<Escape>", lambda e: dialog.destroy())
+        dialog.grab_set()
+        self.root.wait_window(dialog)
+        return result[0] if result else None
+
+    def export_csv(self):
+        file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
+        if file_path:
+            write_preset_csv(file_path, self.model.to_dict())
+            messagebox.showinfo("Success", "CSV exported successfully!")
+
+    def append_to_catalog(self):
+        file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")],
+                                                 confirmoverwrite=False, title="Append to CSV Catalog")
+        if file_path:
+            from onstep_catalog import NAME_COLUMN, append_catalog_row
+            name = simpledialog.askstring("Append to Catalog", f"{NAME_COLUMN} for this row:",
+                                          initialvalue=self.model['PINMAP'], parent=self.root)
+            if name is None:
+                return
+            dropped = append_catalog_row(file_path, self.model.to_dict(), name)
+            if dropped:
+                messagebox.showwarning("Catalog", f"The catalog has no column for: {', '.join(dropped)}")
+            messagebox.showinfo("Success", f"Appended {name} to {os.path.basename(file_path)}")
+
+    def import_config_h(self):
+        file_path = filedialog.askopenfilename(filetypes=[("Config headers", "*.h"), ("All files", "*.*")])
+        if file_path:
+            from onstep_config_h import parse_config_h
+            try:
+                result = parse_config_h(file_path)
+            except OSError as e:
+                messagebox.showerror("Error", f"Failed to read {file_path}: {str(e)}")
+                return
+            self.apply_preset(result.values)
+            report = f"Imported {len(result.values)} settings from {os.path.basename(file_path)}."
+            if result.missing:
+                report += f"\n\n{len(result.missing)} not defined in the file (left unchanged): {summarize_keys(result.missing)}"
+            if result.unknown:
+                report += f"\n\n{len(result.unknown)} not supported by the configurator (ignored): {summarize_keys(result.unknown)}"
+            messagebox.showinfo("Config.h Imported", report)
+
+    def open_library(self):
+        directory = filedialog.askdirectory(title="Preset Library Folder", initialdir=resource_path("presets"))
+        if not directory:
+            return
+        import sqlite3
+        from onstep_library import PresetLibrary
+
+        def refresh(cancel):
+            with PresetLibrary(directory) as library:
+                return library.refresh()
+
+        self.run_in_background("Indexing presets...", refresh, lambda counts: self.show_library(directory),
+                               "Failed to index the preset library", errors=(OSError, sqlite3.Error))
+
+    def show_library(self, directory):
+        from onstep_library import PresetLibrary
+        library = PresetLibrary(directory)
+        window = tk.Toplevel(self.root)
+        window.title(f"Preset Library - {directory}")
+        window.geometry("520x420")
+
+        filters = ttk.Frame(window)
+        filters.pack(fill=tk.X, padx=10, pady=5)
+        filter_vars = {}
+        for row, key in enumerate(LIBRARY_FILTER_KEYS):
+            tk.Label(filters, text=key.replace('_', ' ') + ":").grid(row=row, column=0, sticky="w")
+            filter_vars[key] = tk.StringVar(window, value="")
+            ttk.Combobox(filters, textvariable=filter_vars[key], state="readonly",
+                         values=[""] + library.distinct_values(key)).grid(row=row, column=1, sticky="ew")
+        tk.Label(filters, text="Name contains:").grid(row=len(LIBRARY_FILTER_KEYS), column=0, sticky="w")
+        name_var = tk.StringVar(window, value="")
+        tk.Entry(filters, textvariable=name_var).grid(row=len(LIBRARY_FILTER_KEYS), column=1, sticky="ew")
+        filters.columnconfigure(1, weight=1)
+
+        status = tk.Label(window, anchor="w")
+        status.pack(fill=tk.X, padx=10)
+        results = tk.Listbox(window)
+        results.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        def update_results(*args):
+            criteria = {key: var.get() for key, var in filter_vars.items() if var.get()}
+            start = time.perf_counter()
+            paths = library.search(criteria, name_var.get(), limit=LIBRARY_RESULT_LIMIT)
+            elapsed = (time.perf_counter() - start) * 1000
+            results.delete(0, tk.END)
+            results.insert(tk.END, *paths)
+            status.config(text=f"{len(paths)} of {len(library)} presets ({elapsed:.1f} ms)")
+
+        def load_selected(event=None):
+            selection = results.curselection()
+            if selection:
+                path = results.get(selection[0])
+                self.apply_preset(library.values(path))
+                messagebox.showinfo("Success", f"Loaded {path} from the library!", parent=window)
+
+        for var in list(filter_vars.values()) + [name_var]:
+            var.trace_add("write", update_results)
+        results.bind("<Double-Button-1>", load_selected)
+        ttk.Button(window, text="Load", command=load_selected).pack(pady=5)
+        window.bind("<Destroy>", lambda e: library.close() if e.widget is window else None)
+        update_results()
+
+    def show_step_rates(self):
+        """Required step rates and achievable slews per axis, plus the fastest feasible slew for each goto microstep setting"""
+        window = tk.Toplevel(self.root)
+        window.title("Step Rates")
+        window.geometry("640x480")
+
+        summary = tk.Label(window, anchor="w", justify=tk.LEFT)
+        summary.pack(fill=tk.X, padx=10, pady=5)
+        columns = ("axis", "steps", "slew", "rate", "max", "status")
+        headings = ("Axis", "Goto steps/unit", "Slew /s", "Step rate (Hz)", "Max slew /s", "")
+        axes_view = ttk.Treeview(window, columns=columns, show="headings", height=4)
+        for column, heading in zip(columns, headings):
+            axes_view.heading(column, text=heading)
+            axes_view.column(column, width=100, anchor="e")
+        axes_view.pack(fill=tk.X, padx=10)
+        axes_view.tag_configure("over", foreground="red")
+
+        picker = ttk.Frame(window)
+        picker.pack(fill=tk.X, padx=10, pady=5)
+        tk.Label(picker, text="Feasible frontier for axis:").pack(side=tk.LEFT)
+        axis_var = tk.StringVar(window, value="1")
+        axis_box = ttk.Combobox(picker, textvariable=axis_var, state="readonly", width=4)
+        axis_box.pack(side=tk.LEFT, padx=5)
+        frontier_columns = ("goto", "steps", "max", "fits")
+        frontier_view = ttk.Treeview(window, columns=frontier_columns, show="headings")
+        for column, heading in zip(frontier_columns, ("Goto microsteps", "Steps/unit", "Max slew /s", "Current slew")):
+            frontier_view.heading(column, text=heading)
+            frontier_view.column(column, width=140, anchor="e")
+        frontier_view.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        frontier_view.tag_configure("current", background="light yellow")
+
+        refresh_job = None
+
+        def refresh():
+            nonlocal refresh_job
+            refresh_job = None
+            values = self.model.values
+            report = steprate.step_report(values)
+            load_text = "?" if math.isnan(report.isr_load) else f"{report.isr_load:.1%}"
+            summary.config(text=f"Controller: {report.mcu.name} (max {report.mcu.max_step_rate:,} steps/s per axis); "
+                                f"step ISR load with every axis slewing: {load_text} "
+                                f"(limit {steprate.MAX_ISR_LOAD:.0%})")
+            axes_view.delete(*axes_view.get_children())
+            for rate in report.axes:
+                status = {True: "OK", False: "TOO FAST", None: "?"}[rate.feasible]
+                axes_view.insert("", tk.END, tags=("over",) if rate.feasible is False else (), values=(
+                    rate.axis, f"{rate.goto_steps:,.1f}", f"{rate.slew_rate:g} {rate.unit}",
+                    f"{rate.slew_step_rate:,.0f}", f"{rate.max_slew_rate:,.2f} {rate.unit}", status))
+            axis_box.config(values=[str(rate.axis) for rate in report.axes])
+            if axis_var.get() not in axis_box.cget("values"):
+                axis_var.set("1")
+            show_frontier(report)
+
+        def show_frontier(report):
+            frontier_view.delete(*frontier_view.get_children())
+            rate = next((rate for rate in report.axes if str(rate.axis) == axis_var.get()), None)
+            if rate is None or math.isnan(rate.steps):
+                return
+            key = f"AXIS{rate.axis}_DRIVER_MICROSTEPS"
+            microsteps = steprate.positive_number(self.model[key])
+            current_goto = steprate.positive_number(self.model[key + "_GOTO"])
+            if math.isnan(microsteps):
+                # No microstep switching: steps per unit are the same for every slew
+                microsteps, goto_microsteps, current_goto = 1.0, (1,), 1.0
+            else:
+                goto_microsteps = steprate.GOTO_MICROSTEPS
+            other_steps = sum(other.goto_steps for other in report.axes
+                              if other.axis != rate.axis and rate.axis <= 2 and other.axis <= 2)
+            ceiling = report.mcu.max_step_rate * microsteps / rate.steps
+            if not math.isnan(rate.slew_rate):
+                ceiling = max(ceiling, rate.slew_rate)
+            slew_rates = [ceiling * 10 ** (-4 * (1 - i / (SWEEP_POINTS - 1))) for i in range(SWEEP_POINTS)]
+            result = steprate.sweep(report.mcu, rate.steps, microsteps, slew_rates, goto_microsteps, other_steps)
+            for goto, fastest in zip(goto_microsteps, result.frontier):
+                if math.isnan(rate.slew_rate) or math.isnan(fastest):
+                    fits = ""
+                else:
+                    fits = "OK" if rate.slew_rate <= fastest else "too fast"
+                frontier_view.insert("", tk.END, tags=("current",) if goto == current_goto else (), values=(
+                    goto, f"{rate.steps * goto / microsteps:,.1f}",
+                    "-" if math.isnan(fastest) else f"{fastest:,.3g} {rate.unit}", fits))
+
+        def on_change(changed, origin):
+            nonlocal refresh_job
+            if refresh_job is None:
+                refresh_job = window.after(PREVIEW_DEBOUNCE_MS, refresh)
+
+        def on_destroy(event):
+            if event.widget is window:
+                self.model.unsubscribe(on_change)
+
+        axis_box.bind("<<ComboboxSelected>>", lambda e: show_frontier(steprate.step_report(self.model.values)))
+        self.model.subscribe(on_change)
+        window.bind("<Destroy>", on_destroy)
+        refresh()
+
+    def read_diff_side(self, file_path):
+        """A preset or Config.h for compare/merge, or None (after telling the user) when it cannot be read"""
+        from onstep_diff import read_side
+        try:
+            return read_side(file_path)
+        except (OSError, ValueError, AttributeError) as e:
+            messagebox.showerror("Error", f"Failed to read {file_path}: {str(e)}")
+            return None
+
+    def compare_preset(self):
+        """Settings that differ between the window and a preset or Config.h file, by section"""
+        file_path = filedialog.askopenfilename(title="Compare with File", filetypes=DIFF_FILETYPES)
+        if not file_path:
+            return
+        other = self.read_diff_side(file_path)
+        if other is None:
+            return
+        from onstep_diff import diff_split, split
+        other = split(other)
+
+        def differences():
+            return [(c.key, c.section, (c.old, c.new), c.new) for c in diff_split((self.model.values, {}), other)]
+        self.show_differences(f"Compare - {os.path.basename(file_path)}", ("Current", "File"), differences,
+                              "Use File Value")
+
+    def merge_preset(self):
+        """Three-way merge of another preset into the window's settings; conflicts are listed for review"""
+        base_path = filedialog.askopenfilename(title="Merge: Common Base Preset", filetypes=DIFF_FILETYPES)
+        if not base_path:
+            return
+        their_path = filedialog.askopenfilename(title="Merge: Preset to Merge In", filetypes=DIFF_FILETYPES)
+        if not their_path:
+            return
+        base = self.read_diff_side(base_path)
+        if base is None:
+            return
+        theirs = self.read_diff_side(their_path)
+        if theirs is None:
+            return
+        from onstep_diff import merge
+        result = merge(base, self.model.to_dict(), theirs)
+        self.apply_preset(result.preset)
+        conflicts = [c for c in result.conflicts if c.section in schema.SECTIONS]
+        if not conflicts:
+            messagebox.showinfo("Merge", f"Merged {os.path.basename(their_path)} without conflicts.")
+            return
+
+        def unresolved():
+            return [(c.key, c.section, (c.base, c.ours, c.theirs), c.theirs)
+                    for c in merge(base, self.model.to_dict(), theirs).conflicts]
+        self.show_differences(f"Merge Conflicts - {os.path.basename(their_path)}", ("Base", "Current", "Theirs"),
+                              unresolved, "Use Theirs")
+
+    def show_differences(self, title, headings, compute, take_label):
+        """Rows from compute() -> [(key, section, cells, value to take)] grouped by section, refreshed as the model changes"""
+        window = tk.Toplevel(self.root)
+        window.title(title)
+        window.geometry("640x480")
+
+        status = tk.Label(window, anchor="w")
+        status.pack(fill=tk.X, padx=10, pady=5)
+        columns = ("key",) + tuple(f"side{i}" for i in range(len(headings)))
+        view = ttk.Treeview(window, columns=columns)
+        view.heading("#0", text="Section")
+        view.column("#0", width=130)
+        view.heading("key", text="Setting")
+        view.column("key", width=200)
+        for column, heading in zip(columns[1:], headings):
+            view.heading(column, text=heading)
+            view.column(column, width=120)
+        view.pack(fill=tk.BOTH, expand=True, padx=10)
+
+        rows = {}
+        refresh_job = None
+
+        def refresh():
+            nonlocal refresh_job
+            refresh_job = None
+            sections = {}
+            for key, section, cells, value in compute():
+                if section in schema.SECTIONS:
+                    sections.setdefault(section, []).append((key, cells, value))
+            rows.clear()
+            view.delete(*view.get_children())
+            for section, found in sections.items():
+                node = view.insert("", tk.END, text=f"{section} ({len(found)})", open=True)
+                for key, cells, value in found:
+                    shown = tuple("(unset)" if cell is None else cell for cell in cells)
+                    rows[view.insert(node, tk.END, values=(key,) + shown)] = (key, value)
+            count = len(rows)
+            status.config(text=f"{count} setting{'s' if count != 1 else ''} in {len(sections)} sections"
+                          if count else "Nothing left to review.")
+
+        def take(items):
+            preset = {}
+            for item in items:
+                for row in (item,) + view.get_children(item):
+                    if row in rows:
+                        key, value = rows[row]
+                        preset[key] = value
+            if preset:
+                self.apply_preset(preset)
+
+        def on_change(changed, origin):
+            nonlocal refresh_job
+            if refresh_job is None:
+                refresh_job = window.after(PREVIEW_DEBOUNCE_MS, refresh)
+
+        def on_destroy(event):
+            if event.widget is window:
+                self.model.unsubscribe(on_change)
+
+        buttons = ttk.Frame(window)
+        buttons.pack(pady=5)
+        ttk.Button(buttons, text=take_label, command=lambda: take(view.selection())).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text=f"{take_label} (All)",
+                   command=lambda: take(view.get_children())).pack(side=tk.LEFT, padx=5)
+        view.bind("<Double-Button-1>", lambda e: take(view.selection()))
+        self.model.subscribe(on_change)
+        window.bind("<Destroy>", on_destroy)
+        refresh()
+
+    def show_config(self, config):
+        top = self.output_text.yview()[0]
+        self.output_text.delete(1.0, tk.END)
+        self.output_text.insert(tk.END, config)
+        self.output_text.yview_moveto(top)
+
+    def toggle_live_preview(self):
+        self.preview_enabled = self.live_preview.get()
+        if self.preview_enabled:
+            self.preview_dirty.clear()
+            self.show_config(self.model.render())
+
+    def on_preview_change(self, changed, origin):
+        if not self.preview_enabled:
+            return
+        self.preview_dirty |= changed
+        if self.preview_job is None:
+            self.preview_job = self.root.after(PREVIEW_DEBOUNCE_MS, self.flush_preview)
+
+    def flush_preview(self):
+        """Rewrite only the #define lines whose values changed since the last flush"""
+        self.preview_job = None
+        dirty, self.preview_dirty = self.preview_dirty, set()
+        if not self.preview_enabled or not dirty:
+            return
+        text = self.output_text
+        line_count = int(text.index("end-1c").split(".")[0])
+        if line_count != schema.LINE_COUNT or len(dirty) > schema.LINE_COUNT // 2:
+            # Hand-edited text or a wholesale change (preset load): cheaper to redraw everything
+            self.show_config(self.model.render())
+            return
+        values = self.model.values
+        for i in sorted(dirty):
+            line = schema.LINE_NUMBERS[i]
+            text.replace(f"{line}.0", f"{line}.end", schema.define_line(schema.PARAMS[i], values[i]))
+
+    def on_validation_change(self, changed, origin):
+        if self.validate_job is None:
+            self.validate_job = self.root.after(VALIDATE_DEBOUNCE_MS, self.run_validation)
+
+    def run_validation(self):
+        """Check the model, colour the labels of offending fields and list the problems"""
+        self.validate_job = None
+        issues = validation.validate(self.model.values)
+        old_keys = set(self.field_issues)
+        self.field_issues = {}
+        for issue in issues:
+            for key in issue.keys:
+                # An error outranks a warning on the same field
+                if self.field_issues.get(key) != validation.ERROR:
+                    self.field_issues[key] = issue.severity
+        for key in old_keys | set(self.field_issues):
+            self.highlight_field(key)
+        lines = [issue.message for issue in issues[:3]]
+        if len(issues) > 3:
+            lines.append(f"... and {len(issues) - 3} more")
+        self.validation_label.config(text="\n".join(lines))
+        return issues
+
+    def highlight_field(self, key):
+        grid = self.grids.get(schema.PARAMS[schema.KEY_INDEX[key]].section)
+        if grid is not None:
+            grid.refresh_key(key)
+
+    def generate_config(self):
+        if self.validate_job is not None:
+            self.root.after_cancel(self.validate_job)
+            self.validate_job = None
+        errors = [issue for issue in self.run_validation() if issue.severity == validation.ERROR]
+        if errors:
+            details = "\n".join(issue.message for issue in errors[:10])
+            if len(errors) > 10:
+                details += f"\n... and {len(errors) - 10} more"
+            if not messagebox.askyesno("Invalid Configuration", f"{details}\n\nGenerate anyway?"):
+                return
+        self.show_config(self.model.render())
+        messagebox.showinfo("Success", "Configuration generated! Copy the text from the box below into your Arduino IDE.")
+
+def render_config(values):
+    """Render Config.h from a key/value preset; missing keys take their schema default"""
+    return schema.render(schema.values_from_dict(values))
+
+def summarize_keys(keys, limit=12):
+    keys = list(keys)
+    shown = ", ".join(keys[:limit])
+    return shown + (f" and {len(keys) - limit} more" if len(keys) > limit else "")
+
+def render_cache(cache_dir, caches={}):
+    """This process's RenderCache for cache_dir, None for memory only (one per worker, so it lasts the whole batch)"""
+    cache = caches.get(cache_dir)
+    if cache is None:
+        from onstep_render_cache import RenderCache
+        cache = caches[cache_dir] = RenderCache(cache_dir)
+    return cache
+
+def _unchanged(file_path, size, mtime_ns):
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return False
+    return stat.st_size == size and stat.st_mtime_ns == mtime_ns
+
+def render_preset_file(job):
+    """Render one preset file to its Config.h unless the manifest entry shows it is up to date.
+
+    job is (source, target, previous manifest entry or None, render cache folder or None).  Returns
+    (source, error or None, manifest entry [source size, source mtime, key, target size, target mtime], written).
+    """
+    source, target, previous, cache_dir = job
+    try:
+        stat = os.stat(source)
+        if (previous is not None and previous[:2] == [stat.st_size, stat.st_mtime_ns]
+                and _unchanged(target, *previous[3:])):
+            return source, None, previous, False
+        values = schema.values_from_dict(read_preset_file(source))
+        from onstep_render_cache import render_key
+        key = render_key(values)
+        if previous is not None and previous[2] == key and _unchanged(target, *previous[3:]):
+            # Touched or rewritten with the same values
+            return source, None, [stat.st_size, stat.st_mtime_ns, key] + previous[3:], False
+        key, config = render_cache(cache_dir).render(values)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'w') as f:
+            f.write(config)
+        written = os.stat(target)
+    except (OSError, ValueError, AttributeError) as e:
+        return source, f"{type(e).__name__}: {e}", None, False
+    return source, None, [stat.st_size, stat.st_mtime_ns, key, written.st_size, written.st_mtime_ns], True
+
+def map_jobs(function, items, jobs):
+    """[function(item) for item in items], spread over jobs worker processes"""
+    if jobs == 1 or len(items) < 2:
+        return [function(item) for item in items]
+    from concurrent.futures import ProcessPoolExecutor
+    chunksize = max(1, len(items) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(function, items, chunksize=chunksize))
+
+def default_render_cache_dir():
+    from onstep_paths import user_cache_dir
+    return os.path.join(user_cache_dir(), "render")
+
+def preset_stem(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+def render_job(path, output_dir, manifest, cache_dir):
+    name = preset_stem(path)
+    return path, os.path.join(output_dir, name, "Config.h"), manifest.get(name), cache_dir
+
+def name_clash_errors(name, paths):
+    """[(source, error)] for preset files that would all be rendered to name/Config.h"""
+    return [(path, f"{name}/Config.h would also be written from {', '.join(other for other in paths if other != path)}")
+            for path in paths]
+
+def render_jobs(paths, output_dir, manifest, cache_dir):
+    """render_job for every path, and [(source, error)] for presets sharing a name, none of which is rendered"""
+    named = {}
+    for path in paths:
+        named.setdefault(os.path.normcase(preset_stem(path)), []).append(path)
+    work, errors = [], []
+    for path in paths:
+        clashing = named[os.path.normcase(preset_stem(path))]
+        if len(clashing) == 1:
+            work.append(render_job(path, output_dir, manifest, cache_dir))
+        elif path is clashing[0]:
+            errors.extend(name_clash_errors(preset_stem(path), clashing))
+    return work, errors
+
+def generator_version():
+    """Identifies FileVersionConfig and the Config.h template; a manifest written by another is stale"""
+    from onstep_render_cache import GENERATOR_DIGEST
+    return GENERATOR_DIGEST.hex()
+
+def read_render_manifest(output_dir):
+    """{preset name: entry} of the last batch into output_dir; empty when it was rendered by another generator"""
+    try:
+        with open(os.path.join(output_dir, RENDER_MANIFEST), 'r') as f:
+            manifest = json.load(f)
+        if manifest.get("generator") == generator_version():
+            return manifest["presets"]
+    except (OSError, ValueError, AttributeError, KeyError):
+        pass
+    return {}
+
+def write_render_manifest(output_dir, entries):
+    manifest_path = os.path.join(output_dir, RENDER_MANIFEST)
+    os.makedirs(output_dir, exist_ok=True)
+    temporary = manifest_path + ".tmp"
+    with open(temporary, 'w') as f:
+        json.dump({"generator": generator_version(), "presets": entries}, f)
+    os.replace(temporary, manifest_path)
+
+def batch_generate(inputs, output_dir, jobs=None, cache_dir=None, force=False):
+    """Render every preset found in inputs to output_dir/<preset name>/Config.h.
+
+    Outputs whose preset values (and generator version) are unchanged since the last batch into
+    output_dir, according to its RENDER_MANIFEST, are left alone unless force is set.  Presets
+    with the same name (a/m.json and b/m.json, m.json and m.csv) are errors and are not rendered.  cache_dir
+    is a render cache folder shared between batches and output folders (None keeps it in memory).
+    Returns (preset count, [(source, error)], seconds, outputs written).
+    """
+    paths = find_preset_files(inputs)
+    manifest = {} if force else read_render_manifest(output_dir)
+    work, errors = render_jobs(paths, output_dir, manifest, cache_dir)
+    jobs = jobs or os.cpu_count() or 1
+    start = time.perf_counter()
+    results = map_jobs(render_preset_file, work, jobs)
+    errors += [(source, error) for source, error, entry, written in results if error]
+    written = sum(written for source, error, entry, written in results)
+    entries = {preset_stem(source): entry for source, error, entry, _ in results if entry is not None}
+    if entries != manifest:
+        write_render_manifest(output_dir, entries)
+    if written and cache_dir is not None:
+        render_cache(cache_dir).prune()
+    elapsed = time.perf_counter() - start
+    return len(paths), errors, elapsed, written
+
+def remove_render_output(directory, output_dir, name, entry):
+    """Delete the Config.h rendered from a deleted preset; returns whether it was removed.
+
+    It is kept when another preset file still has that name or when it was edited since it was written.
+    """
+    if any(os.path.isfile(os.path.join(directory, name + extension)) for extension in PRESET_EXTENSIONS):
+        return False
+    folder = os.path.join(output_dir, name)
+    target = os.path.join(folder, "Config.h")
+    if not _unchanged(target, *entry[3:]):
+        return False
+    try:
+        os.remove(target)
+        os.rmdir(folder)  # only when nothing else was put there
+    except OSError:
+        pass
+    return True
+
+def watch_presets(directory, output_dir, cache_dir=None, poll_interval=None, debounce=WATCH_DEBOUNCE_S,
+                  report=print, stop=None):
+    """Keep output_dir in step with the presets in directory until stop (a threading.Event) is set or Ctrl+C.
+
+    Starts with an incremental batch, then re-renders only the presets whose files change; the
+    Config.h of a preset deleted since it was rendered is removed unless it was edited by hand.  Events are coalesced
+    until the folder has been quiet for debounce seconds (at most WATCH_MAX_DELAY_S).
+    report(message) gets one line per cycle with its latency: from the first event to the last
+    Config.h written.  Ctrl+C during a cycle still records what it wrote.  Returns the list of
+    cycle latencies in seconds.
+    """
+    from onstep_watch import RESCAN, open_watcher
+    watcher = open_watcher(directory, poll_interval)
+    latencies = []
+    manifest, dirty = None, False
+    written = removed = 0
+    first_event = None
+    try:
+        previous = read_render_manifest(output_dir)
+        count, errors, elapsed, written = batch_generate([directory], output_dir, jobs=None, cache_dir=cache_dir)
+        manifest = read_render_manifest(output_dir)
+        removed = sum(remove_render_output(directory, output_dir, name, previous[name])
+                      for name in previous.keys() - manifest.keys())
+        for source, error in errors:
+            report(f"{source}: {error}")
+        report(f"Watching {directory} ({type(watcher).__name__}): {count} presets, {written} written, "
+               f"{removed} removed in {elapsed:.2f}s")
+        while stop is None or not stop.is_set():
+            first_event = None
+            changed = watcher.wait(WATCH_WAKE_S)
+            if not changed:
+                continue
+            first_event = time.perf_counter()
+            errors, written, removed = [], 0, 0
+            while time.perf_counter() - first_event < WATCH_MAX_DELAY_S:
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                changed |= more
+            if RESCAN in changed:
+                previous = manifest
+                count, errors, _, written = batch_generate([directory], output_dir, jobs=None, cache_dir=cache_dir)
+                manifest = read_render_manifest(output_dir)
+                for name in previous.keys() - manifest.keys():
+                    removed += remove_render_output(directory, output_dir, name, previous[name])
+            else:
+                # By preset name: deleting m.csv can leave m.json the only preset to render to m/Config.h
+                for name in sorted({preset_stem(name) for name in changed if name.endswith(PRESET_EXTENSIONS)}):
+                    paths = [os.path.join(directory, name + extension) for extension in PRESET_EXTENSIONS
+                             if os.path.isfile(os.path.join(directory, name + extension))]
+                    if len(paths) != 1:
+                        entry = manifest.pop(name, None)
+                        if entry is not None:
+                            dirty = True
+                            if not paths:
+                                removed += remove_render_output(directory, output_dir, name, entry)
+                        errors.extend(name_clash_errors(name, paths))
+                        continue
+                    source, error, entry, was_written = render_preset_file(render_job(paths[0], output_dir, manifest,
+                                                                                      cache_dir))
+                    if error:
+                        errors.append((source, error))
+                    else:
+                        dirty = dirty or manifest.get(name) != entry
+                        manifest[name] = entry
+                        written += was_written
+                count = len(changed)
+            latency = time.perf_counter() - first_event
+            if dirty:
+                write_render_manifest(output_dir, manifest)
+                dirty = False
+            latencies.append(latency)
+            for source, error in errors:
+                report(f"{source}: {error}")
+            report(f"{count} changed, {written} written, {removed} removed, {len(errors)} failed "
+                   f"in {latency * 1000:.1f} ms")
+    except KeyboardInterrupt:
+        if dirty:
+            write_render_manifest(output_dir, manifest)
+        if first_event is not None:
+            report(f"Interrupted: {written} written, {removed} removed before stopping")
+    finally:
+        watcher.close()
+    return latencies
+
+def load_preset_values(source):
+    """Read one preset file as a value list; returns (source, values or None, error or None)"""
+    try:
+        return source, schema.values_from_dict(read_preset_file(source)), None
+    except (OSError, ValueError, AttributeError) as e:
+        return source, None, f"{type(e).__name__}: {e}"
+
+def validate_presets(inputs, jobs=None):
+    """Validate every preset found in inputs as one fleet.
+
+    Returns ({path: [Issue, ...]} for presets with issues, unreadable [(path, error)], preset count, seconds).
+    """
+    paths = find_preset_files(inputs)
+    jobs = jobs or os.cpu_count() or 1
+    start = time.perf_counter()
+    results = map_jobs(load_preset_values, paths, jobs)
+    loaded = [(source, values) for source, values, error in results if error is None]
+    unreadable = [(source, error) for source, values, error in results if error]
+    failures = validation.validate_fleet([values for source, values in loaded])
+    issues = {loaded[i][0]: found for i, found in validation.issues_by_preset(failures).items()}
+    return issues, unreadable, len(loaded), time.perf_counter() - start
+
+def load_diff_side(source):
+    """Read one preset or Config.h for comparison; returns (source, (values, others) or None, error or None)"""
+    from onstep_diff import read_side, split
+    try:
+        return source, split(read_side(source)), None
+    except (OSError, ValueError, AttributeError) as e:
+        return source, None, f"{type(e).__name__}: {e}"
+
+def diff_presets(reference, targets, jobs=None):
+    """Compare every target against reference.
+
+    targets are preset/Config.h files, preset directories or glob patterns.  Returns
+    ({path: [Change, ...]} for every readable target, unreadable [(path, error)], seconds).
+    """
+    from onstep_diff import diff_split
+    paths, unreadable = [], []
+    for item in targets:
+        found = [item] if os.path.isfile(item) else find_preset_files([item])
+        if not found:
+            unreadable.append((item, "no presets found"))
+        paths.extend(found)
+    jobs = jobs or os.cpu_count() or 1
+    start = time.perf_counter()
+    _, base, error = load_diff_side(reference)
+    if error:
+        return {}, unreadable + [(reference, error)], time.perf_counter() - start
+    changes = {}
+    for source, side, error in map_jobs(load_diff_side, paths, jobs):
+        if error:
+            unreadable.append((source, error))
+        else:
+            changes[source] = diff_split(base, side)
+    return changes, unreadable, time.perf_counter() - start
+
+def cli(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog="onstep_configurator", description="Headless OnStepX Config.h tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser("batch", help="render a directory or glob of presets to Config.h files")
+    batch.add_argument("inputs", nargs="+", help="preset directories or glob patterns (JSON/CSV)")
+    batch.add_argument("-o", "--output", default="configs", help="output directory (default: configs)")
+    batch.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    batch.add_argument("-f", "--force", action="store_true", help="rewrite every Config.h, even those already up to date")
+    batch.add_argument("--render-cache", nargs="?", const="", default=None, metavar="DIR",
+                       help="keep rendered files in a size-limited cache shared by every output folder "
+                            "(default DIR: the user cache folder)")
+
+    library = commands.add_parser("library", help="index a preset folder and search it")
+    library.add_argument("directory", help="preset library folder (indexed recursively)")
+    library.add_argument("-w", "--where", action="append", default=[], metavar="KEY=VALUE",
+                         help="only presets with this value (repeatable)")
+    library.add_argument("-n", "--name", help="only presets whose path contains this text")
+
+    import_config = commands.add_parser("import-config", help="convert existing Config.h files into JSON presets")
+    import_config.add_argument("inputs", nargs="+", help="Config.h files or folders searched recursively for *.h")
+    import_config.add_argument("-o", "--output", default="presets", help="output directory (default: presets)")
+    import_config.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    import_config.add_argument("-v", "--verbose", action="store_true", help="report unknown/missing keys per file")
+
+    pack = commands.add_parser("pack", help="store many presets in one compact .ospk file")
+    pack.add_argument("inputs", nargs="+", help="preset directories or glob patterns (JSON/CSV)")
+    pack.add_argument("-o", "--output", required=True, help="pack file to write")
+
+    unpack = commands.add_parser("unpack", help="write the presets of an .ospk file as JSON files")
+    unpack.add_argument("pack", help="pack file")
+    unpack.add_argument("-o", "--output", default="presets", help="output directory (default: presets)")
+    unpack.add_argument("--full", action="store_true", help="write every key instead of sparse presets")
+
+    validate = commands.add_parser("validate", help="check presets for invalid or conflicting values")
+    validate.add_argument("inputs", nargs="+", help="preset directories or glob patterns (JSON/CSV)")
+    validate.add_argument("-j", "--jobs", type=int, default=None, help="worker processes for loading (default: CPU count)")
+    validate.add_argument("-W", "--no-warnings", action="store_true", help="only report errors")
+
+    watch = commands.add_parser("watch", help="keep Config.h files up to date while presets in a folder change")
+    watch.add_argument("directory", help="preset folder to watch (JSON/CSV)")
+    watch.add_argument("-o", "--output", default="configs", help="output directory (default: configs)")
+    watch.add_argument("--poll", type=float, metavar="SECONDS",
+                       help="poll the folder every SECONDS instead of using inotify")
+    watch.add_argument("--debounce-ms", type=float, default=WATCH_DEBOUNCE_S * 1000,
+                       help=f"wait for this much quiet before rendering a burst of changes "
+                            f"(default: {WATCH_DEBOUNCE_S * 1000:g})")
+    watch.add_argument("--render-cache", nargs="?", const="", default=None, metavar="DIR",
+                       help="use the shared render cache (see batch)")
+
+    serve = commands.add_parser("serve", help="serve a preset folder over HTTP in place of GitHub",
+                                description="Point configurators at the printed URL with ONSTEP_PRESET_SERVER "
+                                            "or Tools > Preset Server.")
+    serve.add_argument("directory", help="preset folder to serve (JSON/CSV)")
+    serve.add_argument("--host", default="127.0.0.1",
+                       help="address to listen on (default: 127.0.0.1; 0.0.0.0 for the whole network)")
+    serve.add_argument("-p", "--port", type=int, default=8780, help="port to listen on (default: 8780, 0 for any)")
+    serve.add_argument("--poll", type=float, metavar="SECONDS",
+                       help="poll the folder every SECONDS instead of using inotify")
+    serve.add_argument("--public-url", metavar="URL",
+                       help="URL the listing points clients at, e.g. behind a proxy or by host name "
+                            "(default: the address each client connected to)")
+
+    compare = commands.add_parser("diff", help="compare presets or Config.h files against a reference, by section",
+                                  description="Exit status: 0 when nothing differs, 1 when something does, "
+                                              "2 when a file could not be read.")
+    compare.add_argument("reference", help="reference preset (JSON/CSV) or Config.h")
+    compare.add_argument("targets", nargs="+", help="presets or Config.h files, preset directories or glob patterns")
+    compare.add_argument("-s", "--summary", action="store_true", help="one line per file instead of every change")
+    compare.add_argument("-j", "--jobs", type=int, default=None, help="worker processes for loading (default: CPU count)")
+
+    merge = commands.add_parser("merge", help="three-way merge of two presets edited from a common base",
+                                description="Exit status: 0 on a clean merge, 1 when there are conflicts, "
+                                            "2 when a file could not be read.")
+    merge.add_argument("base", help="the preset both sides started from")
+    merge.add_argument("ours", help="our edited preset")
+    merge.add_argument("theirs", help="their edited preset")
+    merge.add_argument("-o", "--output", required=True, help="merged preset (JSON) to write")
+    merge.add_argument("--prefer", choices=("ours", "theirs"), default="ours",
+                       help="side whose value a conflicting key keeps (default: ours)")
+
+    args = parser.parse_args(argv)
+    if args.command == "watch":
+        if args.poll is not None and args.poll <= 0 or args.debounce_ms < 0:
+            parser.error("--poll must be positive and --debounce-ms not negative")
+        cache_dir = default_render_cache_dir() if args.render_cache == "" else args.render_cache
+        try:
+            latencies = watch_presets(args.directory, args.output, cache_dir, args.poll, args.debounce_ms / 1000,
+                                      report=lambda message: print(message, flush=True))
+        except OSError as e:
+            print(f"{args.directory}: {e}", file=sys.stderr)
+            return 1
+        if latencies:
+            latencies.sort()
+            print(f"{len(latencies)} cycles: median {latencies[len(latencies) // 2] * 1000:.1f} ms, "
+                  f"max {latencies[-1] * 1000:.1f} ms", file=sys.stderr)
+        return 0
+    if args.command == "serve":
+        if args.poll is not None and args.poll <= 0:
+            parser.error("--poll must be positive")
+        if args.public_url and "://" not in args.public_url:
+            parser.error("--public-url must be a full URL, such as http://presets.local:8780")
+        from onstep_server import serve as serve_presets
+        try:
+            server = serve_presets(args.directory, args.host, args.port, args.poll, args.public_url,
+                                   report=lambda message: print(message, flush=True))
+        except OSError as e:
+            print(f"{args.directory}: {e}", file=sys.stderr)
+            return 1
+        print(f"{server.requests} requests, {server.not_modified} not modified", file=sys.stderr)
+        return 0
+    if args.command == "diff":
+        if args.jobs is not None and args.jobs < 1:
+            parser.error("--jobs must be at least 1")
+        from onstep_diff import format_diff, summarize
+        changes, unreadable, elapsed = diff_presets(args.reference, args.targets, args.jobs)
+        for source, error in unreadable:
+            print(f"{source}: {error}", file=sys.stderr)
+        differ = 0
+        for source, found in changes.items():
+            if not found:
+                continue
+            differ += 1
+            if args.summary:
+                print(f"{source}: {len(found)} changes ({summarize(found)})")
+            else:
+                print(f"--- {args.reference}\n+++ {source}")
+                print("\n".join(format_diff(found)))
+        print(f"Compared {len(changes)} files with {args.reference} in {elapsed:.2f}s: {differ} differ, "
+              f"{len(unreadable)} unreadable", file=sys.stderr)
+        return 2 if unreadable else 1 if differ else 0
+    if args.command == "merge":
+        from onstep_diff import read_side, merge as merge_presets, format_conflicts
+        sides = []
+        for path in (args.base, args.ours, args.theirs):
+            try:
+                sides.append(read_side(path))
+            except (OSError, ValueError, AttributeError) as e:
+                print(f"{path}: {type(e).__name__}: {e}", file=sys.stderr)
+                return 2
+        result = merge_presets(*sides, prefer=args.prefer)
+        write_preset_json(args.output, result.preset, sparse=True)
+        if result.conflicts:
+            print("\n".join(format_conflicts(result.conflicts)))
+        print(f"Merged into {args.output}: {len(result.conflicts)} conflicts (kept {args.prefer})", file=sys.stderr)
+        return 1 if result.conflicts else 0
+    if args.command == "pack":
+        from onstep_delta import write_pack
+        named, failed = [], 0
+        start = time.perf_counter()
+        for path in find_preset_files(args.inputs):
+            try:
+                named.append((os.path.splitext(os.path.basename(path))[0], read_preset_file(path)))
+            except (OSError, ValueError, AttributeError) as e:
+                failed += 1
+                print(f"{path}: {type(e).__name__}: {e}", file=sys.stderr)
+        count = write_pack(args.output, named)
+        print(f"Packed {count} presets into {args.output} ({os.path.getsize(args.output):,} bytes) "
+              f"in {time.perf_counter() - start:.2f}s")
+        return 1 if failed else 0
+    if args.command == "unpack":
+        from onstep_delta import read_pack
+        start = time.perf_counter()
+        try:
+            presets = read_pack(args.pack)
+        except (OSError, ValueError) as e:
+            print(f"{args.pack}: {e}", file=sys.stderr)
+            return 1
+        os.makedirs(args.output, exist_ok=True)
+        for name, preset in presets:
+            write_preset_json(os.path.join(args.output, name + ".json"), preset, sparse=not args.full)
+        print(f"Unpacked {len(presets)} presets to {args.output} in {time.perf_counter() - start:.2f}s")
+        return 0
+    if args.command == "validate":
+        if args.jobs is not None and args.jobs < 1:
+            parser.error("--jobs must be at least 1")
+        issues, unreadable, count, elapsed = validate_presets(args.inputs, args.jobs)
+        for source, error in unreadable:
+            print(f"{source}: {error}", file=sys.stderr)
+        invalid = 0
+        for source, found in issues.items():
+            if args.no_warnings:
+                found = [issue for issue in found if issue.severity == validation.ERROR]
+            invalid += any(issue.severity == validation.ERROR for issue in found)
+            for issue in found:
+                print(f"{source}: {issue.severity}: {issue.message}")
+        print(f"Checked {count} presets in {elapsed:.2f}s: {invalid} invalid, {len(unreadable)} unreadable",
+              file=sys.stderr)
+        return 1 if invalid or unreadable else 0
+    if args.command == "import-config":
+        if args.jobs is not None and args.jobs < 1:
+            parser.error("--jobs must be at least 1")
+        from onstep_config_h import conversion_jobs, convert_config_file
+        start = time.perf_counter()
+        work, duplicates = conversion_jobs(args.inputs, args.output)
+        os.makedirs(args.output, exist_ok=True)
+        results = [(source, 0, 0, error) for source, error in duplicates]
+        results += map_jobs(convert_config_file, work, args.jobs or os.cpu_count() or 1)
+        elapsed = time.perf_counter() - start
+        failed = 0
+        for source, unknown, missing, error in results:
+            if error:
+                failed += 1
+                print(f"{source}: {error}", file=sys.stderr)
+            elif args.verbose:
+                print(f"{source}: {unknown} unknown, {missing} missing")
+        rate = len(results) / elapsed if elapsed > 0 else float("inf")
+        print(f"Converted {len(results) - failed}/{len(results)} Config.h files in {elapsed:.2f}s ({rate:.0f} files/s)")
+        return 1 if failed else 0
+    if args.command == "library":
+        criteria = {}
+        for item in args.where:
+            key, sep, value = item.partition("=")
+            if not sep or key not in schema.KEY_INDEX:
+                parser.error(f"--where expects KEY=VALUE with a known key, got {item!r}")
+            criteria[key] = value
+        from onstep_library import PresetLibrary
+        with PresetLibrary(args.directory) as presets:
+            start = time.perf_counter()
+            added, updated, removed, failed = presets.refresh()
+            indexed = time.perf_counter() - start
+            start = time.perf_counter()
+            paths = presets.search(criteria, args.name)
+            searched = time.perf_counter() - start
+            for path in paths:
+                print(path)
+            print(f"Index: {len(presets)} presets (+{added} ~{updated} -{removed}, {failed} unreadable) "
+                  f"in {indexed:.2f}s; {len(paths)} matches in {searched * 1000:.1f} ms", file=sys.stderr)
+        return 0
+    if args.command == "batch":
+        if args.jobs is not None and args.jobs < 1:
+            parser.error("--jobs must be at least 1")
+        cache_dir = args.render_cache
+        if cache_dir == "":
+            cache_dir = default_render_cache_dir()
+        count, errors, elapsed, written = batch_generate(args.inputs, args.output, args.jobs, cache_dir, args.force)
+        for source, error in errors:
+            print(f"{source}: {error}", file=sys.stderr)
+        rate = count / elapsed if elapsed > 0 else float("inf")
+        print(f"Rendered {count - len(errors)}/{count} presets in {elapsed:.2f}s ({rate:.0f} presets/s); "
+              f"{written} written, {count - len(errors) - written} already up to date")
+        return 1 if errors else 0
+
+def resource_path(relative_path):
+    """Get absolute path to resource, works for dev and PyInstaller"""
+    if hasattr(sys, '_MEIPASS'):
+        return os.path.join(sys._MEIPASS, relative_path)
+    return os.path.join(os.path.abspath("."), relative_path)
+
+def main():
+    root = tk.Tk()
+    root.iconbitmap(resource_path("telescope.ico"))
+    trace_path = trace_path_from_env()
+    instrumentation = Instrumentation(root, trace_path) if trace_path else None
+    app = OnStepConfigurator(root, instrumentation=instrumentation)
+    root.mainloop()
+    app.close_journal()
+    if instrumentation is not None:
+        instrumentation.close()
+
+if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 1:
+        sys.exit(cli())
     main()
\ No newline at end of file
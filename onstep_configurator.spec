@@ -1,39 +1,94 @@
-# -*- mode: python ; coding: utf-8 -*-
-
-
-a = Analysis(
-    ['onstep_configurator.py'],
-    pathex=[],
-    binaries=[],
-    datas=[('telescope.ico', '.')],
-    hiddenimports=[],
-    hookspath=[],
-    hooksconfig={},
-    runtime_hooks=[],
-    excludes=[],
-    noarchive=False,
-    optimize=0,
-)
-pyz = PYZ(a.pure)
-
-exe = EXE(
-    pyz,
-    a.scripts,
-    a.binaries,
-    a.datas,
-    [],
-    name='onstep_configurator',
-    debug=False,
-    bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
-    console=False,
-    disable_windowed_traceback=False,
-    argv_emulation=False,
-    target_arch=None,
-    codesign_identity=None,
-    entitlements_file=None,
-    icon=['telescope.ico'],
-)
+# -*- mode: python ; coding: utf-8 -*-
+#
+# pyinstaller onstep_configurator.spec               single .exe (unpacks to a temp folder on every launch)
+# pyinstaller onstep_configurator.spec -- --onedir   dist/onstep_configurator/ folder: no unpacking, starts fastest
+
+import argparse
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--onedir", action="store_true", help="build a folder instead of a single executable")
+options = parser.parse_args()
+
+# Never used by the app; several are dragged in by the import analysis of the stdlib.
+# NumPy is optional (fleet validation and sweeps fall back to plain Python) and the
+# largest package by far, so the window build leaves it out.
+excludes = [
+    "numpy", "unittest", "doctest", "pydoc", "pdb", "lib2to3", "xmlrpc", "pydoc_data", "curses",
+    "tkinter.test", "tkinter.tix", "idlelib", "turtle", "turtledemo", "ensurepip", "venv", "distutils",
+    "setuptools", "pip", "test", "sqlite3.test", "ftplib", "imaplib", "poplib", "smtplib", "telnetlib",
+    "nntplib", "mailbox", "bz2", "lzma", "pickletools",
+]
+
+# Tcl/Tk data the app never reads: time zones (no clock formatting), translated
+# dialog messages, Tk demos and sample images.  Prefixes for PyInstaller 5 and 6.
+_UNUSED_TK_DATA = tuple(
+    f"{root}/{folder}/"
+    for root in ("tcl", "tk", "_tcl_data", "_tk_data")
+    for folder in ("tzdata", "msgs", "demos", "images")
+)
+
+
+def keep_data(entry):
+    return not entry[0].replace("\\", "/").startswith(_UNUSED_TK_DATA)
+
+
+a = Analysis(
+    ['onstep_configurator.py'],
+    pathex=[],
+    binaries=[],
+    datas=[('telescope.ico', '.')],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=excludes,
+    noarchive=False,
+    optimize=0,
+)
+a.datas = [entry for entry in a.datas if keep_data(entry)]
+pyz = PYZ(a.pure)
+
+# UPX-packed DLLs have to be decompressed at every launch, which costs more startup
+# time than the smaller download saves.
+exe_options = dict(
+    name='onstep_configurator',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+    icon=['telescope.ico'],
+)
+
+if options.onedir:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        **exe_options,
+    )
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        strip=False,
+        upx=False,
+        name='onstep_configurator',
+    )
+else:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        a.binaries,
+        a.datas,
+        [],
+        upx_exclude=[],
+        runtime_tmpdir=None,
+        **exe_options,
+    )
@@ -0,0 +1,141 @@
+"""Sparse presets and packed preset files.
+
+A sparse (delta) preset is a JSON object that stores only the values that
+differ from a frozen default baseline (onstep_baselines):
+
+    {"format": "onstep-delta", "baseline": 1, "values": {"PINMAP": "MaxESP3", ...}}
+
+Expanding it over the baseline it names gives back every key, so loading is
+lossless even after the schema defaults move on.
+
+A pack (.ospk) holds many sparse presets in one zlib-compressed binary file:
+key names and values are each stored once in string tables and every preset
+is a list of (key index, value index) pairs.  Layout, little-endian:
+
+    b"OSPK", u8 pack version, u16 baseline, then zlib(
+        strings: keys, strings: values, u32 preset count,
+        per preset: u32 name index, u16 n, n x u16 key index, n x u32 value index)
+
+where strings is u32 count, count x u32 byte lengths, the UTF-8 bytes joined.
+"""
+import struct
+import zlib
+
+from onstep_baselines import BASELINES, CURRENT
+
+DELTA_FORMAT = "onstep-delta"
+PACK_MAGIC = b"OSPK"
+PACK_VERSION = 1
+PACK_EXTENSION = ".ospk"
+
+_HEADER = struct.Struct("<4sBH")
+_COUNT = struct.Struct("<I")
+_PRESET = struct.Struct("<IH")
+
+
+def baseline(version):
+    try:
+        return BASELINES[version]
+    except (KeyError, TypeError):
+        raise ValueError(f"unknown preset baseline {version!r}; this preset needs a newer configurator") from None
+
+
+def to_delta(preset, version=CURRENT):
+    """The sparse form of a full preset: only values that differ from the baseline"""
+    defaults = baseline(version)
+    values = {}
+    for key, value in preset.items():
+        value = str(value)
+        if defaults.get(key) != value:
+            values[key] = value
+    return {"format": DELTA_FORMAT, "baseline": version, "values": values}
+
+
+def is_delta(data):
+    return isinstance(data, dict) and data.get("format") == DELTA_FORMAT
+
+
+def from_delta(data):
+    """Expand a sparse preset into a full key/value dict"""
+    preset = dict(baseline(data.get("baseline")))
+    preset.update(data.get("values") or {})
+    return preset
+
+
+def _pack_strings(strings):
+    encoded = [s.encode("utf-8") for s in strings]
+    return b"".join([_COUNT.pack(len(encoded)), struct.pack(f"<{len(encoded)}I", *map(len, encoded))] + encoded)
+
+
+def _unpack_strings(payload, offset):
+    (count,), offset = _COUNT.unpack_from(payload, offset), offset + _COUNT.size
+    lengths = struct.unpack_from(f"<{count}I", payload, offset)
+    offset += 4 * count
+    strings = []
+    for length in lengths:
+        strings.append(payload[offset:offset + length].decode("utf-8"))
+        offset += length
+    return strings, offset
+
+
+def write_pack(file_path, named_presets, version=CURRENT):
+    """Write (name, full preset) pairs to a pack file; returns how many were written"""
+    keys, key_index = [], {}
+    strings, string_index = [], {}
+
+    def intern(table, index, text):
+        i = index.get(text)
+        if i is None:
+            i = index[text] = len(table)
+            table.append(text)
+        return i
+
+    records = []
+    for name, preset in named_presets:
+        values = to_delta(preset, version)["values"]
+        records.append(_PRESET.pack(intern(strings, string_index, name), len(values)))
+        records.append(struct.pack(f"<{len(values)}H", *(intern(keys, key_index, key) for key in values)))
+        records.append(struct.pack(f"<{len(values)}I", *(intern(strings, string_index, v) for v in values.values())))
+    count = len(records) // 3
+    payload = b"".join([_pack_strings(keys), _pack_strings(strings), _COUNT.pack(count)] + records)
+    with open(file_path, 'wb') as f:
+        f.write(_HEADER.pack(PACK_MAGIC, PACK_VERSION, version))
+        f.write(zlib.compress(payload, 6))
+    return count
+
+
+def read_pack(file_path):
+    """[(name, full preset dict)] for every preset in a pack file; ValueError if it is not a valid pack"""
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    if len(data) < _HEADER.size:
+        raise ValueError(f"{file_path} is not a preset pack")
+    magic, pack_version, version = _HEADER.unpack_from(data)
+    if magic != PACK_MAGIC:
+        raise ValueError(f"{file_path} is not a preset pack")
+    if pack_version > PACK_VERSION:
+        raise ValueError(f"{file_path} is pack version {pack_version}; this configurator reads up to {PACK_VERSION}")
+    defaults = baseline(version)
+    try:
+        payload = zlib.decompress(data[_HEADER.size:])
+    except zlib.error as e:
+        raise ValueError(f"{file_path} is damaged: {e}") from None
+    try:
+        keys, offset = _unpack_strings(payload, 0)
+        strings, offset = _unpack_strings(payload, offset)
+        (count,), offset = _COUNT.unpack_from(payload, offset), offset + _COUNT.size
+        presets = []
+        for _ in range(count):
+            name, n = _PRESET.unpack_from(payload, offset)
+            offset += _PRESET.size
+            key_ids = struct.unpack_from(f"<{n}H", payload, offset)
+            offset += 2 * n
+            value_ids = struct.unpack_from(f"<{n}I", payload, offset)
+            offset += 4 * n
+            preset = dict(defaults)
+            for k, v in zip(key_ids, value_ids):
+                preset[keys[k]] = strings[v]
+            presets.append((strings[name], preset))
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"{file_path} is damaged: {e}") from None
+    return presets
@@ -0,0 +1,136 @@
+"""Comparing and merging presets, grouped by the tab sections.
+
+Schema keys are compared as flat value lists in PARAMS order, so diffing a
+preset is one C-level equality test when nothing differs and a single pass of
+string comparisons when something does.  Keys the schema does not know (extra
+JSON keys, unsupported Config.h defines) are compared as well and reported
+under OTHER; a key missing from one side shows up as None there.
+
+A three-way merge takes every change made on one side only.  A key changed
+differently on both sides is a conflict: the merged preset keeps one side's
+value (ours unless told otherwise) and the conflict is reported.
+"""
+from collections import namedtuple
+
+import onstep_schema as schema
+from onstep_presets import read_preset_file
+
+OTHER = "Other"
+DIFF_SECTIONS = schema.SECTIONS + (OTHER,)
+CONFIG_H_EXTENSIONS = (".h",)
+
+Change = namedtuple("Change", "key section old new")
+Conflict = namedtuple("Conflict", "key section base ours theirs")
+Merge = namedtuple("Merge", "preset conflicts")
+
+_SECTION_OF = tuple(p.section for p in schema.PARAMS)
+
+
+def read_side(file_path):
+    """A preset (JSON/CSV) or a Config.h as a key/value dict; Config.h keeps its unsupported defines"""
+    if file_path.lower().endswith(CONFIG_H_EXTENSIONS):
+        from onstep_config_h import parse_config_h
+        result = parse_config_h(file_path)
+        return {**result.unknown, **result.values}
+    return read_preset_file(file_path)
+
+
+def split(preset):
+    """(value list in PARAMS order with defaults filled in, {other key: value})"""
+    index = schema.KEY_INDEX
+    return schema.values_from_dict(preset), {key: str(value) for key, value in preset.items() if key not in index}
+
+
+def changed_indices(a, b):
+    """PARAMS indices where two value lists differ"""
+    if a == b:
+        return []
+    return [i for i, (x, y) in enumerate(zip(a, b)) if x != y]
+
+
+def _other_changes(a, b):
+    if a == b:
+        return []
+    return [Change(key, OTHER, a.get(key), b.get(key))
+            for key in sorted(a.keys() | b.keys()) if a.get(key) != b.get(key)]
+
+
+def diff_split(a, b):
+    """Changes from a to b, both (values, others) pairs as returned by split"""
+    (a_values, a_other), (b_values, b_other) = a, b
+    keys = schema.KEYS
+    changes = [Change(keys[i], _SECTION_OF[i], a_values[i], b_values[i]) for i in changed_indices(a_values, b_values)]
+    changes.extend(_other_changes(a_other, b_other))
+    return changes
+
+
+def diff(a, b):
+    """Changes from preset a to preset b, schema keys in PARAMS order then other keys by name"""
+    return diff_split(split(a), split(b))
+
+
+def group_by_section(changes):
+    """{section: [changes]} in tab order, only sections with changes"""
+    groups = {section: [] for section in DIFF_SECTIONS}
+    for change in changes:
+        groups[change.section].append(change)
+    return {section: found for section, found in groups.items() if found}
+
+
+def summarize(changes):
+    """'Mount 3, Auxiliary 1'"""
+    return ", ".join(f"{section} {len(found)}" for section, found in group_by_section(changes).items())
+
+
+def _show(value):
+    return "(unset)" if value is None else value
+
+
+def format_diff(changes):
+    """Text lines for changes, grouped under [Section] headings"""
+    lines = []
+    for section, found in group_by_section(changes).items():
+        lines.append(f"[{section}]")
+        lines.extend(f"  {c.key}: {_show(c.old)} -> {_show(c.new)}" for c in found)
+    return lines
+
+
+def format_conflicts(conflicts):
+    lines = []
+    for section, found in group_by_section(conflicts).items():
+        lines.append(f"[{section}]")
+        lines.extend(f"  {c.key}: base {_show(c.base)}, ours {_show(c.ours)}, theirs {_show(c.theirs)}"
+                     for c in found)
+    return lines
+
+
+def merge(base, ours, theirs, prefer="ours"):
+    """Three-way merge of key/value presets; returns Merge(merged preset dict, [Conflict])"""
+    if prefer not in ("ours", "theirs"):
+        raise ValueError(f"prefer must be 'ours' or 'theirs', not {prefer!r}")
+    (base_values, base_other), (our_values, our_other), (their_values, their_other) = \
+        split(base), split(ours), split(theirs)
+    merged = list(our_values)
+    conflicts = []
+    keys = schema.KEYS
+    for i in changed_indices(our_values, their_values):
+        b, o, t = base_values[i], our_values[i], their_values[i]
+        if o == b:
+            merged[i] = t
+        elif t != b:
+            conflicts.append(Conflict(keys[i], _SECTION_OF[i], b, o, t))
+            if prefer == "theirs":
+                merged[i] = t
+    preset = schema.values_to_dict(merged)
+    for key in sorted(our_other.keys() | their_other.keys()):
+        b, o, t = base_other.get(key), our_other.get(key), their_other.get(key)
+        if o == t or t == b:
+            value = o
+        elif o == b:
+            value = t
+        else:
+            conflicts.append(Conflict(key, OTHER, b, o, t))
+            value = t if prefer == "theirs" else o
+        if value is not None:
+            preset[key] = value
+    return Merge(preset, conflicts)
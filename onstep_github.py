@@ -0,0 +1,235 @@
+"""GitHub preset index with an on-disk cache.
+
+Responses are cached with their ETag and revalidated with If-None-Match once
+they are older than ``ttl`` seconds, so repeated fetches cost a 304 (which does
+not count against GitHub's unauthenticated rate limit) or nothing at all.
+Entries not used for ``max_age`` seconds are evicted.  When the network is
+unreachable the cached listing and file bodies are served instead.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from onstep_paths import user_cache_dir
+from onstep_presets import PRESET_EXTENSIONS
+CHUNK_SIZE = 64 * 1024
+
+# requests response hooks added to every PresetSource session (used by onstep_trace)
+RESPONSE_HOOKS = []
+
+
+class FetchCancelled(Exception):
+    pass
+
+
+class PresetListError(ValueError):
+    """The folder listing is not a GitHub contents listing (a proxy or captive portal page, an API error object)"""
+
+
+class PresetCache:
+    """URL -> (ETag, body) store; bodies are files named by the URL's hash, metadata lives in index.json"""
+
+    def __init__(self, directory, max_age=30 * 24 * 3600):
+        self.directory = directory
+        self.max_age = max_age
+        self.index_path = os.path.join(directory, "index.json")
+        self.lock = threading.Lock()
+        self.entries = {}
+        try:
+            with open(self.index_path, 'r') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def _body_path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode()).hexdigest())
+
+    def get(self, url):
+        """Return (entry, body) or (None, None) if the URL is not cached"""
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is None:
+                return None, None
+            try:
+                with open(self._body_path(url), 'rb') as f:
+                    body = f.read()
+            except OSError:
+                del self.entries[url]
+                return None, None
+            entry["used"] = time.time()
+            return dict(entry), body
+
+    def put(self, url, body, etag):
+        now = time.time()
+        with self.lock:
+            path = self._body_path(url)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(tmp_path, 'wb') as f:
+                    f.write(body)
+                os.replace(tmp_path, path)
+            except OSError:
+                return  # an unwritable cache only costs us the next download
+            self.entries[url] = {"etag": etag, "fetched": now, "used": now}
+            self._evict(now)
+            self._save()
+
+    def touch(self, url):
+        """Mark a cached entry as freshly revalidated (after a 304)"""
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is not None:
+                entry["fetched"] = entry["used"] = time.time()
+                self._save()
+
+    def _evict(self, now):
+        for url in [url for url, entry in self.entries.items() if now - entry.get("used", 0) > self.max_age]:
+            del self.entries[url]
+            try:
+                os.remove(self._body_path(url))
+            except OSError:
+                pass
+
+    def _save(self):
+        tmp_path = f"{self.index_path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            pass
+
+
+class PresetSource:
+    """Lists and downloads presets from a GitHub repository folder through a PresetCache"""
+
+    def __init__(self, repo_owner="Mr-Royce", repo_name="onstep-configurator", folder_path="presets",
+                 branch="main", cache_dir=None, ttl=300, max_age=30 * 24 * 3600, timeout=10,
+                 api_base="https://api.github.com", raw_base="https://raw.githubusercontent.com"):
+        self.listing_url = f"{api_base}/repos/{repo_owner}/{repo_name}/contents/{folder_path}"
+        self.raw_url = f"{raw_base}/{repo_owner}/{repo_name}/{branch}/{folder_path}"
+        self.ttl = ttl
+        self.timeout = timeout
+        self.cache = PresetCache(cache_dir or user_cache_dir(), max_age)
+        self.download_urls = {}
+        self.offline = False
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.hooks["response"].extend(RESPONSE_HOOKS)
+                self._session = session
+            return self._session
+
+    def close(self):
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def get(self, url, cancel=None, check=None):
+        """Body of url, served from cache while fresh, revalidated with its ETag, or stale when offline.
+
+        cancel is an optional threading.Event; setting it aborts the download with FetchCancelled.
+        check(body) may raise PresetListError for a downloaded body that is not what url serves; it is
+        then neither cached nor returned, and the cached copy is used as when offline.
+        """
+        entry, body = self.cache.get(url)
+        if entry is not None and time.time() - entry["fetched"] < self.ttl:
+            return body
+        headers = {}
+        if entry is not None and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        self._check_cancel(cancel, url)
+        try:
+            with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+                if response.status_code == 304 and entry is not None:
+                    self.cache.touch(url)
+                    self.offline = False
+                    return body
+                response.raise_for_status()
+                content = self._read_body(response, cancel, url)
+                etag = response.headers.get("ETag")
+            if check is not None:
+                check(content)
+        except (requests.RequestException, PresetListError):
+            # Unreachable, timed out, rate limited, erroring or intercepted: fall back to the cached copy
+            if entry is None:
+                raise
+            self.offline = True
+            return body
+        self.offline = False
+        self.cache.put(url, content, etag)
+        return content
+
+    @staticmethod
+    def _check_cancel(cancel, url):
+        if cancel is not None and cancel.is_set():
+            raise FetchCancelled(url)
+
+    def _read_body(self, response, cancel, url):
+        chunks = []
+        for chunk in response.iter_content(CHUNK_SIZE):
+            self._check_cancel(cancel, url)
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    @staticmethod
+    def _parse_listing(body):
+        """The file entries of a contents listing; raises PresetListError for anything else"""
+        try:
+            files = json.loads(body)
+        except ValueError:  # includes UnicodeDecodeError
+            raise PresetListError("the preset list is not JSON (is a proxy or login page in the way?)") from None
+        if isinstance(files, dict) and "message" in files:
+            raise PresetListError(f"the preset list request failed: {files['message']}")
+        if not isinstance(files, list) or not all(isinstance(f, dict) and isinstance(f.get("name"), str)
+                                                 for f in files):
+            raise PresetListError("the preset list is not a folder listing")
+        return files
+
+    def list_presets(self, cancel=None):
+        """Names of the preset files in the repository folder"""
+        files = self._parse_listing(self.get(self.listing_url, cancel, self._parse_listing))
+        names = []
+        for f in files:
+            if f["name"].endswith(PRESET_EXTENSIONS):
+                names.append(f["name"])
+                if isinstance(f.get("download_url"), str):
+                    self.download_urls[f["name"]] = f["download_url"]
+        return names
+
+    def file_url(self, name):
+        return self.download_urls.get(name) or f"{self.raw_url}/{name}"
+
+    def fetch(self, name, cancel=None):
+        return self.get(self.file_url(name), cancel)
+
+    def fetch_all(self, names, cancel=None, max_workers=8):
+        """Download presets concurrently over the pooled session; returns ({name: body}, {name: error})"""
+        bodies, errors = {}, {}
+        if not names:
+            return bodies, errors
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(names))) as pool:
+            futures = {pool.submit(self.fetch, name, cancel): name for name in names}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    bodies[name] = future.result()
+                except requests.RequestException as e:
+                    errors[name] = e
+        return bodies, errors
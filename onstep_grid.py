@@ -0,0 +1,233 @@
+"""Virtualized property grid: a label and editor per parameter, but only as many widgets as fit on screen.
+
+The grid owns a pool of row slots, as many as fit in its height: resizing
+the window adds slots or hides the ones that no longer fit.  Scrolling never
+creates or moves widgets; it rebinds each slot to another parameter (label
+text, value, editor), so the number of widgets and the layout cost depend on
+the window size, not on how many parameters a section has.  Slots read from
+and write to the ConfigModel directly, which is the only place values live.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+import onstep_schema as schema
+
+VISIBLE_ROWS = 9  # slots before the grid is first laid out
+ROW_PADDING = 5
+
+
+class _Slot:
+    """One recycled row: a label, an Entry and a Combobox sharing one StringVar (only one editor is shown)"""
+
+    def __init__(self, grid, row, label_width):
+        self.row = row
+        self.param = None
+        self.options = None
+        self.loading = False
+        self.var = tk.StringVar(grid, value="")
+        self.label = tk.Label(grid.rows, anchor="w", width=label_width)
+        self.default_fg = self.label.cget("fg")
+        self.entry = tk.Entry(grid.rows, textvariable=self.var)
+        self.combo = ttk.Combobox(grid.rows, textvariable=self.var)
+        self.editor = None
+        self.label.grid(row=row, column=0, sticky="w", padx=ROW_PADDING, pady=ROW_PADDING)
+        self.var.trace_add("write", lambda *args: grid.on_slot_write(self))
+
+    @property
+    def widgets(self):
+        return self.label, self.entry, self.combo
+
+    def show_editor(self, param):
+        editor = self.combo if param.type == schema.CHOICE else self.entry
+        if editor is not self.editor:
+            if self.editor is not None:
+                self.editor.grid_remove()
+            editor.grid(row=self.row, column=1)
+            self.editor = editor
+        if editor is self.combo and param.options != self.options:
+            self.combo.config(values=param.options)
+            self.options = param.options
+
+    def hide(self):
+        self.label.grid_remove()
+        if self.editor is not None:
+            self.editor.grid_remove()
+
+    def show(self):
+        self.label.grid()
+        if self.editor is not None:
+            self.editor.grid()
+
+    def show_value(self, value):
+        if self.var.get() != value:
+            self.loading = True
+            try:
+                self.var.set(value)
+            finally:
+                self.loading = False
+
+
+class PropertyGrid(ttk.Frame):
+    """Editors for params (a list of schema.Param) bound to model.
+
+    Edits are written to the model with origin, so the owner can tell them from
+    other changes.  foreground(key) gives the label colour of a row (None for
+    the default); call refresh() with changed model indices and refresh_key()
+    when a colour changes.
+    """
+
+    def __init__(self, master, model, params, origin=None, foreground=None, rows=VISIBLE_ROWS):
+        super().__init__(master)
+        self.model = model
+        self.params = list(params)
+        self.indices = [schema.KEY_INDEX[param.key] for param in self.params]
+        self.positions = {param.key: n for n, param in enumerate(self.params)}
+        self.origin = origin
+        self.foreground = foreground or (lambda key: None)
+        self.top = 0
+
+        self.rows = ttk.Frame(self)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.rows.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+        self.label_width = max((len(param.label) for param in self.params), default=0) + 1
+        self.slots = []
+        self.spare = []  # hidden slots, the next one to show last
+        self.slot_of = {}
+        self.row_height = 0
+
+        # A grid-wide binding tag in front of every widget, so the wheel scrolls the grid (instead of
+        # spinning a combobox's value) and Tab can scroll rows into view.
+        tag = self.tag = f"PropertyGrid{id(self)}"
+        for widget in (self, self.rows):
+            widget.bindtags((tag,) + widget.bindtags())
+        for _ in range(min(rows, len(self.params))):
+            self.add_slot()
+        self.bind_class(tag, "<MouseWheel>", self.on_mouse_wheel)
+        self.bind_class(tag, "<Button-4>", lambda e: self.scroll(-1) or "break")
+        self.bind_class(tag, "<Button-5>", lambda e: self.scroll(1) or "break")
+        self.bind_class(tag, "<Tab>", lambda e: self.on_tab(e, 1))
+        for sequence in ("<Shift-Tab>", "<ISO_Left_Tab>"):
+            try:
+                self.bind_class(tag, sequence, lambda e: self.on_tab(e, -1))
+            except tk.TclError:  # ISO_Left_Tab is an X11 keysym only
+                pass
+        self.rows.bind("<Configure>", self.on_resize)
+        self.redraw()
+
+    def add_slot(self):
+        """Show one more row below the others, reusing a hidden slot when there is one"""
+        if self.spare:
+            slot = self.spare.pop()
+            slot.show()
+        else:
+            slot = _Slot(self, len(self.slots), self.label_width)
+            for widget in slot.widgets:
+                widget.bindtags((self.tag,) + widget.bindtags())
+            for widget in slot.widgets[1:]:
+                self.slot_of[str(widget)] = slot
+        self.slots.append(slot)
+
+    def on_resize(self, event):
+        """Keep exactly as many slots as whole rows fit in the new height"""
+        if not self.slots or event.height <= 1:  # not laid out yet
+            return
+        if not self.row_height:
+            # Laid out for the first time: from now on the grid asks for the room of its first slots
+            # only, as slots added for a taller window must not make the window taller still
+            slot = self.slots[0]
+            self.row_height = max(slot.label.winfo_reqheight() + 2 * ROW_PADDING,
+                                  slot.entry.winfo_reqheight(), slot.combo.winfo_reqheight(), 1)
+            self.rows.config(width=self.rows.winfo_reqwidth(), height=self.rows.winfo_reqheight())
+            self.rows.grid_propagate(False)
+        fit = max(1, min(len(self.params), event.height // self.row_height))
+        if fit == len(self.slots):
+            return
+        while len(self.slots) < fit:
+            self.add_slot()
+        while len(self.slots) > fit:
+            slot = self.slots.pop()
+            slot.hide()
+            self.spare.append(slot)
+        self.top = min(self.top, self.max_top)
+        self.redraw()
+
+    @property
+    def max_top(self):
+        return max(0, len(self.params) - len(self.slots))
+
+    def redraw(self):
+        """Rebind every slot to the rows from top down and update the scrollbar"""
+        for slot, n in zip(self.slots, range(self.top, self.top + len(self.slots))):
+            self.bind_slot(slot, n)
+        total = len(self.params) or 1
+        self.scrollbar.set(self.top / total, (self.top + len(self.slots)) / total)
+
+    def bind_slot(self, slot, n):
+        param = self.params[n]
+        slot.param = param
+        slot.label.config(text=param.label + ":", fg=self.foreground(param.key) or slot.default_fg)
+        slot.show_editor(param)
+        slot.show_value(self.model.values[self.indices[n]])
+
+    def refresh(self, changed):
+        """Show new values for the changed model indices that are on screen"""
+        values = self.model.values
+        for slot in self.slots:
+            i = self.indices[self.positions[slot.param.key]]
+            if i in changed:
+                slot.show_value(values[i])
+
+    def refresh_key(self, key):
+        """Recolour key's label if it is on screen"""
+        n = self.positions.get(key)
+        if n is not None and self.top <= n < self.top + len(self.slots):
+            slot = self.slots[n - self.top]
+            slot.label.config(fg=self.foreground(key) or slot.default_fg)
+
+    def on_slot_write(self, slot):
+        if not slot.loading and slot.param is not None:
+            self.model.set(slot.param.key, slot.var.get(), origin=self.origin)
+
+    def scroll_to(self, top):
+        top = min(max(0, int(top)), self.max_top)
+        if top != self.top:
+            self.top = top
+            self.redraw()
+
+    def scroll(self, rows):
+        self.scroll_to(self.top + rows)
+
+    def yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', count, 'units'|'pages')"""
+        if args[0] == "moveto":
+            self.scroll_to(round(float(args[1]) * len(self.params)))
+        elif args[0] == "scroll":
+            count = int(args[1])
+            self.scroll(count * len(self.slots) if args[2] == "pages" else count)
+
+    def see(self, key):
+        """Scroll so that key's row is on screen"""
+        n = self.positions[key]
+        if n < self.top:
+            self.scroll_to(n)
+        elif n >= self.top + len(self.slots):
+            self.scroll_to(n - len(self.slots) + 1)
+
+    def on_mouse_wheel(self, event):
+        if event.delta:
+            steps = max(1, abs(event.delta) // 120)
+            self.scroll(-steps if event.delta > 0 else steps)
+        return "break"
+
+    def on_tab(self, event, step):
+        """Move to the next/previous row, scrolling it into view; past either end, leave the grid as usual"""
+        slot = self.slot_of.get(str(event.widget))
+        if slot is None:
+            return None
+        target = self.top + slot.row + step
+        if not 0 <= target < len(self.params):
+            return None
+        self.see(self.params[target].key)
+        self.slots[target - self.top].editor.focus_set()
+        return "break"
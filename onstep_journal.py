@@ -0,0 +1,191 @@
+"""Crash recovery: an append-only journal of every change made to the model.
+
+A journal starts with a snapshot of every value; each model notification
+after it appends one line, [index, "value", ...], which is a few bytes for a
+keystroke.  Lines go straight to the file, so a crash of the app loses
+nothing.  fsync is batched (sync(), which the app calls on a timer), so a
+power cut loses at most the edits since the last sync.  Once the journal
+grows past COMPACT_RECORDS lines or COMPACT_BYTES, sync() rewrites it as a
+fresh snapshot.
+
+Replay stops at the first incomplete or unreadable line, which is where a
+write was cut off.  A journal written against another schema is not replayed,
+because its indices would point at the wrong settings.
+
+Only one running configurator journals: it keeps LOCK_NAME locked for the
+whole session.  The next session offers any journal that was left behind for
+recovery.
+"""
+import hashlib
+import json
+import os
+
+import onstep_schema as schema
+from onstep_paths import user_data_dir
+
+JOURNAL_NAME = "session.journal"
+LOCK_NAME = "session.lock"
+FORMAT_VERSION = 1
+COMPACT_RECORDS = 1000
+COMPACT_BYTES = 256 * 1024
+
+SCHEMA_DIGEST = hashlib.sha256("\0".join(schema.KEYS).encode()).hexdigest()[:16]
+
+
+def _try_lock(fd):
+    """Lock fd for this process without waiting; False when another process holds it"""
+    try:
+        import fcntl
+    except ImportError:  # Windows
+        import msvcrt
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def _sync_directory(directory):
+    """Make a rename in directory durable (POSIX; Windows has no directory handles to sync)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def replay(path):
+    """(value list in PARAMS order, edits replayed) from a journal file, or None when it holds nothing usable"""
+    try:
+        with open(path, 'rb') as f:
+            lines = f.read().split(b"\n")
+    except OSError:
+        return None
+    try:
+        header = json.loads(lines[0])
+        if header.get("journal") != FORMAT_VERSION or header.get("schema") != SCHEMA_DIGEST:
+            return None
+        values = list(header["values"])
+    except (ValueError, AttributeError, KeyError, TypeError):
+        return None
+    size = len(values)
+    if size != len(schema.KEYS):
+        return None
+    edits = 0
+    for line in lines[1:-1]:  # the last piece is empty, or a line that was cut off
+        try:
+            record = json.loads(line)
+        except ValueError:
+            break
+        if not isinstance(record, list) or len(record) % 2:
+            break
+        pairs = list(zip(record[::2], record[1::2]))
+        if not all(type(i) is int and 0 <= i < size and type(value) is str for i, value in pairs):
+            break
+        for i, value in pairs:
+            values[i] = value
+        edits += 1
+    return values, edits
+
+
+class Journal:
+    def __init__(self, directory):
+        self.directory = directory
+        self.path = os.path.join(directory, JOURNAL_NAME)
+        self.values = None
+        self.fd = None
+        self.lock_fd = None
+        self.records = 0
+        self.size = 0
+        self.dirty = False
+
+    @classmethod
+    def open(cls, directory=None):
+        """Take the journal folder (default: the user data folder); None when another configurator has it"""
+        journal = cls(directory or user_data_dir())
+        try:
+            os.makedirs(journal.directory, exist_ok=True)
+            journal.lock_fd = os.open(os.path.join(journal.directory, LOCK_NAME), os.O_RDWR | os.O_CREAT, 0o600)
+        except OSError:
+            return None
+        if not _try_lock(journal.lock_fd):
+            os.close(journal.lock_fd)
+            return None
+        return journal
+
+    def recover(self):
+        """What the last session left behind, as replay() returns it"""
+        return replay(self.path)
+
+    def start(self, values):
+        """Begin a new journal at values, replacing the old one"""
+        self.values = list(values)
+        self._write_snapshot(durable=False)
+        self.dirty = True  # made durable by the first sync rather than slowing down startup
+
+    def _write_snapshot(self, durable):
+        data = json.dumps({"journal": FORMAT_VERSION, "schema": SCHEMA_DIGEST, "values": self.values},
+                          ensure_ascii=False, separators=(",", ":")).encode() + b"\n"
+        temporary = self.path + ".tmp"
+        with open(temporary, 'wb') as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+        os.replace(temporary, self.path)  # atomic: a crash leaves the old journal or the new one
+        if durable:
+            _sync_directory(self.directory)
+        self.fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | getattr(os, "O_BINARY", 0))
+        self.records = 0
+        self.size = len(data)
+
+    def append(self, changes):
+        """Record one change, {index: value}; it reaches the disk for certain at the next sync()"""
+        record = []
+        for i, value in changes.items():
+            self.values[i] = value
+            record.append(i)
+            record.append(value)
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode() + b"\n"
+        os.write(self.fd, line)
+        self.records += 1
+        self.size += len(line)
+        self.dirty = True
+
+    def sync(self):
+        """fsync the edits made since the last sync, compacting a grown journal; returns False if there were none"""
+        if not self.dirty:
+            return False
+        if self.records >= COMPACT_RECORDS or self.size >= COMPACT_BYTES:
+            self._write_snapshot(durable=True)
+        else:
+            os.fsync(self.fd)
+        self.dirty = False
+        return True
+
+    def close(self, discard=True):
+        """End the session; discard deletes the journal, as after a normal exit"""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+        if discard:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        if self.lock_fd is not None:
+            os.close(self.lock_fd)  # releases the lock
+            self.lock_fd = None
@@ -0,0 +1,156 @@
+"""Local preset library backed by a persistent SQLite index.
+
+Every preset under the library directory becomes one row of the ``presets``
+table with a column per schema key (missing keys hold their default), so a
+query such as "SKR_PRO boards with a TMC2209 on axis 1" is a single indexed
+SELECT and never opens a JSON file.  refresh() keeps the index current: files
+whose size and mtime are unchanged are skipped, and files that were touched
+but hash the same are not re-parsed.
+"""
+import hashlib
+import os
+import sqlite3
+
+import onstep_schema as schema
+from onstep_presets import PRESET_EXTENSIONS, parse_preset
+
+INDEX_NAME = ".onstep_index.sqlite"
+
+# Columns that get their own SQLite index; any other key can still be queried
+INDEXED_KEYS = (
+    "PINMAP", "MOUNT_TYPE", "AXIS1_DRIVER_MODEL", "AXIS2_DRIVER_MODEL", "AXIS3_DRIVER_MODEL",
+    "AXIS4_DRIVER_MODEL", "TIME_LOCATION_SOURCE", "WEATHER", "SERIAL_RADIO",
+)
+
+
+def _quote(key):
+    return '"' + key.replace('"', '""') + '"'
+
+
+class PresetLibrary:
+    def __init__(self, directory, index_path=None):
+        self.directory = os.path.abspath(directory)
+        self.index_path = index_path or os.path.join(self.directory, INDEX_NAME)
+        self.db = sqlite3.connect(self.index_path)
+        self._create_tables()
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _create_tables(self):
+        db = self.db
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("""CREATE TABLE IF NOT EXISTS presets (
+            path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, sha1 TEXT)""")
+        existing = {row[1] for row in db.execute("PRAGMA table_info(presets)")}
+        for key in schema.KEYS:
+            if key not in existing:
+                # New schema keys: old rows get the default until they are re-indexed
+                default = schema.DEFAULTS[schema.KEY_INDEX[key]].replace("'", "''")
+                db.execute(f"ALTER TABLE presets ADD COLUMN {_quote(key)} TEXT DEFAULT '{default}'")
+        for key in INDEXED_KEYS:
+            db.execute(f"CREATE INDEX IF NOT EXISTS {_quote('by_' + key)} ON presets ({_quote(key)})")
+        db.commit()
+        columns = ", ".join(_quote(key) for key in schema.KEYS)
+        placeholders = ", ".join("?" * (len(schema.KEYS) + 4))
+        self._insert_sql = f"INSERT OR REPLACE INTO presets (path, mtime_ns, size, sha1, {columns}) VALUES ({placeholders})"
+
+    def _scan(self):
+        """Yield (relative path, stat) for every preset file under the library directory"""
+        stack = [self.directory]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith("."):
+                            stack.append(entry.path)
+                    elif entry.name.endswith(PRESET_EXTENSIONS):
+                        yield os.path.relpath(entry.path, self.directory), entry.stat()
+
+    def refresh(self):
+        """Bring the index up to date with the directory; returns (added, updated, removed, failed) counts.
+
+        A file that can no longer be read or parsed is failed and leaves the index until it can.
+        """
+        db = self.db
+        known = {path: (mtime_ns, size, sha1)
+                 for path, mtime_ns, size, sha1 in db.execute("SELECT path, mtime_ns, size, sha1 FROM presets")}
+        rows, touched, broken, failed = [], [], [], 0
+        added = updated = 0
+        seen = set()
+        for path, st in self._scan():
+            seen.add(path)
+            old = known.get(path)
+            if old is not None and old[0] == st.st_mtime_ns and old[1] == st.st_size:
+                continue
+            try:
+                with open(os.path.join(self.directory, path), 'rb') as f:
+                    content = f.read()
+                sha1 = hashlib.sha1(content).hexdigest()
+                if old is not None and old[2] == sha1:
+                    touched.append((st.st_mtime_ns, st.st_size, path))
+                    continue
+                values = schema.values_from_dict(parse_preset(path, content))
+            except (OSError, ValueError, AttributeError):
+                failed += 1
+                if old is not None:
+                    broken.append((path,))  # its indexed values no longer describe the file
+                continue
+            rows.append([path, st.st_mtime_ns, st.st_size, sha1] + values)
+            if old is None:
+                added += 1
+            else:
+                updated += 1
+        removed = [(path,) for path in known if path not in seen]
+        with db:
+            db.executemany(self._insert_sql, rows)
+            db.executemany("UPDATE presets SET mtime_ns = ?, size = ? WHERE path = ?", touched)
+            db.executemany("DELETE FROM presets WHERE path = ?", removed + broken)
+        return added, updated, len(removed), failed
+
+    def search(self, criteria=None, name=None, limit=None):
+        """Paths (relative to the library) whose values equal every key=value in criteria.
+
+        name, if given, is a case-insensitive substring match on the path.
+        """
+        clauses, params = [], []
+        for key, value in (criteria or {}).items():
+            if key not in schema.KEY_INDEX:
+                raise KeyError(key)
+            clauses.append(f"{_quote(key)} = ?")
+            params.append(str(value))
+        if name:
+            clauses.append("path LIKE ? ESCAPE '\\'")
+            escaped = name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        sql = "SELECT path FROM presets"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY path"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return [row[0] for row in self.db.execute(sql, params)]
+
+    def distinct_values(self, key):
+        """Every value of key present in the library, for search drop-downs"""
+        if key not in schema.KEY_INDEX:
+            raise KeyError(key)
+        return [row[0] for row in self.db.execute(
+            f"SELECT DISTINCT {_quote(key)} FROM presets ORDER BY 1")]
+
+    def values(self, path):
+        """Indexed values of one preset as a dict, without reading the file"""
+        columns = ", ".join(_quote(key) for key in schema.KEYS)
+        row = self.db.execute(f"SELECT {columns} FROM presets WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            raise KeyError(path)
+        return schema.values_to_dict(row)
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM presets").fetchone()[0]
@@ -0,0 +1,108 @@
+"""Plain-Python configuration model, the source of truth for every parameter value.
+
+Values are kept in a flat list in schema.PARAMS order.  Tk widgets bind to the
+model (see OnStepConfigurator) instead of the model living inside StringVars, so
+bulk operations such as loading a preset never touch the Tcl interpreter.
+"""
+from contextlib import contextmanager
+
+import onstep_schema as schema
+
+
+class ConfigModel:
+    __slots__ = ("values", "_listeners", "_batch_depth", "_batch_changed", "_batch_origin")
+
+    def __init__(self, values=None):
+        self.values = list(schema.DEFAULTS if values is None else values)
+        self._listeners = []
+        self._batch_depth = 0
+        self._batch_changed = set()
+        self._batch_origin = None
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, key):
+        return self.values[schema.KEY_INDEX[key]]
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def get(self, key, default=None):
+        i = schema.KEY_INDEX.get(key)
+        return default if i is None else self.values[i]
+
+    def subscribe(self, callback):
+        """Call callback(changed_indices, origin) after every change (once per batch)"""
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        self._listeners.remove(callback)
+
+    def _notify(self, changed, origin):
+        for callback in list(self._listeners):
+            callback(changed, origin)
+
+    def _changed(self, changed, origin):
+        if not changed:
+            return
+        if self._batch_depth:
+            self._batch_changed |= changed
+            if self._batch_origin is None:
+                self._batch_origin = origin
+        else:
+            self._notify(changed, origin)
+
+    @contextmanager
+    def batch(self, origin=None):
+        """Group several changes into a single notification"""
+        self._batch_depth += 1
+        if origin is not None and self._batch_origin is None:
+            self._batch_origin = origin
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                changed, self._batch_changed = self._batch_changed, set()
+                origin, self._batch_origin = self._batch_origin, None
+                if changed:
+                    self._notify(changed, origin)
+
+    def set(self, key, value, origin=None):
+        i = schema.KEY_INDEX[key]
+        value = str(value)
+        if self.values[i] != value:
+            self.values[i] = value
+            self._changed({i}, origin)
+
+    def update(self, preset, origin=None):
+        """Apply a key/value mapping in one batch; unknown keys are ignored. Returns the changed indices."""
+        values = self.values
+        index = schema.KEY_INDEX
+        changed = set()
+        for key, value in preset.items():
+            i = index.get(key)
+            if i is not None:
+                value = str(value)
+                if values[i] != value:
+                    values[i] = value
+                    changed.add(i)
+        self._changed(changed, origin)
+        return changed
+
+    def replace(self, values, origin=None):
+        """Replace every value at once from a list in PARAMS order"""
+        changed = {i for i, (old, new) in enumerate(zip(self.values, values)) if old != new}
+        self.values = list(values)
+        self._changed(changed, origin)
+        return changed
+
+    def reset(self, origin=None):
+        return self.replace(schema.DEFAULTS, origin)
+
+    def to_dict(self):
+        return schema.values_to_dict(self.values)
+
+    def render(self):
+        return schema.render(self.values)
@@ -0,0 +1,19 @@
+"""Per-user folders, kept free of heavy imports so any module (or worker process) can use them."""
+import os
+
+
+def user_cache_dir():
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "OnStepConfigurator", "cache")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "onstep_configurator")
+
+
+def user_data_dir():
+    """Per-user folder for files that must outlive a cache clean-up"""
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "OnStepConfigurator", "data")
+    base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "onstep_configurator")
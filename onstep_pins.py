@@ -0,0 +1,183 @@
+"""Pins each PINMAP already uses, indexed by pin for checking the auxiliary feature pins against them.
+
+Every board is described the way its OnStepX pinmap header is: firmware pin
+names (AXIS1_STEP_PIN, AUX8_PIN, ...) mapped to a pin number, or to another
+name the firmware aliases it to.  PIN_USES says what each name is for and the
+settings that switch it on.  At import this is turned into one index per
+pinmap, {pin: (Use, ...)}, so checking a feature pin is a single dict lookup
+whatever the board.
+
+FEATUREn_PIN is OFF, AUX (the board's AUXn_PIN), or a pin number or name;
+FEATUREn_TEMP is OFF or a 1-Wire sensor (DS1820 or a sensor address) on the
+board's ONE_WIRE_PIN.  The checks themselves are in onstep_validate.
+"""
+from collections import namedtuple
+
+import onstep_schema as schema
+
+FEATURES = tuple(range(1, 9))
+OFF = "OFF"
+AUX = "AUX"
+
+Use = namedtuple("Use", "name description condition")  # condition: keys of which one must be on, () for always
+
+# Firmware pin name -> (what it is used for, settings that switch it on; empty when always used)
+PIN_USES = {
+    "AXIS1_STEP_PIN": ("Axis1 step", ()),
+    "AXIS1_DIR_PIN": ("Axis1 direction", ()),
+    "AXIS1_ENABLE_PIN": ("Axis1 enable", ()),
+    "AXIS2_STEP_PIN": ("Axis2 step", ()),
+    "AXIS2_DIR_PIN": ("Axis2 direction", ()),
+    "AXIS2_ENABLE_PIN": ("Axis2 enable", ()),
+    "AXIS3_STEP_PIN": ("Axis3 (rotator) step", ("AXIS3_DRIVER_MODEL",)),
+    "AXIS3_DIR_PIN": ("Axis3 (rotator) direction", ("AXIS3_DRIVER_MODEL",)),
+    "AXIS4_STEP_PIN": ("Axis4 (focuser) step", ("AXIS4_DRIVER_MODEL",)),
+    "AXIS4_DIR_PIN": ("Axis4 (focuser) direction", ("AXIS4_DRIVER_MODEL",)),
+    "SERIAL_B_RX": ("Serial B RX", ("SERIAL_B_BAUD_DEFAULT",)),
+    "SERIAL_B_TX": ("Serial B TX", ("SERIAL_B_BAUD_DEFAULT",)),
+    "SERIAL_C_RX": ("Serial C RX", ("SERIAL_C_BAUD_DEFAULT",)),
+    "SERIAL_C_TX": ("Serial C TX", ("SERIAL_C_BAUD_DEFAULT",)),
+    "I2C_SDA_PIN": ("I2C SDA", ("WEATHER", "TIME_LOCATION_SOURCE")),
+    "I2C_SCL_PIN": ("I2C SCL", ("WEATHER", "TIME_LOCATION_SOURCE")),
+    "STATUS_LED_PIN": ("status LED", ("STATUS_LED",)),
+    "MOUNT_LED_PIN": ("mount status LED", ("STATUS_MOUNT_LED",)),
+    "RETICLE_LED_PIN": ("reticle LED", ("RETICLE_LED_DEFAULT",)),
+    "STATUS_BUZZER_PIN": ("buzzer", ("STATUS_BUZZER",)),
+    "LIMIT_SENSE_PIN": ("limit sense", ("LIMIT_SENSE",)),
+    "PPS_SENSE_PIN": ("PPS sense", ("TIME_LOCATION_PPS_SENSE",)),
+    "PEC_SENSE_PIN": ("PEC sense", ("PEC_SENSE",)),
+    "ONE_WIRE_PIN": ("1-Wire bus", tuple(f"FEATURE{i}_TEMP" for i in FEATURES)),
+}
+# Values that leave a setting's pins unused, besides OFF
+INACTIVE = {"TIME_LOCATION_SOURCE": (OFF, "GPS", "NTP", "TEENSY")}  # only the RTC chips are on I2C
+
+# Board pin names, from each board's pinmap header; a value naming another pin is an alias of it
+PINMAPS = {
+    "BTT_SKR_PRO": {
+        "AXIS1_STEP_PIN": "PE9", "AXIS1_DIR_PIN": "PF1", "AXIS1_ENABLE_PIN": "PF2",
+        "AXIS2_STEP_PIN": "PE11", "AXIS2_DIR_PIN": "PE8", "AXIS2_ENABLE_PIN": "PD7",
+        "AXIS3_STEP_PIN": "PE13", "AXIS3_DIR_PIN": "PC2",
+        "AXIS4_STEP_PIN": "PE14", "AXIS4_DIR_PIN": "PA0",
+        "SERIAL_B_RX": "PD9", "SERIAL_B_TX": "PD8", "SERIAL_C_RX": "PA10", "SERIAL_C_TX": "PA9",
+        "I2C_SDA_PIN": "PB7", "I2C_SCL_PIN": "PB6",
+        "AUX3_PIN": "PB1", "AUX4_PIN": "PD14", "AUX5_PIN": "PB0", "AUX6_PIN": "PD12",
+        "AUX7_PIN": "PE15", "AUX8_PIN": "PA8",
+        "ONE_WIRE_PIN": "PE5", "STATUS_LED_PIN": "PA7", "MOUNT_LED_PIN": "PA7", "RETICLE_LED_PIN": "PA7",
+        "STATUS_BUZZER_PIN": "PC9", "LIMIT_SENSE_PIN": "AUX7_PIN", "PPS_SENSE_PIN": "PE12", "PEC_SENSE_PIN": "PG8",
+    },
+    "MiniPCB": {
+        "AXIS1_STEP_PIN": "12", "AXIS1_DIR_PIN": "10", "AXIS1_ENABLE_PIN": "16",
+        "AXIS2_STEP_PIN": "6", "AXIS2_DIR_PIN": "4", "AXIS2_ENABLE_PIN": "16",
+        "AXIS3_STEP_PIN": "30", "AXIS3_DIR_PIN": "33",
+        "AXIS4_STEP_PIN": "30", "AXIS4_DIR_PIN": "33",
+        "SERIAL_B_RX": "0", "SERIAL_B_TX": "1",
+        "I2C_SDA_PIN": "18", "I2C_SCL_PIN": "19",
+        "AUX3_PIN": "21", "AUX4_PIN": "24",
+        "ONE_WIRE_PIN": "AUX4_PIN", "STATUS_LED_PIN": "22", "MOUNT_LED_PIN": "22", "RETICLE_LED_PIN": "22",
+        "STATUS_BUZZER_PIN": "29", "LIMIT_SENSE_PIN": "2", "PPS_SENSE_PIN": "28", "PEC_SENSE_PIN": "23",
+    },
+    "MiniPCB2": {
+        "AXIS1_STEP_PIN": "20", "AXIS1_DIR_PIN": "21", "AXIS1_ENABLE_PIN": "14",
+        "AXIS2_STEP_PIN": "3", "AXIS2_DIR_PIN": "2", "AXIS2_ENABLE_PIN": "14",
+        "AXIS3_STEP_PIN": "30", "AXIS3_DIR_PIN": "33",
+        "AXIS4_STEP_PIN": "30", "AXIS4_DIR_PIN": "33",
+        "SERIAL_B_RX": "7", "SERIAL_B_TX": "8",
+        "I2C_SDA_PIN": "18", "I2C_SCL_PIN": "19",
+        "AUX3_PIN": "9", "AUX4_PIN": "24",
+        "ONE_WIRE_PIN": "AUX4_PIN", "STATUS_LED_PIN": "22", "MOUNT_LED_PIN": "22", "RETICLE_LED_PIN": "22",
+        "STATUS_BUZZER_PIN": "29", "LIMIT_SENSE_PIN": "4", "PPS_SENSE_PIN": "28", "PEC_SENSE_PIN": "23",
+    },
+    "MaxPCB2": {
+        "AXIS1_STEP_PIN": "22", "AXIS1_DIR_PIN": "21", "AXIS1_ENABLE_PIN": "14",
+        "AXIS2_STEP_PIN": "5", "AXIS2_DIR_PIN": "2", "AXIS2_ENABLE_PIN": "9",
+        "AXIS3_STEP_PIN": "30", "AXIS3_DIR_PIN": "33",
+        "AXIS4_STEP_PIN": "30", "AXIS4_DIR_PIN": "33",
+        "SERIAL_B_RX": "7", "SERIAL_B_TX": "8", "SERIAL_C_RX": "0", "SERIAL_C_TX": "1",
+        "I2C_SDA_PIN": "18", "I2C_SCL_PIN": "19",
+        "AUX3_PIN": "4", "AUX4_PIN": "23", "AUX5_PIN": "29", "AUX6_PIN": "25", "AUX7_PIN": "26", "AUX8_PIN": "24",
+        "ONE_WIRE_PIN": "AUX8_PIN", "STATUS_LED_PIN": "AUX8_PIN", "MOUNT_LED_PIN": "AUX8_PIN",
+        "RETICLE_LED_PIN": "AUX8_PIN", "STATUS_BUZZER_PIN": "AUX8_PIN",
+        "LIMIT_SENSE_PIN": "AUX7_PIN", "PPS_SENSE_PIN": "AUX6_PIN", "PEC_SENSE_PIN": "AUX5_PIN",
+    },
+    "MaxESP3": {
+        "AXIS1_STEP_PIN": "27", "AXIS1_DIR_PIN": "26", "AXIS1_ENABLE_PIN": "12",
+        "AXIS2_STEP_PIN": "4", "AXIS2_DIR_PIN": "2", "AXIS2_ENABLE_PIN": "12",
+        "AXIS3_STEP_PIN": "19", "AXIS3_DIR_PIN": "0",
+        "AXIS4_STEP_PIN": "19", "AXIS4_DIR_PIN": "0",
+        "SERIAL_B_RX": "16", "SERIAL_B_TX": "17",
+        "AUX2_PIN": "18", "AUX3_PIN": "21", "AUX4_PIN": "22", "AUX7_PIN": "39", "AUX8_PIN": "25",
+        "I2C_SDA_PIN": "AUX3_PIN", "I2C_SCL_PIN": "AUX4_PIN",
+        "ONE_WIRE_PIN": "AUX8_PIN", "STATUS_LED_PIN": "AUX8_PIN", "MOUNT_LED_PIN": "AUX8_PIN",
+        "RETICLE_LED_PIN": "AUX8_PIN", "STATUS_BUZZER_PIN": "AUX8_PIN",
+        "LIMIT_SENSE_PIN": "AUX7_PIN", "PPS_SENSE_PIN": "AUX7_PIN", "PEC_SENSE_PIN": "36",
+    },
+    "CNC3": {
+        "AXIS1_STEP_PIN": "26", "AXIS1_DIR_PIN": "16", "AXIS1_ENABLE_PIN": "12",
+        "AXIS2_STEP_PIN": "25", "AXIS2_DIR_PIN": "27", "AXIS2_ENABLE_PIN": "12",
+        "AXIS3_STEP_PIN": "17", "AXIS3_DIR_PIN": "14",
+        "AXIS4_STEP_PIN": "19", "AXIS4_DIR_PIN": "18",
+        "AUX2_PIN": "13", "AUX3_PIN": "32", "AUX4_PIN": "33", "AUX5_PIN": "5", "AUX6_PIN": "23",
+        "AUX7_PIN": "39", "AUX8_PIN": "2",
+        "I2C_SDA_PIN": "21", "I2C_SCL_PIN": "22",
+        "ONE_WIRE_PIN": "AUX4_PIN", "STATUS_LED_PIN": "AUX8_PIN", "MOUNT_LED_PIN": "AUX8_PIN",
+        "RETICLE_LED_PIN": "AUX8_PIN", "STATUS_BUZZER_PIN": "AUX8_PIN",
+        "LIMIT_SENSE_PIN": "AUX7_PIN", "PPS_SENSE_PIN": "AUX3_PIN", "PEC_SENSE_PIN": "36",
+    },
+    "STM32Blue": {
+        "AXIS1_STEP_PIN": "PB13", "AXIS1_DIR_PIN": "PB12", "AXIS1_ENABLE_PIN": "PA12",
+        "AXIS2_STEP_PIN": "PA5", "AXIS2_DIR_PIN": "PA4", "AXIS2_ENABLE_PIN": "PA12",
+        "AXIS3_STEP_PIN": "PB1", "AXIS3_DIR_PIN": "PB0",
+        "AXIS4_STEP_PIN": "PB1", "AXIS4_DIR_PIN": "PB0",
+        "SERIAL_B_RX": "PA3", "SERIAL_B_TX": "PA2", "SERIAL_C_RX": "PB11", "SERIAL_C_TX": "PB10",
+        "I2C_SDA_PIN": "PB7", "I2C_SCL_PIN": "PB6",
+        "AUX3_PIN": "PB3", "AUX4_PIN": "PA15",
+        "ONE_WIRE_PIN": "AUX4_PIN", "STATUS_LED_PIN": "PC13", "MOUNT_LED_PIN": "PC13", "RETICLE_LED_PIN": "PC13",
+        "STATUS_BUZZER_PIN": "PB8", "LIMIT_SENSE_PIN": "PA1", "PPS_SENSE_PIN": "PB5", "PEC_SENSE_PIN": "PA0",
+    },
+}
+
+
+def normalize_pin(text):
+    """'25', '025' and ' 25' are one pin; 'pe9' is PE9"""
+    text = text.strip().upper()
+    return str(int(text)) if text.isdigit() else text
+
+
+def _resolve(names, name):
+    pin = names[name]
+    while pin in names:  # AUX8_PIN -> 25
+        pin = names[pin]
+    return normalize_pin(pin)
+
+
+def _build_index(names):
+    index = {}
+    for name in names:
+        if name in PIN_USES:
+            description, condition = PIN_USES[name]
+            index.setdefault(_resolve(names, name), []).append(Use(name, description, condition))
+    return {pin: tuple(uses) for pin, uses in index.items()}
+
+
+PIN_INDEX = {pinmap: _build_index(names) for pinmap, names in PINMAPS.items()}  # pinmap -> {pin: (Use, ...)}
+AUX_PINS = {pinmap: {i: _resolve(names, f"AUX{i}_PIN") for i in FEATURES if f"AUX{i}_PIN" in names}
+            for pinmap, names in PINMAPS.items()}
+ONE_WIRE_PINS = {pinmap: _resolve(names, "ONE_WIRE_PIN") for pinmap, names in PINMAPS.items()
+                 if "ONE_WIRE_PIN" in names}
+
+_I = schema.KEY_INDEX
+FEATURE_KEYS = tuple(f"FEATURE{i}_{field}" for i in FEATURES for field in ("PURPOSE", "PIN", "TEMP"))
+# Settings the checks only ask "on or off?" about
+SWITCH_KEYS = tuple(sorted({key for _, condition in PIN_USES.values() for key in condition} - set(FEATURE_KEYS)))
+KEYS = ("PINMAP",) + FEATURE_KEYS + SWITCH_KEYS  # every key the checks read
+
+
+def setting_on(values, key):
+    return values[_I[key]] not in INACTIVE.get(key, (OFF,))
+
+
+def switched_on(values, condition):
+    """The first key of condition that is on in values, True for an unconditional use, or None"""
+    if not condition:
+        return True
+    return next((key for key in condition if setting_on(values, key)), None)
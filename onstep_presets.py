@@ -0,0 +1,58 @@
+"""Reading preset files (JSON or single-preset CSV) without any Tk dependency."""
+import glob
+import io
+import json
+import os
+
+from onstep_delta import is_delta, from_delta, to_delta
+
+PRESET_EXTENSIONS = (".json", ".csv")
+
+
+def parse_preset(name, content):
+    """Parse JSON or CSV preset text (or bytes) into a plain dict; CSV keeps the last row, like import_csv.
+
+    Sparse JSON presets are expanded over their baseline, so callers always get every key.
+    """
+    if isinstance(content, bytes):
+        content = content.decode("utf-8-sig")
+    if name.endswith(".csv"):
+        import csv  # only CSV presets pay for it at startup
+        preset = {}
+        for row in csv.DictReader(io.StringIO(content, newline='')):
+            preset = row
+        return preset
+    data = json.loads(content)
+    return from_delta(data) if is_delta(data) else data
+
+
+def read_preset_file(file_path):
+    with open(file_path, 'rb') as f:
+        return parse_preset(file_path, f.read())
+
+
+def write_preset_json(file_path, preset, sparse=False):
+    """Write a preset as JSON; sparse stores only the values that differ from the default baseline"""
+    with open(file_path, 'w') as f:
+        json.dump(to_delta(preset) if sparse else preset, f)
+
+
+def write_preset_csv(file_path, preset):
+    """Write one preset as a single-row CSV with a header of its keys"""
+    import csv
+    with open(file_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=preset.keys())
+        writer.writeheader()
+        writer.writerow(preset)
+
+
+def find_preset_files(inputs):
+    """Expand directories and glob patterns into a sorted list of preset files"""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            candidates = [os.path.join(item, name) for name in os.listdir(item)]
+        else:
+            candidates = glob.glob(item)
+        paths.extend(sorted(p for p in candidates if p.endswith(PRESET_EXTENSIONS) and os.path.isfile(p)))
+    return paths
@@ -0,0 +1,131 @@
+"""Content-addressed cache of rendered Config.h files.
+
+A preset's key is a hash of its full value list (defaults filled in, so a
+sparse and a full file of the same preset share a key) and of the generator:
+FileVersionConfig and the Config.h template itself.  Changing either gives
+every preset a new key, so stale output is never served.
+
+Rendered files are kept in memory (least recently used dropped beyond
+memory_bytes) and, when the cache has a folder, on disk as one
+zlib-compressed file per key (about a sixth of the Config.h size); prune()
+deletes the least recently used files once the folder is over max_bytes.
+Rendering takes tens of microseconds, so the disk layer pays off when the same
+presets are rendered into many output folders, not on a first build.
+"""
+import hashlib
+import json
+import os
+import zlib
+from collections import OrderedDict
+
+import onstep_schema as schema
+
+MEMORY_BYTES = 16 * 1024 * 1024
+DISK_BYTES = 256 * 1024 * 1024
+
+GENERATOR_DIGEST = hashlib.sha256(f"{schema.FILE_VERSION_CONFIG}\0{schema.TEMPLATE}".encode()).digest()
+
+
+def render_key(values):
+    """Hex key of a flat value list in PARAMS order"""
+    digest = hashlib.sha256(GENERATOR_DIGEST)
+    digest.update(json.dumps(values, ensure_ascii=False, separators=(",", ":")).encode())
+    return digest.hexdigest()
+
+
+class RenderCache:
+    def __init__(self, directory=None, max_bytes=DISK_BYTES, memory_bytes=MEMORY_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory_bytes = memory_bytes
+        self.memory = OrderedDict()
+        self.memory_size = 0
+        self.shards = set()  # subfolders known to exist
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key[2:] + ".z")
+
+    def _remember(self, key, text):
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return
+        self.memory[key] = text
+        self.memory_size += len(text)
+        while self.memory_size > self.memory_bytes and len(self.memory) > 1:
+            _, dropped = self.memory.popitem(last=False)
+            self.memory_size -= len(dropped)
+
+    def get(self, key):
+        """Rendered text for key, or None when it is not cached"""
+        text = self.memory.get(key)
+        if text is not None:
+            self.memory.move_to_end(key)
+            return text
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                text = zlib.decompress(f.read()).decode('utf-8')
+            os.utime(path)  # the modification time is the disk LRU order
+        except (OSError, zlib.error, UnicodeDecodeError):
+            return None
+        self._remember(key, text)
+        return text
+
+    def put(self, key, text):
+        self._remember(key, text)
+        if self.directory is None:
+            return
+        path = self._path(key)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        try:
+            shard = os.path.dirname(path)
+            if shard not in self.shards:
+                os.makedirs(shard, exist_ok=True)
+                self.shards.add(shard)
+            with open(temporary, 'wb') as f:
+                f.write(zlib.compress(text.encode('utf-8'), 1))
+            os.replace(temporary, path)  # atomic, so parallel workers never see a partial file
+        except OSError:
+            pass  # a cache that cannot be written is only slower
+
+    def render(self, values):
+        """(key, Config.h text) for a flat value list, rendered only on a cache miss"""
+        key = render_key(values)
+        text = self.get(key)
+        if text is None:
+            text = schema.render(values)
+            self.put(key, text)
+        return key, text
+
+    def prune(self):
+        """Delete the least recently used files until the folder fits in max_bytes; returns how many were deleted"""
+        files, total = [], 0
+        if self.directory is None:
+            return 0
+        try:
+            shards = list(os.scandir(self.directory))
+        except OSError:
+            return 0
+        for shard in shards:
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                total += stat.st_size
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,270 @@
+"""Declarative description of every OnStepX define the configurator knows about.
+
+Each parameter is described once here (key, tab section, widget type, allowed
+values, default and the column its value is aligned to in Config.h).  The GUI
+tabs, preset save/load and the Config.h renderer are all driven from PARAMS.
+"""
+from collections import namedtuple
+
+CHOICE = "choice"   # ttk.Combobox with a fixed list of values
+ENTRY = "entry"     # free-form tk.Entry, emitted as-is
+STRING = "string"   # free-form tk.Entry, emitted as a quoted C string
+
+ON_OFF = ("OFF", "ON")
+PINMAPS = ("OFF", "BTT_SKR_PRO", "MiniPCB", "MiniPCB2", "MaxPCB2", "MaxESP3", "CNC3", "STM32Blue")
+BAUD_RATES = ("OFF", "9600", "19200", "57600", "115200", "230400", "460800")
+DRIVER_MODELS = ("OFF", "A4988", "DRV8825", "LV8729", "S109", "TMC2130", "TMC5160", "TMC2209")
+DRIVER_STATUS_STATES = ("OFF", "ON", "HIGH", "LOW")
+DECAY_MODES = ("OFF", "STEALTHCHOP", "SPREADCYCLE")
+SENSE_STATES = ("OFF", "HIGH", "LOW")
+LIMIT_SENSE_STATES = ("OFF", "HIGH", "LOW", "LIMIT_SENSE")
+FEATURE_PURPOSES = ("OFF", "SWITCH", "MOMENTARY_SWITCH", "ANALOG_OUT", "DEW_HEATER", "INTERVALOMETER")
+
+FILE_VERSION_CONFIG = 6
+
+Param = namedtuple("Param", "key section group label type options default column")
+
+
+def _feature_group(i):
+    return [
+        (f"FEATURE{i}_PURPOSE", 36, CHOICE, "OFF", FEATURE_PURPOSES, f"Feature {i} Purpose"),
+        (f"FEATURE{i}_NAME", 35, STRING, f"FEATURE{i}", (), f"Feature {i} Name"),
+        (f"FEATURE{i}_TEMP", 35, ENTRY, "OFF", (), f"Feature {i} TEMP"),
+        (f"FEATURE{i}_PIN", 35, ENTRY, "OFF", (), f"Feature {i} PIN"),
+        (f"FEATURE{i}_VALUE_DEFAULT", 35, ENTRY, "OFF", (), f"Feature {i} VALUE_DEFAULT"),
+        (f"FEATURE{i}_VALUE_MEMORY", 35, CHOICE, "OFF", ON_OFF, f"Feature {i} Value Memory"),
+        (f"FEATURE{i}_ON_STATE", 35, CHOICE, "HIGH", ("HIGH", "LOW"), f"Feature {i} On State"),
+    ]
+
+
+# (tab title, Config.h heading, [groups]); groups are separated by a blank line
+# in Config.h.  Rows are (key, value column, type, default, options[, label]).
+_LAYOUT = [
+    ("Controller", "CONTROLLER", [
+        [
+            ("PINMAP", 38, CHOICE, "BTT_SKR_PRO", PINMAPS, "Pinmap"),
+            ("SERIAL_A_BAUD_DEFAULT", 37, CHOICE, "9600", BAUD_RATES, "Serial A Baud"),
+            ("SERIAL_B_BAUD_DEFAULT", 37, CHOICE, "230400", BAUD_RATES, "Serial B Baud"),
+            ("SERIAL_B_ESP_FLASHING", 38, CHOICE, "ON", ON_OFF, "Serial B ESP Flashing"),
+            ("SERIAL_C_BAUD_DEFAULT", 37, CHOICE, "OFF", BAUD_RATES, "Serial C Baud"),
+            ("SERIAL_D_BAUD_DEFAULT", 37, CHOICE, "OFF", BAUD_RATES, "Serial D Baud"),
+            ("SERIAL_E_BAUD_DEFAULT", 37, CHOICE, "OFF", BAUD_RATES, "Serial E Baud"),
+            ("SERIAL_RADIO", 38, CHOICE, "OFF", ("OFF", "BLUETOOTH", "WIFI_ACCESS_POINT", "WIFI_STATION"), "Serial Radio"),
+            ("WIFI_MODULE", 37, CHOICE, "CH_PD", ("OFF", "CH_PD"), "WiFi Module"),
+            ("STATUS_LED", 38, CHOICE, "ON", ON_OFF, "Status LED"),
+            ("RETICLE_LED_DEFAULT", 38, CHOICE, "OFF", ON_OFF, "Reticle LED Default"),
+            ("RETICLE_LED_MEMORY", 38, CHOICE, "OFF", ON_OFF),
+            ("RETICLE_LED_INVERT", 38, CHOICE, "OFF", ON_OFF),
+            ("WEATHER", 38, CHOICE, "OFF", ("OFF", "BME280", "BME280_0x76", "BME280_SPI", "BMP280", "BMP280_0x76", "BMP280_SPI"), "Weather Sensor"),
+            ("STEP_WAVE_FORM", 38, CHOICE, "PULSE", ("SQUARE", "PULSE"), "Step Wave Form"),
+            ("NV_DRIVER", 38, CHOICE, "NV_AT24C32", ("NV_DEFAULT", "NV_AT24C32"), "NV Driver"),
+        ],
+    ]),
+    ("Mount", "MOUNT", [
+        [
+            ("AXIS1_DRIVER_MODEL", 38, CHOICE, "TMC2130", DRIVER_MODELS, "Axis 1 Driver Model"),
+            ("AXIS1_STEPS_PER_DEGREE", 37, ENTRY, "24888", ()),
+            ("AXIS1_REVERSE", 38, CHOICE, "OFF", ON_OFF),
+            ("AXIS1_LIMIT_MIN", 37, ENTRY, "-180", ()),
+            ("AXIS1_LIMIT_MAX", 37, ENTRY, "180", ()),
+            ("AXIS1_DRIVER_MICROSTEPS", 37, ENTRY, "16", ()),
+            ("AXIS1_DRIVER_MICROSTEPS_GOTO", 37, ENTRY, "1", ()),
+            ("AXIS1_DRIVER_IHOLD", 37, ENTRY, "500", ()),
+            ("AXIS1_DRIVER_IRUN", 37, ENTRY, "800", ()),
+            ("AXIS1_DRIVER_IGOTO", 37, ENTRY, "1200", ()),
+            ("AXIS1_DRIVER_STATUS", 37, CHOICE, "ON", DRIVER_STATUS_STATES, "Axis 1 Driver Status"),
+            ("AXIS1_DRIVER_DECAY", 37, CHOICE, "OFF", DECAY_MODES),
+            ("AXIS1_DRIVER_DECAY_GOTO", 37, CHOICE, "OFF", DECAY_MODES),
+            ("AXIS1_POWER_DOWN", 37, CHOICE, "OFF", ON_OFF),
+            ("AXIS1_SENSE_HOME", 37, CHOICE, "OFF", ON_OFF),
+            ("AXIS1_SENSE_LIMIT_MIN", 37, CHOICE, "LIMIT_SENSE", LIMIT_SENSE_STATES),
+            ("AXIS1_SENSE_LIMIT_MAX", 37, CHOICE, "LIMIT_SENSE", LIMIT_SENSE_STATES),
+        ],
+        [
+            ("AXIS2_DRIVER_MODEL", 38, CHOICE, "TMC2130", DRIVER_MODELS, "Axis 2 Driver Model"),
+            ("AXIS2_STEPS_PER_DEGREE", 37, ENTRY, "24888", ()),
+            ("AXIS2_REVERSE", 38, CHOICE, "OFF", ON_OFF),
+            ("AXIS2_LIMIT_MIN", 37, ENTRY, "-90", ()),
+            ("AXIS2_LIMIT_MAX", 37, ENTRY, "90", ()),
+            ("AXIS2_DRIVER_MICROSTEPS", 37, ENTRY, "16", ()),
+            ("AXIS2_DRIVER_MICROSTEPS_GOTO", 37, ENTRY, "1", ()),
+            ("AXIS2_DRIVER_IHOLD", 37, ENTRY, "500", ()),
+            ("AXIS2_DRIVER_IRUN", 37, ENTRY, "800", ()),
+            ("AXIS2_DRIVER_IGOTO", 37, ENTRY, "1200", ()),
+            ("AXIS2_DRIVER_STATUS", 37, CHOICE, "ON", DRIVER_STATUS_STATES, "Axis 2 Driver Status"),
+            ("AXIS2_DRIVER_DECAY", 37, CHOICE, "OFF", DECAY_MODES),
+            ("AXIS2_DRIVER_DECAY_GOTO", 37, CHOICE, "OFF", DECAY_MODES),
+            ("AXIS2_POWER_DOWN", 37, CHOICE, "OFF", ON_OFF),
+            ("AXIS2_SENSE_HOME", 37, CHOICE, "OFF", ON_OFF),
+            ("AXIS2_SENSE_LIMIT_MIN", 37, CHOICE, "LIMIT_SENSE", LIMIT_SENSE_STATES),
+            ("AXIS2_SENSE_LIMIT_MAX", 37, CHOICE, "LIMIT_SENSE", LIMIT_SENSE_STATES),
+        ],
+        [
+            ("MOUNT_TYPE", 38, CHOICE, "GEM", ("GEM", "GEM_TA", "GEM_TAC", "FORK", "FORK_TA", "FORK_TAC", "ALTAZM", "ALTAZM_UNL"), "Mount Type"),
+            ("MOUNT_COORDS", 38, CHOICE, "TOPOCENTRIC", ("TOPOCENTRIC", "TOPO_STRICT", "OBSERVED_PLACE"), "Mount Coords"),
+            ("MOUNT_COORDS_MEMORY", 38, CHOICE, "OFF", ON_OFF),
+            ("MOUNT_ENABLE_IN_STANDBY", 38, CHOICE, "OFF", ON_OFF),
+            ("TIME_LOCATION_SOURCE", 38, CHOICE, "DS3231", ("OFF", "DS3231", "SD3031", "TEENSY", "GPS", "NTP"), "Time Location Source"),
+            ("TIME_LOCATION_PPS_SENSE", 38, CHOICE, "HIGH", ("OFF", "HIGH", "LOW", "BOTH"), "PPS Sense"),
+            ("STATUS_MOUNT_LED", 37, CHOICE, "OFF", ON_OFF),
+            ("STATUS_BUZZER", 37, ENTRY, "OFF", (), "Status Buzzer"),
+            ("STATUS_BUZZER_DEFAULT", 37, CHOICE, "OFF", ON_OFF),
+            ("STATUS_BUZZER_MEMORY", 37, CHOICE, "OFF", ON_OFF),
+            ("ST4_INTERFACE", 37, CHOICE, "OFF", ON_OFF, "ST4 Interface"),
+            ("ST4_HAND_CONTROL", 37, CHOICE, "ON", ON_OFF),
+            ("ST4_HAND_CONTROL_FOCUSER", 37, CHOICE, "ON", ON_OFF),
+            ("GUIDE_TIME_LIMIT", 37, ENTRY, "10", (), "Guide Time Limit"),
+            ("GUIDE_DISABLE_BACKLASH", 37, CHOICE, "OFF", ON_OFF, "Guide Disable Backlash"),
+            ("LIMIT_SENSE", 37, CHOICE, "OFF", SENSE_STATES, "Limit Sense"),
+            ("LIMIT_STRICT", 37, CHOICE, "OFF", ON_OFF, "Limit Strict"),
+            ("PARK_SENSE", 37, CHOICE, "OFF", SENSE_STATES),
+            ("PARK_SIGNAL", 37, CHOICE, "OFF", SENSE_STATES),
+            ("PARK_STATUS", 37, CHOICE, "OFF", SENSE_STATES),
+            ("PARK_STRICT", 37, CHOICE, "OFF", SENSE_STATES),
+            ("PEC_STEPS_PER_WORM_ROTATION", 37, ENTRY, "0", (), "PEC Steps Per Worm Rotation"),
+            ("PEC_SENSE", 37, CHOICE, "OFF", SENSE_STATES, "PEC Sense"),
+            ("PEC_BUFFER_SIZE_LIMIT", 37, ENTRY, "720", (), "PEC Buffer Size Limit"),
+            ("TRACK_BACKLASH_RATE", 37, ENTRY, "2", (), "Track Backlash Rate"),
+            ("TRACK_AUTOSTART", 37, CHOICE, "OFF", ON_OFF, "Track Autostart"),
+            ("TRACK_COMPENSATION_DEFAULT", 37, CHOICE, "OFF", ("OFF", "REFRACTION", "REFRACTION_DUAL", "MODEL", "MODEL_DUAL"), "Track Compensation Default"),
+            ("TRACK_COMPENSATION_MEMORY", 37, CHOICE, "OFF", ON_OFF, "Track Compensation Memory"),
+            ("SLEW_RATE_BASE_DESIRED", 37, ENTRY, "1", (), "Slew Rate Base Desired"),
+            ("SLEW_RATE_MEMORY", 37, CHOICE, "OFF", ON_OFF, "Slew Rate Memory"),
+            ("SLEW_ACCELERATION_DIST", 37, ENTRY, "5.0", ()),
+            ("SLEW_RAPID_STOP_DIST", 37, ENTRY, "2.0", ()),
+            ("GOTO_FEATURE", 37, CHOICE, "ON", ON_OFF, "Goto Feature"),
+            ("GOTO_OFFSET", 37, ENTRY, "0.25", ()),
+            ("GOTO_OFFSET_ALIGN", 37, CHOICE, "OFF", ON_OFF, "Goto Offset Align"),
+            ("MFLIP_SKIP_HOME", 37, CHOICE, "OFF", ON_OFF),
+            ("MFLIP_AUTOMATIC_DEFAULT", 37, CHOICE, "OFF", ON_OFF),
+            ("MFLIP_AUTOMATIC_MEMORY", 37, CHOICE, "OFF", ON_OFF),
+            ("MFLIP_PAUSE_HOME_DEFAULT", 37, CHOICE, "OFF", ON_OFF),
+            ("MFLIP_PAUSE_HOME_MEMORY", 37, CHOICE, "OFF", ON_OFF),
+            ("PIER_SIDE_SYNC_CHANGE_SIDES", 37, CHOICE, "OFF", ON_OFF),
+            ("PIER_SIDE_PREFERRED_DEFAULT", 37, CHOICE, "BEST", ("BEST", "EAST", "WEST"), "Pier Side Preferred Default"),
+            ("PIER_SIDE_PREFERRED_MEMORY", 37, CHOICE, "OFF", ON_OFF, "Pier Side Preferred Memory"),
+            ("ALIGN_AUTO_HOME", 37, CHOICE, "OFF", ON_OFF, "Align Auto Home"),
+            ("ALIGN_MODEL_MEMORY", 37, CHOICE, "OFF", ON_OFF, "Align Model Memory"),
+            ("ALIGN_MAX_STARS", 37, CHOICE, "AUTO", ("AUTO", "1", "3", "4", "5", "6", "7", "8", "9"), "Align Max Stars"),
+        ],
+    ]),
+    ("Rotator", "ROTATOR", [
+        [
+            ("AXIS3_DRIVER_MODEL", 38, CHOICE, "OFF", DRIVER_MODELS, "Axis 3 Driver Model"),
+            ("AXIS3_SLEW_RATE_BASE_DESIRED", 37, ENTRY, "1.0", ()),
+            ("AXIS3_STEPS_PER_DEGREE", 37, ENTRY, "64.0", ()),
+            ("AXIS3_REVERSE", 38, CHOICE, "OFF", ON_OFF),
+            ("AXIS3_LIMIT_MIN", 37, ENTRY, "0", ()),
+            ("AXIS3_LIMIT_MAX", 37, ENTRY, "360", ()),
+            ("AXIS3_DRIVER_MICROSTEPS", 37, ENTRY, "OFF", ()),
+            ("AXIS3_DRIVER_MICROSTEPS_GOTO", 37, ENTRY, "OFF", ()),
+            ("AXIS3_DRIVER_IHOLD", 37, ENTRY, "OFF", ()),
+            ("AXIS3_DRIVER_IRUN", 37, ENTRY, "OFF", ()),
+            ("AXIS3_DRIVER_IGOTO", 37, ENTRY, "OFF", ()),
+            ("AXIS3_DRIVER_STATUS", 37, CHOICE, "OFF", DRIVER_STATUS_STATES, "Axis 3 Driver Status"),
+            ("AXIS3_DRIVER_DECAY", 37, CHOICE, "OFF", DECAY_MODES),
+            ("AXIS3_DRIVER_DECAY_GOTO", 37, CHOICE, "OFF", DECAY_MODES),
+            ("AXIS3_POWER_DOWN", 37, CHOICE, "OFF", ON_OFF),
+            ("AXIS3_SENSE_HOME", 37, CHOICE, "OFF", ON_OFF),
+            ("AXIS3_SENSE_LIMIT_MIN", 37, CHOICE, "OFF", SENSE_STATES),
+            ("AXIS3_SENSE_LIMIT_MAX", 37, CHOICE, "OFF", SENSE_STATES),
+        ],
+    ]),
+    ("Focusers", "FOCUSERS", [
+        [
+            ("AXIS4_DRIVER_MODEL", 38, CHOICE, "OFF", DRIVER_MODELS, "Axis 4 Driver Model"),
+            ("AXIS4_SLEW_RATE_BASE_DESIRED", 37, ENTRY, "500", ()),
+            ("AXIS4_SLEW_RATE_MINIMUM", 37, ENTRY, "20", ()),
+            ("AXIS4_STEPS_PER_MICRON", 37, ENTRY, "0.5", ()),
+            ("AXIS4_REVERSE", 38, CHOICE, "OFF", ON_OFF),
+            ("AXIS4_LIMIT_MIN", 37, ENTRY, "0", ()),
+            ("AXIS4_LIMIT_MAX", 37, ENTRY, "50", ()),
+            ("AXIS4_DRIVER_MICROSTEPS", 37, ENTRY, "OFF", ()),
+            ("AXIS4_DRIVER_MICROSTEPS_GOTO", 37, ENTRY, "OFF", ()),
+            ("AXIS4_DRIVER_IHOLD", 37, ENTRY, "OFF", ()),
+            ("AXIS4_DRIVER_IRUN", 37, ENTRY, "OFF", ()),
+            ("AXIS4_DRIVER_IGOTO", 37, ENTRY, "OFF", ()),
+            ("AXIS4_DRIVER_STATUS", 37, CHOICE, "OFF", DRIVER_STATUS_STATES, "Axis 4 Driver Status"),
+            ("AXIS4_DRIVER_DECAY", 37, CHOICE, "OFF", DECAY_MODES),
+            ("AXIS4_DRIVER_DECAY_GOTO", 37, CHOICE, "OFF", DECAY_MODES),
+            ("AXIS4_POWER_DOWN", 37, CHOICE, "OFF", ON_OFF),
+            ("AXIS4_SENSE_HOME", 37, CHOICE, "OFF", ON_OFF),
+            ("AXIS4_SENSE_LIMIT_MIN", 37, CHOICE, "OFF", SENSE_STATES),
+            ("AXIS4_SENSE_LIMIT_MAX", 37, CHOICE, "OFF", SENSE_STATES),
+            ("FOCUSER_TEMPERATURE", 38, CHOICE, "OFF", ("OFF", "THERMISTOR"), "Focuser Temperature"),
+        ],
+    ]),
+ ("Auxiliary", "AUXILIARY FEATURES", [_feature_group(i) for i in range(1, 9)]),
+]
+
+SECTIONS = tuple(title for title, _, _ in _LAYOUT)
+
+PARAMS = tuple(
+    Param(row[0], title, group, row[5] if len(row) > 5 else row[0].replace('_', ' '),
+          row[2], row[4], row[3], row[1])
+    for title, _, groups in _LAYOUT
+    for group, rows in enumerate(groups)
+    for row in rows
+)
+
+KEYS = tuple(p.key for p in PARAMS)
+KEY_INDEX = {key: i for i, key in enumerate(KEYS)}
+DEFAULTS = tuple(p.default for p in PARAMS)
+
+
+def section_params(section):
+    return [p for p in PARAMS if p.section == section]
+
+
+def values_from_dict(preset):
+    """Flatten a key/value preset into a value list in PARAMS order, filling in defaults"""
+    values = list(DEFAULTS)
+    index = KEY_INDEX
+    for key, value in preset.items():
+        i = index.get(key)
+        if i is not None:
+            values[i] = str(value)
+    return values
+
+
+def values_to_dict(values):
+    return dict(zip(KEYS, values))
+
+
+def _define_prefix(param):
+    prefix = f"#define {param.key}"
+    return prefix.ljust(max(param.column, len(prefix) + 1))
+
+
+def define_line(param, value):
+    """A single '#define KEY value' line, aligned the way the template aligns it"""
+    if param.type == STRING:
+        return f'{_define_prefix(param)}"{value}"'
+    return f"{_define_prefix(param)}{value}"
+
+
+def _compile_template():
+    lines = ["/* Configuration for OnStepX */", ""]
+    params = iter(PARAMS)
+    for _, heading, groups in _LAYOUT:
+        lines.append(f"// {heading}")
+        for rows in groups:
+            for param in (next(params) for _ in rows):
+                placeholder = '"{}"' if param.type == STRING else "{}"
+                lines.append(_define_prefix(param) + placeholder)
+            lines.append("")
+    lines.append(f"#define FileVersionConfig {FILE_VERSION_CONFIG}")
+    lines.append('#include "Extended.config.h"')
+    return "\n".join(lines)
+
+
+TEMPLATE = _compile_template()
+
+# 1-based line of each parameter's #define in the rendered file, in PARAMS order
+LINE_NUMBERS = tuple(n for n, line in enumerate(TEMPLATE.split("\n"), 1) if "{}" in line)
+LINE_COUNT = TEMPLATE.count("\n") + 1
+
+
+def render(values):
+    """Render Config.h from a flat value list in PARAMS order"""
+    return TEMPLATE.format(*values)
@@ -0,0 +1,378 @@
+"""Self-hostable preset server: one folder of presets over HTTP for every configurator on a network.
+
+It answers the two GitHub endpoints PresetSource talks to, so a configurator
+pointed at http://host:port (as both API and raw base) needs nothing else:
+
+    GET /repos/<owner>/<repo>/contents/<folder>   JSON listing with download_url (owner/repo/folder ignored)
+    GET /raw/<name>                               a preset file as stored
+    GET /<owner>/<repo>/<branch>/.../<name>       the same at its raw.githubusercontent.com path
+    GET /config/<stem>/Config.h                   the preset rendered, laid out like batch output (not
+                                                  served when m.json and m.csv are both there)
+
+Every response body is kept in memory with its gzip form and a weak ETag, so a
+request is a dictionary lookup and a socket write, and If-None-Match gets a
+304.  Rendered Config.h files are keyed by their render key (presets with the
+same values share one) and the least recently used are dropped beyond
+config_bytes.  Files are re-read only when the folder changes (onstep_watch).
+
+One asyncio event loop serves every keep-alive connection, so hundreds of
+clients cost a socket each rather than a thread each.
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from urllib.parse import quote, unquote
+
+import onstep_schema as schema
+from onstep_presets import PRESET_EXTENSIONS, parse_preset
+from onstep_render_cache import render_key
+from onstep_watch import RESCAN, open_watcher
+
+HOST = "127.0.0.1"
+PORT = 8780
+BACKLOG = 1024
+CONFIG_BYTES = 64 * 1024 * 1024
+GZIP_MIN_BYTES = 512  # smaller bodies gain less than the header costs
+IDLE_TIMEOUT_S = 30
+MAX_HEAD_BYTES = 16 * 1024
+
+CONTENT_TYPES = {".json": "application/json", ".csv": "text/csv; charset=utf-8", ".h": "text/x-c; charset=utf-8"}
+_REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 431: "Request Header Fields Too Large"}
+
+
+class Resource:
+    """A response body with its ETag; the gzip form is made on first request"""
+    __slots__ = ("body", "etag", "content_type", "_gzipped")
+
+    def __init__(self, body, content_type, etag=None):
+        self.body = body
+        self.content_type = content_type
+        self.etag = 'W/"%s"' % (etag or hashlib.sha1(body).hexdigest())
+        self._gzipped = None
+
+    @property
+    def gzipped(self):
+        """The gzip-compressed body, or None when compressing does not make it smaller"""
+        if self._gzipped is None:
+            compressed = gzip.compress(self.body, 6, mtime=0) if len(self.body) >= GZIP_MIN_BYTES else self.body
+            self._gzipped = compressed if len(compressed) < len(self.body) else b""
+        return self._gzipped or None
+
+    @property
+    def size(self):
+        return len(self.body) + len(self._gzipped or b"")
+
+
+class PresetStore:
+    """The presets of one folder (not its subfolders) as Resources, kept in step with the files"""
+
+    def __init__(self, directory, poll_interval=None, config_bytes=CONFIG_BYTES, report=print):
+        self.directory = directory
+        self.config_bytes = config_bytes
+        self.report = report
+        self.files = {}  # name -> Resource of the file as stored
+        self.keys = {}  # name -> (render key, value list)
+        self.stems = {}  # stem -> names of the files with that stem (Config.h is served only for one)
+        self.configs = OrderedDict()  # render key -> Resource, least recently used first
+        self.configs_size = 0
+        self.listings = {}  # base URL (one per server address) -> listing Resource
+        self.watcher = open_watcher(directory, poll_interval)
+        self.reload()
+
+    def close(self):
+        self.watcher.close()
+
+    def reload(self):
+        self.files.clear()
+        self.keys.clear()
+        self.stems.clear()
+        with os.scandir(self.directory) as entries:
+            names = sorted(entry.name for entry in entries if entry.name.endswith(PRESET_EXTENSIONS))
+        for name in names:
+            self.load(name)
+        self.listings.clear()
+
+    def load(self, name):
+        """(Re)read one preset file; a deleted or unreadable file is dropped"""
+        self.files.pop(name, None)
+        self.keys.pop(name, None)
+        stem = os.path.splitext(name)[0]
+        names = self.stems.get(stem)
+        if names is not None:
+            names.discard(name)
+            if not names:
+                del self.stems[stem]
+        if not name.endswith(PRESET_EXTENSIONS):
+            return
+        try:
+            with open(os.path.join(self.directory, name), 'rb') as f:
+                body = f.read()
+            values = schema.values_from_dict(parse_preset(name, body))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, AttributeError) as e:
+            self.report(f"{name}: {type(e).__name__}: {e}")
+            return
+        self.files[name] = Resource(body, CONTENT_TYPES[os.path.splitext(name)[1]])
+        self.keys[name] = (render_key(values), values)
+        names = self.stems.setdefault(stem, set())
+        names.add(name)
+        if len(names) > 1:
+            self.report(f"{name}: no Config.h is served for {stem}, as {', '.join(sorted(names - {name}))} "
+                        f"has the same name")
+
+    def refresh(self):
+        """Re-read the files changed since the last call; returns how many were looked at"""
+        try:
+            changed = self.watcher.wait(0)
+        except OSError as e:
+            self.report(f"{self.directory}: {e}")
+            return 0
+        if not changed:
+            return 0
+        if RESCAN in changed:
+            self.reload()
+        else:
+            for name in changed:
+                self.load(name)
+            self.listings.clear()
+        return len(changed)
+
+    def listing(self, base):
+        """The GitHub contents listing, with download and Config.h URLs under base"""
+        resource = self.listings.get(base)
+        if resource is None:
+            entries = []
+            for name, resource in sorted(self.files.items()):
+                entry = {"name": name, "path": name, "sha": resource.etag[3:-1], "size": len(resource.body),
+                         "type": "file", "download_url": f"{base}/raw/{quote(name)}"}
+                stem = os.path.splitext(name)[0]
+                if len(self.stems[stem]) == 1:
+                    entry["config_url"] = f"{base}/config/{quote(stem)}/Config.h"
+                entries.append(entry)
+            resource = self.listings[base] = Resource(json.dumps(entries).encode(), CONTENT_TYPES[".json"])
+        return resource
+
+    def config(self, stem):
+        """The rendered Config.h Resource of a preset, or None"""
+        names = self.stems.get(stem)
+        if names is None or len(names) != 1:
+            return None  # unknown, or which of the presets named stem is meant cannot be told
+        name, = names
+        key, values = self.keys[name]
+        resource = self.configs.get(key)
+        if resource is not None:
+            self.configs.move_to_end(key)
+            return resource
+        resource = self.configs[key] = Resource(schema.render(values).encode('utf-8'), CONTENT_TYPES[".h"], key[:40])
+        resource.gzipped  # compressed once here rather than counted late
+        self.configs_size += resource.size
+        while self.configs_size > self.config_bytes and len(self.configs) > 1:
+            _, dropped = self.configs.popitem(last=False)
+            self.configs_size -= dropped.size
+        return resource
+
+    def route(self, path, base):
+        """The Resource for a request path, or None"""
+        parts = path.strip("/").split("/")
+        if parts[0] == "repos" and len(parts) >= 4 and parts[3] == "contents":
+            return self.listing(base)
+        if parts[0] == "raw" and len(parts) == 2:
+            return self.files.get(parts[1])
+        if parts[0] == "config" and len(parts) == 3 and parts[2] == "Config.h":
+            return self.config(parts[1])
+        if len(parts) >= 4:
+            return self.files.get(parts[-1])
+        return None
+
+
+def _etag_matches(header, etag):
+    """Weak comparison of an If-None-Match header with etag"""
+    if header.strip() == "*":
+        return True
+    opaque = etag[2:]
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def _accepts_gzip(header):
+    for coding in header.split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+class _Connection(asyncio.Protocol):
+    """One client connection: HTTP/1.1 GET/HEAD requests, keep-alive and pipelining, answered in order"""
+
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+        self.buffer = b""
+        self.idle = None
+        self.base = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.base = self.server.base_url(transport.get_extra_info("sockname"))
+        self.reset_idle()
+
+    def connection_lost(self, exc):
+        if self.idle is not None:
+            self.idle.cancel()
+
+    def reset_idle(self):
+        if self.idle is not None:
+            self.idle.cancel()
+        self.idle = self.server.loop.call_later(IDLE_TIMEOUT_S, self.transport.close)
+
+    def pause_writing(self):
+        # The client is not reading: stop reading its requests until the replies drain
+        self.transport.pause_reading()
+
+    def resume_writing(self):
+        self.transport.resume_reading()
+
+    def data_received(self, data):
+        self.buffer += data
+        self.reset_idle()
+        while not self.transport.is_closing():
+            end = self.buffer.find(b"\r\n\r\n")
+            if end < 0:
+                if len(self.buffer) > MAX_HEAD_BYTES:
+                    self.reply(431, close=True)
+                return
+            head, self.buffer = self.buffer[:end], self.buffer[end + 4:]
+            self.handle(head)
+
+    def handle(self, head):
+        try:
+            lines = head.decode("latin-1").split("\r\n")
+            method, target, version = lines[0].split(" ")
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        except ValueError:
+            self.reply(400, close=True)
+            return
+        connection = headers.get("connection", "").lower()
+        close = connection == "close" or version != "HTTP/1.1" and connection != "keep-alive"
+        if method not in ("GET", "HEAD"):
+            self.reply(405, close=True)  # request bodies are never read, so the stream cannot be trusted after one
+            return
+        server = self.server
+        server.requests += 1
+        server.check_for_changes()
+        resource = server.store.route(unquote(target.partition("?")[0]), self.base)
+        if resource is None:
+            self.reply(404, close=close, head_only=method == "HEAD")
+            return
+        if "if-none-match" in headers and _etag_matches(headers["if-none-match"], resource.etag):
+            server.not_modified += 1
+            self.reply(304, etag=resource.etag, close=close)
+            return
+        body, encoding = resource.body, None
+        if _accepts_gzip(headers.get("accept-encoding", "")):
+            compressed = resource.gzipped
+            if compressed is not None:
+                body, encoding = compressed, "gzip"
+        self.reply(200, body, resource.content_type, resource.etag, encoding, close, method == "HEAD")
+
+    def reply(self, status, body=b"", content_type="text/plain; charset=utf-8", etag=None, encoding=None,
+              close=False, head_only=False):
+        if status >= 400 and not body:
+            body = f"{status} {_REASONS[status]}\n".encode()
+        lines = [f"HTTP/1.1 {status} {_REASONS[status]}"]
+        if status != 304:
+            lines.append(f"Content-Type: {content_type}")
+            lines.append(f"Content-Length: {len(body)}")
+        if etag is not None:
+            lines.append(f"ETag: {etag}")
+            lines.append("Cache-Control: no-cache")
+            lines.append("Vary: Accept-Encoding")
+        if encoding is not None:
+            lines.append(f"Content-Encoding: {encoding}")
+        if close:
+            lines.append("Connection: close")
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        self.transport.write(head if head_only or status == 304 else head + body)
+        if close:
+            self.transport.close()
+
+
+class PresetServer:
+    """Serves a PresetStore from the running event loop; use as `await server.start()`"""
+
+    def __init__(self, store, host=HOST, port=PORT, check_interval=None, public_url=None):
+        self.store = store
+        self.host = host
+        self.port = port
+        self.public_url = public_url.rstrip("/") if public_url else None
+        # inotify costs nothing to ask, so every request sees the folder as it is; polling is rate limited
+        self.check_interval = check_interval if check_interval is not None else getattr(store.watcher, "interval", 0)
+        self.checked = 0
+        self.requests = 0
+        self.not_modified = 0
+        self.loop = None
+        self.server = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def base_url(self, sockname):
+        """The URL listings point at: public_url, or the server address the client connected to.
+
+        Never the client's Host header, which would let any client add listings without limit.
+        """
+        if self.public_url or not sockname:
+            return self.public_url or self.url
+        host, port = sockname[:2]
+        return f"http://[{host}]:{port}" if ":" in host else f"http://{host}:{port}"
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        self.server = await self.loop.create_server(lambda: _Connection(self), self.host, self.port, backlog=BACKLOG)
+        self.port = self.server.sockets[0].getsockname()[1]  # the port picked when 0 was asked for
+        return self
+
+    def check_for_changes(self):
+        if self.check_interval:
+            now = time.monotonic()
+            if now - self.checked < self.check_interval:
+                return
+            self.checked = now
+        self.store.refresh()
+
+    async def serve_forever(self):
+        async with self.server:
+            await self.server.serve_forever()
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+
+
+def serve(directory, host=HOST, port=PORT, poll_interval=None, public_url=None, report=print):
+    """Serve the presets of directory until interrupted; returns the PresetServer (for its counters)"""
+    store = PresetStore(directory, poll_interval, report=report)
+    server = PresetServer(store, host, port, public_url=public_url)
+
+    async def run():
+        await server.start()
+        report(f"Serving {len(store.files)} presets from {directory} at {server.url}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+    return server
@@ -0,0 +1,146 @@
+"""Step-rate and slew feasibility for the axes of a preset.
+
+OnStepX gives STEPS_PER_DEGREE (or STEPS_PER_MICRON) at the tracking microstep
+setting and drops to DRIVER_MICROSTEPS_GOTO while slewing, so the step
+frequency a slew needs is rate * steps * goto_microsteps / microsteps.  That
+frequency is checked against the controller behind PINMAP: the fastest step
+rate its step ISR can produce on one axis, and the share of CPU time the step
+ISRs of all axes moving together may take.  The MCU figures are conservative
+estimates, not measurements of a particular firmware build.
+"""
+import math
+from collections import namedtuple
+
+import onstep_schema as schema
+
+SIDEREAL_DEGREES_PER_SECOND = 360.0 / 86164.0905
+MAX_ISR_LOAD = 0.5  # leave at least half the CPU for everything that is not stepping
+GOTO_MICROSTEPS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+Mcu = namedtuple("Mcu", "name max_step_rate isr_us")
+
+MCUS = {
+    "GENERIC": Mcu("Unknown controller", 40000, 4.0),
+    "TEENSY32": Mcu("Teensy 3.2", 100000, 2.0),
+    "STM32F4": Mcu("STM32F407", 200000, 1.0),
+    "STM32F1": Mcu("STM32F103", 50000, 3.0),
+    "ESP32": Mcu("ESP32", 62500, 3.5),
+}
+
+# Where a pinmap takes several boards, the slowest one it supports
+PINMAP_MCUS = {
+    "BTT_SKR_PRO": "STM32F4",
+    "MiniPCB": "TEENSY32",
+    "MiniPCB2": "TEENSY32",
+    "MaxPCB2": "TEENSY32",
+    "MaxESP3": "ESP32",
+    "CNC3": "ESP32",
+    "STM32Blue": "STM32F1",
+}
+
+AxisRate = namedtuple("AxisRate", "axis unit steps goto_steps slew_rate slew_step_rate tracking_step_rate "
+                                  "max_slew_rate feasible")
+StepReport = namedtuple("StepReport", "mcu axes isr_load feasible")
+Sweep = namedtuple("Sweep", "goto_microsteps slew_rates step_rate isr_load feasible frontier")
+
+
+def mcu_for(pinmap):
+    return MCUS[PINMAP_MCUS.get(pinmap, "GENERIC")]
+
+
+def positive_number(text):
+    """float(text) if it is a positive finite number, otherwise NaN"""
+    try:
+        number = float(text)
+    except (TypeError, ValueError):
+        return math.nan
+    return number if math.isfinite(number) and number > 0 else math.nan
+
+
+def goto_steps(steps, microsteps, goto_microsteps):
+    """Steps per unit while slewing; unchanged when either microstep setting is OFF or not a number"""
+    microsteps, goto_microsteps = positive_number(microsteps), positive_number(goto_microsteps)
+    if math.isnan(microsteps) or math.isnan(goto_microsteps):
+        return steps
+    return steps * goto_microsteps / microsteps
+
+
+def _axes(values):
+    """(axis, unit, steps key, slew rate key, moves with) for each axis the preset enables"""
+    get = lambda key: values[schema.KEY_INDEX[key]]
+    axes = [(1, "°", "AXIS1_STEPS_PER_DEGREE", "SLEW_RATE_BASE_DESIRED", "mount"),
+            (2, "°", "AXIS2_STEPS_PER_DEGREE", "SLEW_RATE_BASE_DESIRED", "mount")]
+    if get("AXIS3_DRIVER_MODEL") != "OFF":
+        axes.append((3, "°", "AXIS3_STEPS_PER_DEGREE", "AXIS3_SLEW_RATE_BASE_DESIRED", "rotator"))
+    if get("AXIS4_DRIVER_MODEL") != "OFF":
+        axes.append((4, "µm", "AXIS4_STEPS_PER_MICRON", "AXIS4_SLEW_RATE_BASE_DESIRED", "focuser"))
+    return axes
+
+
+def step_report(values):
+    """StepReport for a preset (value list in PARAMS order or dict).
+
+    Mount axes slew together, so their step ISRs share the load budget; the
+    rotator and focuser are checked on their own.  isr_load is the worst case of
+    every enabled axis slewing at once.  Axes whose inputs are not numbers get
+    NaN rates and feasible None.
+    """
+    if isinstance(values, dict):
+        values = schema.values_from_dict(values)
+    get = lambda key: values[schema.KEY_INDEX[key]]
+    mcu = mcu_for(get("PINMAP"))
+    isr_seconds = mcu.isr_us * 1e-6
+    axes = _axes(values)
+    steps, goto = {}, {}
+    for axis, unit, steps_key, rate_key, group in axes:
+        steps[axis] = positive_number(get(steps_key))
+        goto[axis] = goto_steps(steps[axis], get(f"AXIS{axis}_DRIVER_MICROSTEPS"),
+                                get(f"AXIS{axis}_DRIVER_MICROSTEPS_GOTO"))
+    group_steps = {}
+    for axis, unit, steps_key, rate_key, group in axes:
+        group_steps[group] = group_steps.get(group, 0.0) + goto[axis]
+    rates, isr_load = [], 0.0
+    for axis, unit, steps_key, rate_key, group in axes:
+        slew = positive_number(get(rate_key))
+        slew_step_rate = slew * goto[axis]
+        max_slew = min(mcu.max_step_rate / goto[axis], MAX_ISR_LOAD / (isr_seconds * group_steps[group]))
+        tracking = steps[axis] * SIDEREAL_DEGREES_PER_SECOND if group == "mount" else 0.0
+        feasible = None if math.isnan(slew) or math.isnan(max_slew) else slew <= max_slew
+        rates.append(AxisRate(axis, unit, steps[axis], goto[axis], slew, slew_step_rate, tracking, max_slew, feasible))
+        if not math.isnan(slew_step_rate):
+            isr_load += slew_step_rate * isr_seconds
+    known = [rate.feasible for rate in rates if rate.feasible is not None]
+    feasible = all(known) and isr_load <= MAX_ISR_LOAD if known else None
+    return StepReport(mcu, rates, isr_load, feasible)
+
+
+def sweep(mcu, steps, microsteps, slew_rates, goto_microsteps=GOTO_MICROSTEPS, other_steps=0.0):
+    """Step rate, ISR load and feasibility over every goto microstep setting x slew rate.
+
+    steps is the axis' steps per unit at microsteps; other_steps the summed goto
+    steps per unit of axes slewing alongside it at the same rate (the other mount
+    axis).  Results are len(goto_microsteps) x len(slew_rates) grids; frontier
+    holds the fastest feasible slew rate of each row (NaN if none is).
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    isr_seconds = mcu.isr_us * 1e-6
+    if np is None:
+        per_unit = [steps * g / microsteps for g in goto_microsteps]
+        step_rate = [[rate * s for rate in slew_rates] for s in per_unit]
+        isr_load = [[rate * (s + other_steps) * isr_seconds for rate in slew_rates] for s in per_unit]
+        feasible = [[hz <= mcu.max_step_rate and load <= MAX_ISR_LOAD for hz, load in zip(row, loads)]
+                    for row, loads in zip(step_rate, isr_load)]
+        frontier = [max((rate for rate, ok in zip(slew_rates, row) if ok), default=math.nan) for row in feasible]
+        return Sweep(list(goto_microsteps), list(slew_rates), step_rate, isr_load, feasible, frontier)
+    goto_microsteps = np.asarray(goto_microsteps, dtype=np.float64)
+    slew_rates = np.asarray(slew_rates, dtype=np.float64)
+    per_unit = steps * goto_microsteps / microsteps
+    step_rate = np.outer(per_unit, slew_rates)
+    isr_load = np.outer(per_unit + other_steps, slew_rates) * isr_seconds
+    feasible = (step_rate <= mcu.max_step_rate) & (isr_load <= MAX_ISR_LOAD)
+    frontier = np.where(feasible, slew_rates, -np.inf).max(axis=1)
+    frontier[np.isneginf(frontier)] = np.nan
+    return Sweep(goto_microsteps, slew_rates, step_rate, isr_load, feasible, frontier)
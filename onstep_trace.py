@@ -0,0 +1,228 @@
+"""Opt-in timing instrumentation for the configurator window.
+
+Set ONSTEP_TRACE to a file path (or to 1 for trace.jsonl in the user cache
+folder) before starting the app.  Every user action and tab build is then
+written as one JSON object per line to a rotating trace file:
+
+    {"type": "action", "name": "load_preset", "wall_ms": 41.2, "tcl_calls": 388,
+     "bytes_read": 6120, "requests": 0, "network_ms": 0.0, ...}
+
+Tcl calls are counted by a proxy in front of root.tk, bytes read come from
+/proc/self/io (Linux only, null elsewhere), and network latency is the
+time-to-response of every HTTP request made while the action ran.  The event
+loop is sampled every LAG_INTERVAL_MS: late ticks are recorded as "lag" events
+and a "loop" summary is written every LOOP_SUMMARY_S seconds.
+
+Counters are process-wide, so work that overlaps an action (a background
+download) is included in its numbers.
+"""
+import json
+import os
+import threading
+import time
+
+# logging, cProfile and onstep_github (which pulls in requests) are imported only
+# once tracing or profiling is switched on, so the module costs nothing otherwise.
+
+TRACE_ENV = "ONSTEP_TRACE"
+MAX_TRACE_BYTES = 5 * 1024 * 1024
+TRACE_BACKUPS = 3
+LAG_INTERVAL_MS = 100
+LAG_REPORT_MS = 50  # ticks later than this are recorded individually
+LOOP_SUMMARY_S = 10
+
+# Entry points of the interpreter; splitlist/getint and friends are plain conversions
+_TCL_ENTRY_POINTS = ("call", "eval", "getvar", "setvar", "globalgetvar", "globalsetvar", "globalunsetvar",
+                     "createcommand", "deletecommand")
+
+# App methods timed as actions: the button and menu commands wired in __init__/create_menu
+HANDLERS = ("save_preset", "load_preset", "fetch_from_github", "generate_config", "import_csv", "export_csv",
+            "append_to_catalog", "import_config_h", "open_library", "show_step_rates", "compare_preset",
+            "merge_preset", "undo", "redo", "choose_preset_server")
+
+
+def trace_path_from_env():
+    """Trace file named by ONSTEP_TRACE, or None when tracing is off"""
+    value = os.environ.get(TRACE_ENV, "").strip()
+    if not value or value == "0":
+        return None
+    if value == "1":
+        from onstep_paths import user_cache_dir
+        return os.path.join(user_cache_dir(), "trace.jsonl")
+    return value
+
+
+def read_bytes():
+    """Bytes this process has read so far (files and sockets), or None where /proc is not available"""
+    try:
+        with open("/proc/self/io", 'rb') as f:
+            for line in f:
+                if line.startswith(b"rchar:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+class TclCallCounter:
+    """Stands in for root.tk and counts calls into the Tcl interpreter.
+
+    Widgets and variables copy master.tk when they are created, so it must be
+    installed before the window is built.
+    """
+
+    def __init__(self, tkapp):
+        self._tkapp = tkapp
+        self.count = 0
+        for name in _TCL_ENTRY_POINTS:
+            setattr(self, name, self._counted(getattr(tkapp, name)))
+
+    def _counted(self, method):
+        def counted(*args):
+            self.count += 1
+            return method(*args)
+        return counted
+
+    def __getattr__(self, name):
+        return getattr(self._tkapp, name)
+
+
+class Instrumentation:
+    def __init__(self, root, trace_path, max_bytes=MAX_TRACE_BYTES, backups=TRACE_BACKUPS):
+        import logging
+        from logging.handlers import RotatingFileHandler
+        import onstep_github
+        self.root = root
+        self.trace_path = trace_path
+        self.started = time.perf_counter()
+        directory = os.path.dirname(os.path.abspath(trace_path))
+        os.makedirs(directory, exist_ok=True)
+        self.logger = logging.getLogger(f"onstep.trace.{id(self)}")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        handler = RotatingFileHandler(trace_path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self.logger.addHandler(handler)
+
+        self.tcl = TclCallCounter(root.tk)
+        root.tk = self.tcl
+        self.latencies = []  # seconds to response of every HTTP request, in order
+        onstep_github.RESPONSE_HOOKS.append(self.on_response)
+
+        self.lag_samples = []
+        self.lag_summary_at = time.perf_counter() + LOOP_SUMMARY_S
+        self.tick_due = None
+        self.record({"type": "session", "pid": os.getpid()})
+        self.schedule_tick()
+        root.after_idle(self.startup_done)
+
+    def record(self, event):
+        event["ts"] = round(time.time(), 3)
+        self.logger.info(json.dumps(event))
+
+    def close(self):
+        import onstep_github
+        if self.on_response in onstep_github.RESPONSE_HOOKS:
+            onstep_github.RESPONSE_HOOKS.remove(self.on_response)
+        for handler in list(self.logger.handlers):
+            handler.close()
+            self.logger.removeHandler(handler)
+
+    def on_response(self, response, *args, **kwargs):
+        self.latencies.append(response.elapsed.total_seconds())  # list.append is atomic
+
+    def counters(self):
+        return time.perf_counter(), self.tcl.count, read_bytes(), len(self.latencies)
+
+    def action(self, name, function):
+        """Wrap function so each call is recorded as an action"""
+        def traced(*args, **kwargs):
+            before = self.counters()
+            error = None
+            try:
+                return function(*args, **kwargs)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                self.record_action(name() if callable(name) else name, before, self.counters(), error)
+        traced.__wrapped__ = function
+        return traced
+
+    def record_action(self, name, before, after, error=None):
+        (start, tcl_before, read_before, requests_before), (end, tcl_after, read_after, requests_after) = before, after
+        latencies = self.latencies[requests_before:requests_after]
+        event = {
+            "type": "action",
+            "name": name,
+            "thread": threading.current_thread().name,
+            "wall_ms": round((end - start) * 1000, 3),
+            "tcl_calls": tcl_after - tcl_before,
+            "bytes_read": None if read_before is None or read_after is None else read_after - read_before,
+            "requests": len(latencies),
+            "network_ms": round(sum(latencies) * 1000, 3),
+            "network_max_ms": round(max(latencies, default=0.0) * 1000, 3),
+        }
+        if error:
+            event["error"] = error
+        self.record(event)
+
+    def instrument(self, app):
+        """Time app's command handlers, tab builds and background tasks; call before the window is built"""
+        for name in HANDLERS:
+            setattr(app, name, self.action(name, getattr(app, name)))
+        build_tab = app.build_tab
+        app.build_tab = lambda tab_id: self.action(
+            lambda: f"build_tab:{app.notebook.tab(tab_id, 'text')}", build_tab)(tab_id)
+        run_in_background = app.run_in_background
+
+        def traced_run_in_background(message, work, *args, **kwargs):
+            return run_in_background(message, self.action(f"task:{message}", work), *args, **kwargs)
+        app.run_in_background = traced_run_in_background
+
+    def startup_done(self):
+        self.record({"type": "startup", "wall_ms": round((time.perf_counter() - self.started) * 1000, 3),
+                     "tcl_calls": self.tcl.count})
+
+    def schedule_tick(self):
+        self.tick_due = time.perf_counter() + LAG_INTERVAL_MS / 1000
+        self.root.after(LAG_INTERVAL_MS, self.tick)
+
+    def tick(self):
+        now = time.perf_counter()
+        lag_ms = max(0.0, (now - self.tick_due) * 1000)
+        self.lag_samples.append(lag_ms)
+        if lag_ms > LAG_REPORT_MS:
+            self.record({"type": "lag", "lag_ms": round(lag_ms, 3)})
+        if now >= self.lag_summary_at:
+            samples = sorted(self.lag_samples)
+            self.record({"type": "loop", "samples": len(samples),
+                         "p50_ms": round(samples[len(samples) // 2], 3),
+                         "p99_ms": round(samples[min(len(samples) - 1, len(samples) * 99 // 100)], 3),
+                         "max_ms": round(samples[-1], 3)})
+            self.lag_samples = []
+            self.lag_summary_at = now + LOOP_SUMMARY_S
+        self.schedule_tick()
+
+
+class Profiler:
+    """On-demand cProfile of the whole app, started and stopped from the diagnostics menu"""
+
+    def __init__(self):
+        self.profile = None
+
+    @property
+    def running(self):
+        return self.profile is not None
+
+    def start(self):
+        import cProfile
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def stop(self, file_path=None):
+        """Stop profiling and write the stats (pstats/snakeviz format) to file_path; None discards them"""
+        profile, self.profile = self.profile, None
+        profile.disable()
+        if file_path:
+            profile.dump_stats(file_path)
@@ -0,0 +1,418 @@
+"""Cross-field validation of presets.
+
+Each rule can check one preset (``bad``, plain Python, used while editing) or a
+whole fleet at once (``bad_batch``), where presets are encoded column-wise as
+NumPy arrays and every rule is a handful of vectorised comparisons.  NumPy is
+optional and only imported for fleets: without it validate_fleet falls back to
+checking presets one by one.
+
+Auxiliary feature pins are checked against each other and against the pins
+the preset's board uses (onstep_pins).  These checks report the pin in their
+message, so they are not rules; a fleet runs them once per distinct
+combination of the settings they read.
+"""
+import math
+from collections import namedtuple
+from operator import itemgetter
+
+import onstep_pins as pins
+import onstep_schema as schema
+
+np = None  # set by load_numpy()
+_numpy_missing = False
+
+ERROR = "error"
+WARNING = "warning"
+
+TMC_DRIVERS = ("TMC2130", "TMC5160", "TMC2209")
+TMC_DECAY_MODES = ("STEALTHCHOP", "SPREADCYCLE")
+
+Issue = namedtuple("Issue", "keys message severity")
+
+
+def load_numpy():
+    """Import NumPy on first use; None if it is not installed"""
+    global np, _numpy_missing
+    if np is None and not _numpy_missing:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            _numpy_missing = True
+    return np
+
+
+def to_number(text):
+    try:
+        number = float(text)
+    except (TypeError, ValueError):
+        return math.nan
+    return number if math.isfinite(number) else math.nan
+
+
+class Rule:
+    severity = ERROR
+
+    def __init__(self, keys, message):
+        self.keys = tuple(keys)
+        self.indices = tuple(schema.KEY_INDEX[key] for key in self.keys)
+        self.message = message
+
+    def issue(self):
+        return Issue(self.keys, self.message, self.severity)
+
+    def bad(self, values):
+        """True if this rule fails for one preset (a value list in PARAMS order)"""
+        raise NotImplementedError
+
+    def bad_batch(self, fleet):
+        """Boolean array, True for every preset in an EncodedFleet that fails this rule"""
+        raise NotImplementedError
+
+
+class NumberRule(Rule):
+    """A number within [minimum, maximum], optionally whole, or one of the allowed keywords (e.g. OFF)"""
+
+    def __init__(self, key, minimum=None, maximum=None, integer=False, allow=(), exclusive_minimum=False):
+        self.minimum, self.maximum = minimum, maximum
+        self.integer, self.allow, self.exclusive_minimum = integer, tuple(allow), exclusive_minimum
+        bounds = []
+        if minimum is not None:
+            bounds.append(f"{'>' if exclusive_minimum else '>='} {minimum:g}")
+        if maximum is not None:
+            bounds.append(f"<= {maximum:g}")
+        kind = "a whole number" if integer else "a number"
+        message = f"{key} must be {kind}" + (f" {' and '.join(bounds)}" if bounds else "")
+        if allow:
+            message += f" (or {'/'.join(allow)})"
+        super().__init__([key], message)
+
+    def _bad_number(self, x):
+        if math.isnan(x):
+            return True
+        if self.minimum is not None and (x <= self.minimum if self.exclusive_minimum else x < self.minimum):
+            return True
+        if self.maximum is not None and x > self.maximum:
+            return True
+        return self.integer and x != int(x)
+
+    def bad(self, values):
+        text = values[self.indices[0]]
+        return text not in self.allow and self._bad_number(to_number(text))
+
+    def bad_batch(self, fleet):
+        x = fleet.number(self.keys[0])
+        bad = np.isnan(x)
+        with np.errstate(invalid="ignore"):
+            if self.minimum is not None:
+                bad |= (x <= self.minimum) if self.exclusive_minimum else (x < self.minimum)
+            if self.maximum is not None:
+                bad |= x > self.maximum
+            if self.integer:
+                bad |= x != np.floor(x)
+        if self.allow:
+            bad &= ~fleet.isin(self.keys[0], self.allow)
+        return bad
+
+
+class PowerOfTwoRule(Rule):
+    """Driver microstep settings: 1, 2, 4 ... 256, or an allowed keyword"""
+
+    def __init__(self, key, allow=("OFF",)):
+        self.allow = tuple(allow)
+        super().__init__([key], f"{key} must be a power of two from 1 to 256" + (f" (or {'/'.join(allow)})" if allow else ""))
+
+    def bad(self, values):
+        text = values[self.indices[0]]
+        if text in self.allow:
+            return False
+        x = to_number(text)
+        return math.isnan(x) or x < 1 or x > 256 or x != int(x) or int(x) & (int(x) - 1) != 0
+
+    def bad_batch(self, fleet):
+        x = fleet.number(self.keys[0])
+        with np.errstate(invalid="ignore"):
+            whole = (x >= 1) & (x <= 256) & (x == np.floor(x))
+        n = np.where(whole, x, 0).astype(np.int64)
+        bad = ~whole | ((n & (n - 1)) != 0)
+        if self.allow:
+            bad &= ~fleet.isin(self.keys[0], self.allow)
+        return bad
+
+
+class OrderRule(Rule):
+    """low must be below (or, if not strict, at most) high; skipped unless both are numbers"""
+
+    def __init__(self, low, high, strict=True):
+        self.strict = strict
+        super().__init__([low, high], f"{low} must be {'less than' if strict else 'at most'} {high}")
+
+    def bad(self, values):
+        low, high = to_number(values[self.indices[0]]), to_number(values[self.indices[1]])
+        if math.isnan(low) or math.isnan(high):
+            return False
+        return low >= high if self.strict else low > high
+
+    def bad_batch(self, fleet):
+        low, high = fleet.number(self.keys[0]), fleet.number(self.keys[1])
+        with np.errstate(invalid="ignore"):
+            return (low >= high) if self.strict else (low > high)  # NaN compares False
+
+
+class RequiresRule(Rule):
+    """If key takes one of values, other_key must be one of required"""
+
+    def __init__(self, key, values, other_key, required, message):
+        self.values, self.required = tuple(values), tuple(required)
+        super().__init__([key, other_key], message)
+
+    def bad(self, values):
+        return values[self.indices[0]] in self.values and values[self.indices[1]] not in self.required
+
+    def bad_batch(self, fleet):
+        return fleet.isin(self.keys[0], self.values) & ~fleet.isin(self.keys[1], self.required)
+
+
+class ChoiceRule(Rule):
+    """A drop-down value typed by hand that is not in the list of known values"""
+    severity = WARNING
+
+    def __init__(self, param):
+        self.options = tuple(param.options)
+        super().__init__([param.key], f"{param.key} is not one of: {', '.join(param.options)}")
+
+    def bad(self, values):
+        return values[self.indices[0]] not in self.options
+
+    def bad_batch(self, fleet):
+        return ~fleet.isin(self.keys[0], self.options)
+
+
+def _build_rules():
+    rules = []
+    for n in (1, 2, 3, 4):
+        axis = f"AXIS{n}"
+        steps_key = f"{axis}_STEPS_PER_MICRON" if n == 4 else f"{axis}_STEPS_PER_DEGREE"
+        rules.append(NumberRule(steps_key, minimum=0, exclusive_minimum=True))
+        rules.append(NumberRule(f"{axis}_LIMIT_MIN"))
+        rules.append(NumberRule(f"{axis}_LIMIT_MAX"))
+        rules.append(OrderRule(f"{axis}_LIMIT_MIN", f"{axis}_LIMIT_MAX"))
+        rules.append(PowerOfTwoRule(f"{axis}_DRIVER_MICROSTEPS"))
+        rules.append(PowerOfTwoRule(f"{axis}_DRIVER_MICROSTEPS_GOTO"))
+        rules.append(OrderRule(f"{axis}_DRIVER_MICROSTEPS_GOTO", f"{axis}_DRIVER_MICROSTEPS", strict=False))
+        for current in ("IHOLD", "IRUN", "IGOTO"):
+            rules.append(NumberRule(f"{axis}_DRIVER_{current}", minimum=0, integer=True, allow=("OFF",)))
+        rules.append(OrderRule(f"{axis}_DRIVER_IHOLD", f"{axis}_DRIVER_IRUN", strict=False))
+        rules.append(OrderRule(f"{axis}_DRIVER_IRUN", f"{axis}_DRIVER_IGOTO", strict=False))
+        for decay in ("DECAY", "DECAY_GOTO"):
+            key = f"{axis}_DRIVER_{decay}"
+            rules.append(RequiresRule(key, TMC_DECAY_MODES, f"{axis}_DRIVER_MODEL", TMC_DRIVERS,
+                                      f"{key} STEALTHCHOP/SPREADCYCLE needs a TMC driver on {axis}"))
+    for n in (3, 4):
+        rules.append(NumberRule(f"AXIS{n}_SLEW_RATE_BASE_DESIRED", minimum=0, exclusive_minimum=True))
+    rules.append(NumberRule("AXIS4_SLEW_RATE_MINIMUM", minimum=0, exclusive_minimum=True))
+    rules.append(OrderRule("AXIS4_SLEW_RATE_MINIMUM", "AXIS4_SLEW_RATE_BASE_DESIRED", strict=False))
+    rules.append(NumberRule("SLEW_RATE_BASE_DESIRED", minimum=0, exclusive_minimum=True))
+    rules.append(NumberRule("SLEW_ACCELERATION_DIST", minimum=0, exclusive_minimum=True))
+    rules.append(NumberRule("SLEW_RAPID_STOP_DIST", minimum=0, exclusive_minimum=True))
+    rules.append(NumberRule("GOTO_OFFSET", minimum=0))
+    rules.append(NumberRule("GUIDE_TIME_LIMIT", minimum=0))
+    rules.append(NumberRule("TRACK_BACKLASH_RATE", minimum=0, exclusive_minimum=True))
+    rules.append(NumberRule("PEC_STEPS_PER_WORM_ROTATION", minimum=0, integer=True))
+    rules.append(NumberRule("PEC_BUFFER_SIZE_LIMIT", minimum=0, integer=True))
+    rules.extend(ChoiceRule(param) for param in schema.PARAMS if param.type == schema.CHOICE)
+    return tuple(rules)
+
+
+RULES = _build_rules()
+
+
+_FEATURE_INDICES = tuple((i, schema.KEY_INDEX[f"FEATURE{i}_PURPOSE"], schema.KEY_INDEX[f"FEATURE{i}_PIN"],
+                          schema.KEY_INDEX[f"FEATURE{i}_TEMP"]) for i in pins.FEATURES)
+
+
+def pin_issues(values):
+    """Feature pins on the same pin or on a pin the board uses, and temperature sensors without a 1-Wire bus.
+
+    Two features on one pin, or a feature on a pin the board always uses, are
+    errors.  A pin shared with something switched on in the settings (status
+    LED, limit sense, ...) is a warning: boards share those on purpose and only
+    one of them can be wired.
+    """
+    pinmap = values[schema.KEY_INDEX["PINMAP"]]
+    index = pins.PIN_INDEX.get(pinmap, {})
+    known = pinmap in pins.PINMAPS
+    issues = []
+    taken = {}  # pin -> feature already on it
+    sensors = {}  # sensor address -> feature already reading it
+    for i, purpose, pin_index, temp_index in _FEATURE_INDICES:
+        if values[purpose] == pins.OFF:
+            continue
+        pin_key, temp_key = f"FEATURE{i}_PIN", f"FEATURE{i}_TEMP"
+        text = values[pin_index].strip().upper()
+        pin = None
+        if text == pins.AUX:
+            pin = pins.AUX_PINS.get(pinmap, {}).get(i)
+            if pin is None and known:
+                issues.append(Issue((pin_key, "PINMAP"), f"{pin_key} is AUX but {pinmap} has no AUX{i} pin", ERROR))
+        elif text and text != pins.OFF:
+            pin = pins.normalize_pin(text)
+        if pin is not None:
+            other = taken.setdefault(pin, i)
+            if other != i:
+                issues.append(Issue((f"FEATURE{other}_PIN", pin_key),
+                                    f"FEATURE{other}_PIN and {pin_key} are both pin {pin}", ERROR))
+            for use in index.get(pin, ()):
+                on = pins.switched_on(values, use.condition)
+                if on is True:
+                    issues.append(Issue((pin_key, "PINMAP"), f"{pin_key} {pin} is the {use.description} pin on {pinmap}",
+                                        ERROR))
+                elif on:
+                    issues.append(Issue((pin_key, on), f"{pin_key} {pin} is also the {use.description} pin on "
+                                                       f"{pinmap} ({on} is on)", WARNING))
+        sensor = values[temp_index].strip().upper()
+        if sensor and sensor != pins.OFF:
+            if known and pinmap not in pins.ONE_WIRE_PINS:
+                issues.append(Issue((temp_key, "PINMAP"), f"{temp_key} needs a 1-Wire pin, which {pinmap} does not have",
+                                    WARNING))
+            if sensor != "DS1820":  # the one sensor on the bus, whichever it is; otherwise an address
+                other = sensors.setdefault(sensor, i)
+                if other != i:
+                    issues.append(Issue((f"FEATURE{other}_TEMP", temp_key),
+                                        f"FEATURE{other}_TEMP and {temp_key} are both sensor {sensor}", WARNING))
+    return issues
+
+
+def validate(values, rules=RULES, check_pins=True):
+    """Issues for one preset, given as a value list in PARAMS order or a key/value dict"""
+    if isinstance(values, dict):
+        values = schema.values_from_dict(values)
+    issues = [rule.issue() for rule in rules if rule.bad(values)]
+    if check_pins:
+        issues.extend(pin_issues(values))
+    return issues
+
+
+def field_issues(issues):
+    """key -> [messages], for highlighting the offending fields"""
+    fields = {}
+    for issue in issues:
+        for key in issue.keys:
+            fields.setdefault(key, []).append(issue.message)
+    return fields
+
+
+class EncodedFleet:
+    """A fleet of presets stored column-wise.
+
+    Each column is dictionary-encoded: the distinct strings of a key plus an int32
+    code per preset.  Rules evaluate on the distinct values only (a fleet rarely has
+    more than a few dozen per key) and broadcast the answer through the codes.
+    """
+
+    def __init__(self, rows, keys=None):
+        if load_numpy() is None:
+            raise ImportError("EncodedFleet needs NumPy")
+        keys = keys or sorted({key for rule in RULES for key in rule.keys} | set(pins.KEYS))
+        self.size = len(rows)
+        self.uniques, self.codes = {}, {}
+        for key in keys:
+            getter = itemgetter(schema.KEY_INDEX[key])
+            lookup = {}
+            codes = np.fromiter((lookup.setdefault(value, len(lookup)) for value in map(getter, rows)),
+                                dtype=np.int32, count=self.size)
+            self.uniques[key] = list(lookup)
+            self.codes[key] = codes
+        self._numbers = {}
+
+    def __len__(self):
+        return self.size
+
+    def isin(self, key, values):
+        """Boolean column: True where key's value is one of values"""
+        values = set(values)
+        return np.array([text in values for text in self.uniques[key]], dtype=bool)[self.codes[key]]
+
+    def number(self, key):
+        """Column as float64, NaN where the value is not a number"""
+        numbers = self._numbers.get(key)
+        if numbers is None:
+            numbers = np.array([to_number(text) for text in self.uniques[key]], dtype=np.float64)[self.codes[key]]
+            self._numbers[key] = numbers
+        return numbers
+
+
+def encode_fleet(presets):
+    """Encode presets (value lists in PARAMS order, or dicts) as an EncodedFleet"""
+    rows = [schema.values_from_dict(p) if isinstance(p, dict) else p for p in presets]
+    return EncodedFleet(rows)
+
+
+def validate_fleet(fleet, rules=RULES, check_pins=True):
+    """Check every preset at once; returns [(Issue, indices of the presets that fail it), ...].
+
+    fleet is an EncodedFleet, or a list of presets (encoded here, or checked one by one without NumPy).
+    """
+    if not isinstance(fleet, EncodedFleet):
+        if load_numpy() is None:
+            rows = [schema.values_from_dict(p) if isinstance(p, dict) else p for p in fleet]
+            failures = [(rule.issue(), failing) for rule, failing in
+                        ((rule, [i for i, row in enumerate(rows) if rule.bad(row)]) for rule in rules) if failing]
+            if check_pins:
+                found = {}
+                for i, row in enumerate(rows):
+                    for issue in pin_issues(row):
+                        found.setdefault(issue, []).append(i)
+                failures.extend(found.items())
+            return failures
+        fleet = encode_fleet(fleet)
+    failures = []
+    for rule in rules:
+        failing = np.flatnonzero(rule.bad_batch(fleet))
+        if failing.size:
+            failures.append((rule.issue(), failing))
+    if check_pins:
+        failures.extend(fleet_pin_issues(fleet))
+    return failures
+
+
+def fleet_pin_issues(fleet):
+    """pin_issues for an EncodedFleet, run once per distinct combination of what the checks depend on"""
+    active = np.zeros(len(fleet), dtype=bool)
+    for i in pins.FEATURES:
+        active |= ~fleet.isin(f"FEATURE{i}_PURPOSE", (pins.OFF,))
+    members = np.flatnonzero(active)  # presets without features have nothing to check
+    if not members.size:
+        return []
+    # One int64 per preset, equal for presets the checks cannot tell apart.  Switches count as on/off
+    # rather than by value, so presets split into far fewer combinations.
+    combination, span = np.zeros(members.size, dtype=np.int64), 1
+    columns = [(fleet.codes[key][members], len(fleet.uniques[key])) for key in ("PINMAP",) + pins.FEATURE_KEYS]
+    columns.extend((~fleet.isin(key, pins.INACTIVE.get(key, (pins.OFF,)))[members], 2) for key in pins.SWITCH_KEYS)
+    for column, size in columns:
+        if span * size >= 1 << 62:
+            _, combination = np.unique(combination, return_inverse=True)  # renumber densely before it overflows
+            span = int(combination.max()) + 1
+        combination = combination * size + column
+        span *= size
+    _, first, inverse = np.unique(combination, return_index=True, return_inverse=True)
+    indices = [schema.KEY_INDEX[key] for key in pins.KEYS]
+    uniques = [fleet.uniques[key] for key in pins.KEYS]
+    representatives = np.stack([fleet.codes[key] for key in pins.KEYS])[:, members[first]].T.tolist()
+    values = list(schema.DEFAULTS)
+    found = {}  # Issue -> combinations that have it
+    for c, codes in enumerate(representatives):
+        for index, strings, code in zip(indices, uniques, codes):
+            values[index] = strings[code]
+        for issue in pin_issues(values):
+            found.setdefault(issue, []).append(c)
+    return [(issue, members[np.isin(inverse, combinations)]) for issue, combinations in found.items()]
+
+
+def issues_by_preset(failures):
+    """{preset index: [Issue, ...]} from validate_fleet's per-rule result"""
+    presets = {}
+    for issue, failing in failures:
+        for i in (failing.tolist() if hasattr(failing, "tolist") else failing):
+            presets.setdefault(i, []).append(issue)
+    return dict(sorted(presets.items()))
@@ -0,0 +1,120 @@
+"""Watching a preset folder for changed files: inotify on Linux, polling elsewhere.
+
+Both watchers have the same interface: wait(timeout) blocks until files in
+the folder change (or timeout seconds pass, None for no limit) and returns
+the set of changed file names, which may include deleted ones.  RESCAN in the
+set means events were lost and everything has to be looked at again.  Only
+the folder itself is watched, like batch reads only the folder itself.
+"""
+import ctypes
+import os
+import select
+import struct
+import time
+
+RESCAN = "*"  # not a valid file name on any platform the app runs on
+POLL_INTERVAL = 0.5
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, name length; the name follows, NUL-padded
+_READ_SIZE = 64 * 1024
+
+
+def _libc():
+    libc = ctypes.CDLL(None, use_errno=True)
+    libc.inotify_init1  # AttributeError outside Linux
+    return libc
+
+
+class InotifyWatcher:
+    def __init__(self, directory):
+        libc = _libc()
+        self.directory = directory
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), _WATCH_MASK) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, os.strerror(error), directory)
+
+    def wait(self, timeout=None):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        changed = set()
+        while ready:
+            try:
+                data = os.read(self.fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = _EVENT.unpack_from(data, offset)
+                name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0")
+                offset += _EVENT.size + length
+                if mask & IN_Q_OVERFLOW:
+                    changed.add(RESCAN)
+                elif mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                    raise FileNotFoundError(f"{self.directory} was removed or moved")
+                elif name:
+                    changed.add(os.fsdecode(name))
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Compares (size, mtime) of every file in the folder every interval seconds"""
+
+    def __init__(self, directory, interval=POLL_INTERVAL):
+        self.directory = directory
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self):
+        files = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        files[entry.name] = (stat.st_size, stat.st_mtime_ns)
+                except OSError:
+                    continue  # deleted while scanning; the next scan reports it
+        return files
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self.scan()
+            previous, self.snapshot = self.snapshot, current
+            changed = {name for name in current.keys() | previous.keys() if current.get(name) != previous.get(name)}
+            if changed:
+                return changed
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return changed
+            time.sleep(self.interval if remaining is None else min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+
+def open_watcher(directory, poll_interval=None):
+    """An InotifyWatcher where inotify is available, otherwise (or when poll_interval is given) a PollingWatcher"""
+    if not os.path.isdir(directory):
+        raise NotADirectoryError(f"{directory} is not a folder")
+    if poll_interval is None:
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError, TypeError):  # TypeError: CDLL(None) on Windows
+            poll_interval = POLL_INTERVAL
+    return PollingWatcher(directory, poll_interval)